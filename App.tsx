@@ -25,7 +25,7 @@ import CustomersPage from './components/Customers';
 import CelebrationOverlay from './components/CelebrationOverlay';
 import Tasks from './components/Tasks';
 import Analytics from './components/Analytics';
-import { authApi, clientsApi, customersApi, goalsApi, leadsApi, tasksApi, notesApi, activitiesApi } from './api';
+import { authApi, clientsApi, customersApi, goalsApi, leadsApi, tasksApi, notesApi, activitiesApi, eventsApi } from './api';
 
 /**
  * JWT Authentication Configuration
@@ -67,11 +67,12 @@ const App: React.FC = () => {
   const demoEmail = import.meta.env.VITE_DEMO_EMAIL || 'demo@pulse.app';
   const demoPassword = import.meta.env.VITE_DEMO_PASSWORD || 'demo1234';
 
-  // Derived Values
+  // Derived Values. Completed clients are counted through the customer record they became
+  const openClients = useMemo(() => clients.filter(c => !c.isCompleted), [clients]);
   const totalRevenue = useMemo(() => 
-    clients.reduce((acc, c) => acc + c.paymentCollected, 0) + 
+    openClients.reduce((acc, c) => acc + c.paymentCollected, 0) + 
     customers.reduce((acc, c) => acc + c.totalPaid, 0),
-    [clients, customers]
+    [openClients, customers]
   );
   const successfulRevenue = useMemo(() =>
     customers.reduce((acc, c) => acc + c.totalPaid, 0),
@@ -81,10 +82,10 @@ const App: React.FC = () => {
 
   const stats = useMemo(() => ({
     totalLeads: leads.length + savedLeads.length,
-    activeProjects: clients.length,
+    activeProjects: openClients.length,
     revenue: totalRevenue,
-    deadlines: clients.filter(c => new Date(c.deadline) < new Date(Date.now() + 7 * 24 * 60 * 60 * 1000)).length
-  }), [leads, savedLeads, clients, totalRevenue]);
+    deadlines: openClients.filter(c => new Date(c.deadline) < new Date(Date.now() + 7 * 24 * 60 * 60 * 1000)).length
+  }), [leads, savedLeads, openClients, totalRevenue]);
 
   const requireToken = () => {
     if (!token) throw new Error('Not authenticated');
@@ -170,17 +171,55 @@ const App: React.FC = () => {
     initialize();
   }, [demoEmail, demoPassword]);
 
+  // Keep the session alive with the refresh token instead of logging in again
   useEffect(() => {
     if (!token) return;
 
-    const intervalId = setInterval(() => {
+    const timer = setTimeout(() => {
+      authApi.refresh().then(setToken).catch((error) => {
+        console.error('Token refresh failed:', error);
+      });
+    }, authApi.refreshDelayMs());
+
+    return () => clearTimeout(timer);
+  }, [token]);
+
+  useEffect(() => {
+    if (!token) return;
+
+    const refresh = () => {
       loadAllData(token).catch((error) => {
         console.error('Background refresh error:', error);
         setErrorMessage('Failed to refresh data in real time.');
       });
-    }, 30000);
+    };
 
-    return () => clearInterval(intervalId);
+    // Teammates' changes arrive over the live event stream; bursts of events
+    // are coalesced into one reload. Polling only runs while the stream is down.
+    let reloadTimer: ReturnType<typeof setTimeout> | undefined;
+    let pollId: ReturnType<typeof setInterval> | undefined;
+    const scheduleReload = () => {
+      clearTimeout(reloadTimer);
+      reloadTimer = setTimeout(refresh, 300);
+    };
+    const close = eventsApi.subscribe(token, ['lead', 'client', 'customer', 'goal', 'task'], {
+      onChange: scheduleReload,
+      onReset: scheduleReload,
+      onStatus: (connected) => {
+        if (connected) {
+          clearInterval(pollId);
+          pollId = undefined;
+        } else if (!pollId) {
+          pollId = setInterval(refresh, 30000);
+        }
+      }
+    });
+
+    return () => {
+      close();
+      clearTimeout(reloadTimer);
+      clearInterval(pollId);
+    };
   }, [token]);
 
   // Handlers
@@ -299,55 +338,26 @@ const App: React.FC = () => {
       const token = requireToken();
       const startDate = dates?.startDate || new Date().toISOString().split('T')[0];
       const finishDate = dates?.finishDate || new Date(Date.now() + 30 * 24 * 60 * 60 * 1000).toISOString().split('T')[0];
-      const newClient: Omit<Client, 'id'> = {
-        businessName: lead.businessName,
+      const { client: createdClient, tasks: clientTasks } = await leadsApi.convert(lead.id, {
         businessType: 'Web Design',
-        contact: lead.contact,
         onboarding: startDate,
         deadline: finishDate,
         delivery: 'In Progress',
         paymentCollected: 0,
-        isCompleted: false,
         domainName: specs?.domainName || undefined,
         hostingProvider: specs?.hostingProvider || undefined,
         cmsType: specs?.cmsType || undefined,
         projectStage: specs?.projectStage || 'Discovery',
         maintenancePlan: specs?.maintenancePlan || false,
         renewalDate: specs?.renewalDate || undefined
-      };
-      
-      // Create new client first, only delete the old lead if creation succeeds
-      const createdClient = await clientsApi.create(newClient, token);
-      await leadsApi.remove(lead.id, token);
-      
-      // Map business type to service type for task templates
-      const serviceTypeMap: { [key: string]: string } = {
-        'web_design': 'web_design',
-        'full_development': 'full_development',
-        'seo': 'seo',
-        'maintenance': 'maintenance',
-        'branding': 'branding'
-      };
-      const serviceType = serviceTypeMap[newClient.businessType.toLowerCase().replace(/\s+/g, '_')] || 'default';
-      
-      // Generate onboarding tasks
-      let taskGenerationFailed = false;
-      try {
-        await tasksApi.generateOnboarding(createdClient.id, serviceType, token);
-      } catch (taskError) {
-        console.error('Failed to generate onboarding tasks:', taskError);
-        taskGenerationFailed = true;
-        // Show warning to user but don't fail the entire conversion
-        setErrorMessage('⚠️ Client created but onboarding tasks failed to generate. Please add tasks manually.');
-      }
+      }, token);
       
       setSavedLeads(prev => prev.filter(l => l.id !== lead.id));
       setClients(prev => [...prev, createdClient]);
-      
-      // Only clear error if everything succeeded
-      if (!taskGenerationFailed) {
-        setErrorMessage('');
-      }
+      // Moved lead tasks are replaced by their client-side copies, onboarding tasks added
+      const clientTaskIds = new Set(clientTasks.map(t => t.id));
+      setTasks(prev => [...clientTasks, ...prev.filter(t => !clientTaskIds.has(t.id))]);
+      setErrorMessage('');
     } catch (error) {
       const message = error instanceof Error ? error.message : 'Failed to convert lead to client';
       if (message.toLowerCase().includes('lead not found')) {
@@ -388,15 +398,15 @@ const App: React.FC = () => {
       const token = requireToken();
       const client = clients.find(c => c.id === clientId);
       if (!client) return;
-      // Create new customer record first, only delete the old client if creation succeeds
-      const customer = await customersApi.create({
-        businessName: client.businessName,
-        completedDate: client.deadline || new Date().toISOString().split('T')[0],
-        totalPaid: client.paymentCollected
-      }, token);
-      await clientsApi.remove(clientId, token);
-      setClients(prev => prev.filter(c => c.id !== clientId));
+      const { client: completed, customer, closedTasks } = await clientsApi.complete(clientId, client.deadline || undefined, token);
+      setClients(prev => prev.map(c => c.id === clientId ? completed : c));
       setCustomers(prev => [customer, ...prev]);
+      if (closedTasks) {
+        const closedAt = new Date().toISOString();
+        setTasks(prev => prev.map(t => t.relatedTo === 'client' && t.relatedId === clientId && (t.status === 'pending' || t.status === 'in_progress')
+          ? { ...t, status: 'completed' as const, completedAt: closedAt }
+          : t));
+      }
       setErrorMessage('');
     } catch (error) {
       const message = error instanceof Error ? error.message : 'Failed to complete client';
@@ -617,19 +627,21 @@ const App: React.FC = () => {
     }
   };
 
-  // Celebration Logic - Triggers when successful revenue (completed customers) reaches goal target
+  // Celebration Logic - goal progress and achievement are tracked by the API,
+  // so re-read the goals when total revenue (what the server counts) changes
+  // and celebrate a fresh achievement
+  const openGoalId = goal && !goal.isAchieved ? goal.id : null;
   useEffect(() => {
-    if (goal && token && successfulRevenue >= goal.targetAmount && !goal.isAchieved && goal.targetAmount > 0) {
-      setShowCelebration(true);
-      const updatedGoal = { ...goal, isAchieved: true, dateAchieved: new Date().toISOString().split('T')[0] };
-      setGoal(updatedGoal);
-      if (currentGoalId) {
-        goalsApi.update(currentGoalId, updatedGoal, token).catch(() => {
-          setErrorMessage('Failed to update goal achievement status.');
-        });
-      }
-    }
-  }, [successfulRevenue, goal, token, currentGoalId]);
+    if (!token || !openGoalId) return;
+    goalsApi.list(token).then((loadedGoals) => {
+      const latest = loadedGoals.find(g => g.id === openGoalId);
+      if (!latest) return;
+      if (latest.isAchieved) setShowCelebration(true);
+      setGoal(latest);
+    }).catch(() => {
+      // Progress refresh is non-critical
+    });
+  }, [token, openGoalId, totalRevenue]);
 
   const renderPage = () => {
     switch (currentPage) {
@@ -680,7 +692,7 @@ const App: React.FC = () => {
       case 'goals': return goal ? (
         <GoalsPage 
           goal={goal} 
-          currentRevenue={successfulRevenue} 
+          currentRevenue={goal.currentAmount ?? 0} 
           successfulClients={successfulClients}
           successfulRevenue={successfulRevenue}
           previousGoals={previousGoals} 
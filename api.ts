@@ -97,7 +97,9 @@ const fromApiGoal = (goal: any): Goal => ({
   deadline: goal.deadline,
   dateStarted: goal.date_started,
   dateAchieved: goal.date_achieved ?? undefined,
-  isAchieved: goal.is_achieved ?? false
+  isAchieved: goal.is_achieved ?? false,
+  currentAmount: goal.current_amount ?? 0,
+  progress: goal.progress ?? 0
 });
 
 const request = async <T>(path: string, options: RequestInit = {}, token?: AuthToken): Promise<T> => {
@@ -128,6 +130,17 @@ const request = async <T>(path: string, options: RequestInit = {}, token?: AuthT
   return response.json() as Promise<T>;
 };
 
+// Refresh token from the last login/refresh, kept in memory only.
+const session: { refreshToken: string | null; expiresInSeconds: number } = {
+  refreshToken: null,
+  expiresInSeconds: 3600
+};
+
+const storeSession = (data: any) => {
+  session.refreshToken = data.refresh_token ?? null;
+  session.expiresInSeconds = data.expires_in ?? 3600;
+};
+
 export const authApi = {
   register: (email: string, password: string) => request('/auth/register', {
     method: 'POST',
@@ -147,8 +160,31 @@ export const authApi = {
       throw new Error(message || 'Login failed');
     }
     const data = await response.json();
+    storeSession(data);
     return data.access_token as string;
-  }
+  },
+  // Rotates the stored refresh token; the old one stops working.
+  refresh: async (): Promise<AuthToken> => {
+    if (!session.refreshToken) {
+      throw new Error('No refresh token');
+    }
+    const data = await request<any>('/auth/refresh', {
+      method: 'POST',
+      body: JSON.stringify({ refresh_token: session.refreshToken })
+    });
+    storeSession(data);
+    return data.access_token as string;
+  },
+  logout: async () => {
+    if (!session.refreshToken) return;
+    await request('/auth/logout', {
+      method: 'POST',
+      body: JSON.stringify({ refresh_token: session.refreshToken })
+    });
+    session.refreshToken = null;
+  },
+  // When to refresh the current access token: shortly before it expires.
+  refreshDelayMs: () => Math.max(10_000, session.expiresInSeconds * 800)
 };
 
 export const leadsApi = {
@@ -166,7 +202,19 @@ export const leadsApi = {
     method: 'PATCH',
     body: JSON.stringify(toApiLead(lead))
   }, token)),
-  remove: (id: string, token: AuthToken) => request(`/leads/${id}`, { method: 'DELETE' }, token)
+  remove: (id: string, token: AuthToken) => request(`/leads/${id}`, { method: 'DELETE' }, token),
+  // Creates the client, moves the lead's tasks/notes, adds onboarding tasks and deletes the lead in one transaction
+  convert: async (id: string, client: Partial<Client>, token: AuthToken) => {
+    const { business_name, contact, is_completed, ...fields } = toApiClient(client);
+    const detail = await request<any>(`/leads/${id}/convert`, {
+      method: 'POST',
+      body: JSON.stringify(fields)
+    }, token);
+    return {
+      client: fromApiClient(detail.client),
+      tasks: (detail.tasks as any[]).map(fromApiTask)
+    };
+  }
 };
 
 export const clientsApi = {
@@ -183,7 +231,19 @@ export const clientsApi = {
     method: 'PATCH',
     body: JSON.stringify({ payment_collected: paymentCollected })
   }, token)),
-  remove: (id: string, token: AuthToken) => request(`/clients/${id}`, { method: 'DELETE' }, token)
+  remove: (id: string, token: AuthToken) => request(`/clients/${id}`, { method: 'DELETE' }, token),
+  // Creates the customer, marks the client completed and closes its open tasks in one transaction
+  complete: async (id: string, completedDate: string | undefined, token: AuthToken) => {
+    const result = await request<any>(`/clients/${id}/complete`, {
+      method: 'POST',
+      body: JSON.stringify({ completed_date: completedDate ?? null })
+    }, token);
+    return {
+      client: fromApiClient(result.client),
+      customer: fromApiCustomer(result.customer),
+      closedTasks: result.closed_tasks as number
+    };
+  }
 };
 
 export const customersApi = {
@@ -220,7 +280,9 @@ const fromApiActivity = (activity: any): Activity => ({
   entityId: activity.entity_id,
   entityName: activity.entity_name,
   description: activity.description,
-  activityMetadata: activity.activity_metadata ?? '{}',
+  activityMetadata: typeof activity.activity_metadata === 'string'
+    ? activity.activity_metadata
+    : JSON.stringify(activity.activity_metadata ?? {}),
   createdAt: activity.created_at
 });
 
@@ -332,3 +394,28 @@ export const notesApi = {
   }, token)),
   remove: (id: string, token: AuthToken) => request(`/notes/${id}`, { method: 'DELETE' }, token)
 };
+
+export type ChangeEvent = {
+  entity: string;
+  id: string | null;
+  op: 'create' | 'update' | 'delete';
+  fields: string[];
+};
+
+// Live change stream (GET /events). onReset means events were missed and
+// everything shown should be refetched. Returns a function that closes the stream.
+export const eventsApi = {
+  subscribe: (
+    token: AuthToken,
+    entities: string[],
+    handlers: { onChange: (event: ChangeEvent) => void; onReset: () => void; onStatus?: (connected: boolean) => void }
+  ) => {
+    const params = new URLSearchParams({ access_token: token, entities: entities.join(',') });
+    const source = new EventSource(`${API_BASE}/events?${params.toString()}`);
+    source.addEventListener('change', (message) => handlers.onChange(JSON.parse((message as MessageEvent).data)));
+    source.addEventListener('reset', () => handlers.onReset());
+    source.onopen = () => handlers.onStatus?.(true);
+    source.onerror = () => handlers.onStatus?.(false);
+    return () => source.close();
+  }
+};
@@ -0,0 +1,322 @@
+"""
+Activity archival
+
+The activities table only grows, so it is kept to a rolling retention window.
+Whole months older than the window are exported to gzip-compressed NDJSON
+files (one file per month) and removed from the hot table. On Postgres the
+table can be range-partitioned by month (see
+migrations/002_partition_activities.sql); archived months are then detached
+and dropped instead of deleted row by row.
+
+Archived months stay readable through the read-only archive endpoints in
+routers/activities.py.
+"""
+
+import gzip
+import heapq
+import json
+import os
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from sqlalchemy import func, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from . import models
+from .settings import settings
+
+ARCHIVE_FILE_PATTERN = re.compile(r"^activities-(\d{4})-(\d{2})\.ndjson\.gz$")
+
+# Rows fetched per round trip while exporting a month
+ARCHIVE_BATCH_SIZE = 1000
+
+ARCHIVED_COLUMNS = [
+    "id",
+    "activity_type",
+    "entity_type",
+    "entity_id",
+    "entity_name",
+    "description",
+    "activity_metadata",
+    "created_at",
+    "lead_id",
+    "client_id",
+    "goal_id",
+    "task_id",
+    "customer_id",
+]
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def month_key(value: date) -> str:
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def parse_month(key: str) -> date:
+    """Parse a 'YYYY-MM' month key into the first day of that month."""
+    try:
+        return datetime.strptime(key, "%Y-%m").date()
+    except ValueError as exc:
+        raise ValueError(f"Invalid month '{key}', expected YYYY-MM") from exc
+
+
+def partition_name(month: date) -> str:
+    return f"activities_y{month.year:04d}m{month.month:02d}"
+
+
+def archive_dir() -> Path:
+    return Path(settings.activity_archive_dir)
+
+
+def archive_path(month: date) -> Path:
+    return archive_dir() / f"activities-{month_key(month)}.ndjson.gz"
+
+
+# ---------------------------------------------------------------------------
+# Postgres partition maintenance
+# ---------------------------------------------------------------------------
+
+def is_partitioned(conn: Connection) -> bool:
+    """True when the activities table is a native Postgres partitioned table."""
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = 'activities'"
+            )
+        ).scalar()
+    )
+
+
+def ensure_partitions(engine: Engine, months_ahead: int = 2) -> list[str]:
+    """Create monthly partitions for the current month and the next few.
+
+    Rows written while a month had no partition sit in activities_default, and
+    Postgres refuses to create a partition whose range the default partition
+    holds rows for. Those rows are moved into the new partition while the
+    default one is detached.
+
+    No-op unless activities is a partitioned table. Returns the names of the
+    partitions that were created.
+    """
+    created = []
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return created
+        has_default = conn.execute(text("SELECT to_regclass('activities_default')")).scalar() is not None
+        month = month_start(date.today())
+        for _ in range(months_ahead + 1):
+            name = partition_name(month)
+            exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+            if not exists:
+                bounds = {"start": month, "end": next_month(month)}
+                stranded = has_default and conn.execute(
+                    text(
+                        "SELECT EXISTS (SELECT 1 FROM activities_default "
+                        "WHERE created_at >= :start AND created_at < :end)"
+                    ),
+                    bounds,
+                ).scalar()
+                if stranded:
+                    conn.execute(text("ALTER TABLE activities DETACH PARTITION activities_default"))
+                conn.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF activities "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+                    )
+                )
+                if stranded:
+                    conn.execute(
+                        text(
+                            "WITH moved AS ("
+                            "DELETE FROM activities_default "
+                            "WHERE created_at >= :start AND created_at < :end RETURNING *"
+                            ") INSERT INTO activities SELECT * FROM moved"
+                        ),
+                        bounds,
+                    )
+                    conn.execute(text("ALTER TABLE activities ATTACH PARTITION activities_default DEFAULT"))
+                created.append(name)
+            month = next_month(month)
+    return created
+
+
+# ---------------------------------------------------------------------------
+# Archival job
+# ---------------------------------------------------------------------------
+
+def _serialize(row) -> dict:
+    record = {}
+    for column in ARCHIVED_COLUMNS:
+        value = getattr(row, column)
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        record[column] = value
+    return record
+
+
+def _read_archive_file(path: Path) -> Iterator[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _write_archive_file(path: Path, records: Iterable[dict]) -> None:
+    """Write records atomically so a crash never leaves a truncated archive."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+        for record in records:
+            fh.write(json.dumps(record, separators=(",", ":")))
+            fh.write("\n")
+    os.replace(tmp_path, path)
+
+
+def archivable_months(db: Session, cutoff: date) -> list[date]:
+    """Months that lie entirely before the cutoff and still hold hot rows."""
+    oldest = db.query(func.min(models.Activity.created_at)).scalar()
+    if oldest is None:
+        return []
+    months = []
+    month = month_start(oldest.date() if isinstance(oldest, datetime) else oldest)
+    while next_month(month) <= cutoff:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def _unique(records: Iterable[dict]) -> Iterator[dict]:
+    """Drop records repeating the previous record's id (merging puts duplicates side by side)."""
+    previous = None
+    for record in records:
+        if record["id"] != previous:
+            yield record
+        previous = record["id"]
+
+
+def archive_month(db: Session, month: date) -> int:
+    """Export one month of activities to its archive file and drop it from the hot table.
+
+    Rows already present in an existing archive file for the month are kept,
+    so re-running after a partial failure never loses archived data. The rows
+    are read in batches of ARCHIVE_BATCH_SIZE and merged with the file as a
+    stream, oldest first.
+
+    Returns the number of rows moved.
+    """
+    start = datetime.combine(month, datetime.min.time())
+    end = datetime.combine(next_month(month), datetime.min.time())
+    in_month = (models.Activity.created_at >= start, models.Activity.created_at < end)
+    if db.query(models.Activity.id).filter(*in_month).first() is None:
+        return 0
+
+    # On a partitioned table this reads the month's partition and any rows
+    # activities_default holds for the month
+    rows = (
+        db.query(*(getattr(models.Activity, column) for column in ARCHIVED_COLUMNS))
+        .filter(*in_month)
+        .order_by(models.Activity.created_at, models.Activity.id)
+        .yield_per(ARCHIVE_BATCH_SIZE)
+    )
+    moved = 0
+
+    def hot_records() -> Iterator[dict]:
+        nonlocal moved
+        for row in rows:
+            moved += 1
+            yield _serialize(row)
+
+    path = archive_path(month)
+    archived = _read_archive_file(path) if path.exists() else iter(())
+    # Hot rows come first among equal keys, so they replace their archived copies
+    records = heapq.merge(hot_records(), archived, key=lambda record: (record["created_at"], record["id"]))
+    _write_archive_file(path, _unique(records))
+
+    conn = db.connection()
+    name = partition_name(month)
+    if is_partitioned(conn) and conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+        conn.execute(text(f"ALTER TABLE activities DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+    # Whatever is left: the plain table's rows, or the month's rows in
+    # activities_default when it has no partition of its own
+    db.query(models.Activity).filter(*in_month).delete(synchronize_session=False)
+    db.commit()
+    return moved
+
+
+def archive_activities(db: Session, retention_days: int | None = None) -> dict[str, int]:
+    """Archive every whole month older than the retention window.
+
+    Returns a mapping of month key to the number of rows archived.
+    """
+    if retention_days is None:
+        retention_days = settings.activity_retention_days
+    cutoff = month_start(date.today() - timedelta(days=retention_days))
+    moved = {}
+    for month in archivable_months(db, cutoff):
+        count = archive_month(db, month)
+        if count:
+            moved[month_key(month)] = count
+    return moved
+
+
+# ---------------------------------------------------------------------------
+# Read-only access
+# ---------------------------------------------------------------------------
+
+def list_archived_months() -> list[str]:
+    directory = archive_dir()
+    if not directory.exists():
+        return []
+    months = []
+    for entry in directory.iterdir():
+        match = ARCHIVE_FILE_PATTERN.match(entry.name)
+        if match:
+            months.append(f"{match.group(1)}-{match.group(2)}")
+    return sorted(months, reverse=True)
+
+
+def is_archived(month: date) -> bool:
+    return archive_path(month).exists()
+
+
+def read_archived_activities(
+    month: date,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> Iterator[dict]:
+    """Yield one page of an archived month, newest first.
+
+    Archive files are stored oldest first, so the page is the last
+    offset + limit matches of a single pass over the file; only those are
+    held in memory.
+    """
+    offset, limit = max(offset, 0), max(limit, 0)
+    newest = deque(maxlen=offset + limit)
+    for record in _read_archive_file(archive_path(month)):
+        if entity_type and record["entity_type"] != entity_type:
+            continue
+        if entity_id and record["entity_id"] != entity_id:
+            continue
+        newest.append(record)
+    for _ in range(min(offset, len(newest))):
+        newest.pop()
+    while newest:
+        yield newest.pop()
@@ -1,40 +1,198 @@
 from datetime import datetime, timedelta
 import hashlib
+import hmac
+import logging
 import os
+import secrets
+import threading
+import time
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from . import metrics, models
+from .cache import LocalCache, bus
 from .settings import settings
 
+logger = logging.getLogger(__name__)
 
-def get_password_hash(password: str) -> str:
+
+# ---------------------------------------------------------------------------
+# Password hashing
+#
+# Stored as pbkdf2_sha256$<iterations>$<salt hex>$<digest hex> so the cost is
+# recorded with each hash and can be raised per deployment
+# (PASSWORD_HASH_ITERATIONS, see calibrate_password_hash.py). Hashes from
+# before the versioned format ("<salt hex>:<digest hex>") used 260,000
+# iterations and are still accepted; both are upgraded on the next login
+# (needs_rehash).
+# ---------------------------------------------------------------------------
+
+PASSWORD_ALGORITHM = "pbkdf2_sha256"
+LEGACY_ITERATIONS = 260_000
+
+
+def pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+def get_password_hash(password: str, iterations: int | None = None) -> str:
+    iterations = iterations or settings.password_hash_iterations
     salt = os.urandom(16)
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 260_000)
-    return salt.hex() + ":" + dk.hex()
+    return f"{PASSWORD_ALGORITHM}${iterations}${salt.hex()}${pbkdf2(password, salt, iterations).hex()}"
+
+
+def _parse_password_hash(hashed_password: str) -> tuple[int, bytes, bytes]:
+    """Return (iterations, salt, digest) from either stored format; raises ValueError."""
+    if hashed_password.startswith(PASSWORD_ALGORITHM + "$"):
+        _, iterations, salt_hex, dk_hex = hashed_password.split("$")
+        return int(iterations), bytes.fromhex(salt_hex), bytes.fromhex(dk_hex)
+    salt_hex, dk_hex = hashed_password.split(":", 1)
+    return LEGACY_ITERATIONS, bytes.fromhex(salt_hex), bytes.fromhex(dk_hex)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        salt_hex, dk_hex = hashed_password.split(":", 1)
-        salt = bytes.fromhex(salt_hex)
-        expected = bytes.fromhex(dk_hex)
-        dk = hashlib.pbkdf2_hmac("sha256", plain_password.encode("utf-8"), salt, 260_000)
-        return dk == expected
-    except Exception:
+        iterations, salt, expected = _parse_password_hash(hashed_password)
+    except (ValueError, AttributeError):
         return False
+    return hmac.compare_digest(pbkdf2(plain_password, salt, iterations), expected)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True for legacy-format hashes and hashes made with a different iteration count."""
+    if not hashed_password.startswith(PASSWORD_ALGORITHM + "$"):
+        return True
+    try:
+        iterations, _, _ = _parse_password_hash(hashed_password)
+    except ValueError:
+        return True
+    return iterations != settings.password_hash_iterations
 
 
 def create_access_token(subject: str) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    payload = {"sub": subject, "exp": expire}
+    # jti makes every token distinct, so revoking one never revokes another issued in the same second
+    payload = {"sub": subject, "exp": expire, "jti": secrets.token_hex(8)}
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 
+# ---------------------------------------------------------------------------
+# Verified-token cache and revocation list
+#
+# Verifying a JWT signature on every request is the bulk of the auth
+# dependency's CPU time, and a dashboard sends the same token many times a
+# minute. Verified tokens are cached by digest until their exp. Revoked
+# digests are kept in memory (loaded at startup, then fed by the invalidation
+# bus when any worker revokes a token), so checking them costs no query.
+# ---------------------------------------------------------------------------
+
+_verified_tokens = LocalCache(max_entries=settings.jwt_cache_size)
+_revoked: dict[str, float] = {}  # token digest -> Unix time the token expires
+_revoked_lock = threading.Lock()
+
+metrics.gauge(
+    "pulse_jwt_cache_hits_total",
+    "Access tokens served from the verified-token cache",
+    lambda: _verified_tokens.hits,
+    kind="counter",
+)
+metrics.gauge(
+    "pulse_jwt_cache_misses_total",
+    "Access tokens that needed signature verification",
+    lambda: _verified_tokens.misses,
+    kind="counter",
+)
+metrics.gauge(
+    "pulse_jwt_cache_hit_ratio",
+    "Share of token checks served from the cache",
+    lambda: _verified_tokens.hits / max(1, _verified_tokens.hits + _verified_tokens.misses),
+)
+metrics.gauge("pulse_jwt_cache_entries", "Verified tokens currently cached", lambda: len(_verified_tokens))
+metrics.gauge("pulse_revoked_tokens", "Revoked access tokens that have not expired yet", lambda: len(_revoked))
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _mark_revoked(digest: str, expires: float) -> None:
+    now = time.time()
+    with _revoked_lock:
+        _revoked[digest] = expires
+        if len(_revoked) > settings.jwt_cache_size:
+            for stale in [key for key, exp in _revoked.items() if exp < now]:
+                del _revoked[stale]
+    _verified_tokens.pop(digest)
+
+
+def is_revoked(digest: str) -> bool:
+    expires = _revoked.get(digest)
+    return expires is not None and expires > time.time()
+
+
+def load_revoked_tokens(db: Session) -> int:
+    """Replace the in-memory revocation list with the unexpired rows of revoked_tokens."""
+    rows = (
+        db.query(models.RevokedToken.token_digest, models.RevokedToken.expires_at)
+        .filter(models.RevokedToken.expires_at > datetime.utcnow())
+        .all()
+    )
+    now_utc, now = datetime.utcnow(), time.time()
+    with _revoked_lock:
+        _revoked.clear()
+        for digest, expires_at in rows:
+            _revoked[digest] = now + (expires_at - now_utc).total_seconds()
+    for digest, _ in rows:
+        _verified_tokens.pop(digest)
+    return len(rows)
+
+
+def _on_revoked_tokens_changed(table: str, digests: set[str] | None) -> None:
+    if digests is None:
+        # Bulk change or missed messages: reload the list
+        from .db import SessionLocal
+
+        db = SessionLocal()
+        try:
+            load_revoked_tokens(db)
+        except Exception:
+            logger.exception("Failed to reload revoked tokens")
+        finally:
+            db.close()
+        return
+    # Rows are only ever added for revocations; no token outlives the access token lifetime
+    expires = time.time() + settings.access_token_expire_minutes * 60
+    for digest in digests:
+        _mark_revoked(digest, expires)
+
+
+bus.subscribe(models.RevokedToken.__tablename__, _on_revoked_tokens_changed)
+
+
 def decode_access_token(token: str) -> str:
+    digest = token_digest(token)
+    if is_revoked(digest):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    subject = _verified_tokens.get(digest)
+    if subject is not None:
+        return subject
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        subject: str | None = payload.get("sub")
+        subject = payload.get("sub")
         if not subject:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        return subject
     except JWTError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
+    expires = payload.get("exp")
+    if isinstance(expires, (int, float)):
+        _verified_tokens.set(digest, subject, ttl_seconds=expires - time.time())
+    return subject
+
+
+def generate_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Keyed hash stored instead of the token; cheap to check, unlike the password hash."""
+    return hmac.new(settings.jwt_secret_key.encode("utf-8"), token.encode("utf-8"), hashlib.sha256).hexdigest()
@@ -0,0 +1,444 @@
+"""
+In-process caches and cross-worker invalidation
+
+LocalCache is a small bounded LRU with a TTL, used for lookups that are read
+far more often than they change (the current user, dashboard stats).
+
+Every session made by SessionLocal reports what it changed: flushed ORM rows
+are collected per table with their primary keys, and bulk INSERT/UPDATE/DELETE
+statements invalidate their whole table. After the transaction commits the
+bus delivers those invalidations to this worker's subscribers straight away
+and publishes them for the other workers:
+- on Postgres with NOTIFY on the pulse_invalidate channel; each worker keeps
+  a LISTEN connection open;
+- on other databases (local development) by appending to the shared
+  cache_invalidations table, which each worker polls every
+  cache_bus_poll_seconds.
+
+Messages also carry the operation and changed field names per row, which
+app/events.py streams to clients (on_change()).
+
+Rolled-back transactions publish nothing. A worker that loses its listener
+connection clears every subscribed cache once it reconnects, since it may have
+missed messages. Processes that never import this module (one-off scripts)
+do not publish; the caches' TTLs bound how stale that can make them.
+"""
+
+import functools
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Hashable
+from sqlalchemy import delete, event, func, insert, inspect, select, text
+from sqlalchemy.orm import Session, sessionmaker
+from . import models
+from .db import Base, SessionLocal, engine
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "pulse_invalidate"
+# NOTIFY payloads are limited to 8000 bytes; bigger key lists invalidate the whole table
+MAX_PAYLOAD_BYTES = 7900
+# How long rows stay in cache_invalidations, and how often they are pruned
+TABLE_RETENTION = timedelta(minutes=10)
+PRUNE_INTERVAL_SECONDS = 60.0
+RECONNECT_SECONDS = 5.0
+
+_PENDING_KEY = "pulse_invalidations"
+_COMMITTED_KEY = "pulse_committed_invalidations"
+_MISSING = object()
+
+
+class LocalCache:
+    """Thread-safe LRU cache whose entries expire after ttl_seconds."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= time.monotonic():
+                if entry is not _MISSING:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ---------------------------------------------------------------------------
+# Collecting changes
+# ---------------------------------------------------------------------------
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+
+class TableChanges:
+    """What one transaction changed in one table."""
+
+    __slots__ = ("rows", "bulk")
+
+    def __init__(self):
+        self.rows: dict[str, tuple[str, set[str]]] = {}  # primary key -> (op, changed fields)
+        self.bulk: set[str] = set()  # ops of INSERT/UPDATE/DELETE statements that may touch any row
+
+    def record(self, key: str, op: str, fields: set[str]) -> None:
+        previous = self.rows.get(key)
+        if previous is None or op == DELETE:
+            self.rows[key] = (op, fields)
+        else:
+            # create+update stays a create, update+update merges the fields
+            previous_op, previous_fields = previous
+            self.rows[key] = (previous_op, set() if previous_op == CREATE else previous_fields | fields)
+
+    @property
+    def keys(self) -> set[str] | None:
+        """Changed primary keys, or None when the whole table may have changed."""
+        return None if self.bulk else set(self.rows)
+
+
+def _pending(session: Session, table: str) -> TableChanges:
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    if table not in pending:
+        pending[table] = TableChanges()
+    return pending[table]
+
+
+def _instance_key(obj) -> str:
+    state = inspect(obj)
+    values = state.mapper.primary_key_from_instance(obj)
+    return "/".join(str(value) for value in values)
+
+
+def _changed_fields(obj) -> set[str]:
+    return {attr.key for attr in inspect(obj).attrs if attr.history.has_changes()}
+
+
+@functools.cache
+def _cascade_tables(table: str) -> frozenset[str]:
+    """Tables whose rows the database deletes along with rows of table (ON DELETE CASCADE, transitively)."""
+    children: set[str] = set()
+    parents = [table]
+    while parents:
+        parent = parents.pop()
+        for candidate in Base.metadata.tables.values():
+            if candidate.name in children:
+                continue
+            if any(
+                (fk.ondelete or "").upper() == "CASCADE" and fk.column.table.name == parent
+                for fk in candidate.foreign_keys
+            ):
+                children.add(candidate.name)
+                parents.append(candidate.name)
+    return frozenset(children)
+
+
+def _collect_flush(session: Session, flush_context) -> None:
+    for obj in session.new:
+        _pending(session, obj.__table__.name).record(_instance_key(obj), CREATE, set())
+    for obj in session.deleted:
+        _pending(session, obj.__table__.name).record(_instance_key(obj), DELETE, set())
+        # Children removed by the database never pass through the session
+        for table in _cascade_tables(obj.__table__.name):
+            _pending(session, table).bulk.add(DELETE)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            _pending(session, obj.__table__.name).record(_instance_key(obj), UPDATE, _changed_fields(obj))
+
+
+def _collect_statement(state) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            op = CREATE if state.is_insert else UPDATE if state.is_update else DELETE
+            _pending(state.session, table.name).bulk.add(op)
+
+
+def _discard(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+class NotifyTransport:
+    """Postgres LISTEN/NOTIFY on a dedicated autocommit psycopg connection."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def send(self, payloads: list[str]) -> None:
+        with self.engine.connect() as conn:
+            for payload in payloads:
+                conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": NOTIFY_CHANNEL, "payload": payload})
+            conn.commit()
+
+    def listen(self, deliver: Callable[[str], None], stopping: threading.Event, ready: Callable[[], None]) -> None:
+        import psycopg
+
+        conninfo = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        with psycopg.connect(conninfo, autocommit=True) as conn:
+            conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            ready()
+            while not stopping.is_set():
+                for notify in conn.notifies(timeout=1.0):
+                    deliver(notify.payload)
+
+
+class TableTransport:
+    """Shared cache_invalidations table, polled by every worker."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._table_ready = False
+
+    def _ensure_table(self) -> None:
+        if not self._table_ready:
+            models.CacheInvalidation.__table__.create(self.engine, checkfirst=True)
+            self._table_ready = True
+
+    def send(self, payloads: list[str]) -> None:
+        self._ensure_table()
+        with self.engine.begin() as conn:
+            conn.execute(insert(models.CacheInvalidation), [{"payload": payload} for payload in payloads])
+
+    def listen(self, deliver: Callable[[str], None], stopping: threading.Event, ready: Callable[[], None]) -> None:
+        self._ensure_table()
+        table = models.CacheInvalidation.__table__
+        with self.engine.connect() as conn:
+            last_id = conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar()
+            conn.commit()
+        ready()
+        last_prune = 0.0
+        while not stopping.is_set():
+            with self.engine.begin() as conn:
+                rows = conn.execute(
+                    select(table.c.id, table.c.payload).where(table.c.id > last_id).order_by(table.c.id)
+                ).all()
+                if time.monotonic() - last_prune > PRUNE_INTERVAL_SECONDS:
+                    conn.execute(delete(table).where(table.c.created_at < datetime.utcnow() - TABLE_RETENTION))
+                    last_prune = time.monotonic()
+            for row_id, payload in rows:
+                last_id = row_id
+                deliver(payload)
+            stopping.wait(settings.cache_bus_poll_seconds)
+
+
+def _transport_for(engine, mode: str):
+    if mode == "auto":
+        mode = "postgres" if engine.dialect.name == "postgresql" else "table"
+    if mode == "postgres":
+        return NotifyTransport(engine)
+    if mode == "table":
+        return TableTransport(engine)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Bus
+# ---------------------------------------------------------------------------
+
+Subscriber = Callable[[str, set[str] | None], None]
+ChangeListener = Callable[[dict], None]
+
+
+def _message(origin: str, seq: int, table: str, changes: TableChanges) -> dict:
+    """One bus message per table and commit.
+
+    o: origin worker, s: origin sequence number, t: table, k: changed keys (None
+    for the whole table), c: [key, op, fields] per row, b: bulk statement ops.
+    """
+    keys = changes.keys
+    return {
+        "o": origin,
+        "s": seq,
+        "t": table,
+        "k": sorted(keys) if keys is not None else None,
+        "c": [[key, op, sorted(fields)] for key, (op, fields) in changes.rows.items()],
+        "b": sorted(changes.bulk),
+    }
+
+
+def _encode(message: dict) -> str:
+    payload = json.dumps(message, default=str)
+    if len(payload.encode("utf-8")) <= MAX_PAYLOAD_BYTES:
+        return payload
+    # Too big to send row by row: report it as a change to the whole table
+    ops = set(message["b"]) | {op for _, op, _ in message["c"]}
+    return json.dumps({**message, "k": None, "c": [], "b": sorted(ops)})
+
+
+class InvalidationBus:
+    def __init__(self, transport=None):
+        self.origin = uuid.uuid4().hex
+        self.transport = transport
+        self._subscribers: dict[str, list[Subscriber]] = {}
+        self._change_listeners: list[ChangeListener] = []
+        self._gap_listeners: list[Callable[[], None]] = []
+        self._seq = itertools.count(1)
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def attach(self, session_factory: sessionmaker) -> None:
+        """Collect changes from every session the factory makes and publish them after commit."""
+        event.listen(session_factory, "after_flush", _collect_flush)
+        event.listen(session_factory, "do_orm_execute", _collect_statement)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_transaction_end", self._after_transaction_end)
+        event.listen(session_factory, "after_rollback", _discard)
+
+    def subscribe(self, table: str, callback: Subscriber) -> None:
+        """Call callback(table, keys) whenever rows of table change; keys is None for the whole table."""
+        self._subscribers.setdefault(table, []).append(callback)
+
+    def evict_on(self, cache: LocalCache, *tables: str) -> None:
+        """Clear cache whenever any of the tables changes, in any worker."""
+        for table in tables:
+            self.subscribe(table, lambda _table, _keys: cache.clear())
+
+    def on_change(self, listener: ChangeListener, on_gap: Callable[[], None] | None = None) -> None:
+        """Receive every committed change message (see _message), from this worker and the others.
+
+        on_gap is called when the listener connection was lost and messages may
+        have been missed.
+        """
+        self._change_listeners.append(listener)
+        if on_gap:
+            self._gap_listeners.append(on_gap)
+
+    # -- publishing -------------------------------------------------------
+
+    def _after_commit(self, session: Session) -> None:
+        # A released savepoint can still be rolled back with its outer transaction
+        if session.in_nested_transaction():
+            return
+        pending = session.info.pop(_PENDING_KEY, None)
+        if pending:
+            session.info[_COMMITTED_KEY] = pending
+
+    def _after_transaction_end(self, session: Session, transaction) -> None:
+        # Publish only once the session has returned its connection: the
+        # transport checks out its own, and holding both from many request
+        # threads at once can exhaust the pool
+        if transaction.parent is None:
+            committed = session.info.pop(_COMMITTED_KEY, None)
+            if committed:
+                self.publish(committed)
+
+    def publish(self, pending: dict[str, TableChanges]) -> None:
+        messages = [_message(self.origin, next(self._seq), table, changes) for table, changes in pending.items()]
+        for message in messages:
+            self._deliver(message)
+        if self.transport is None:
+            return
+        try:
+            self.transport.send([_encode(message) for message in messages])
+        except Exception:
+            # The commit already happened; other workers fall back on cache TTLs
+            logger.exception("Failed to publish cache invalidations")
+
+    # -- receiving --------------------------------------------------------
+
+    def _deliver(self, message: dict) -> None:
+        table, keys = message["t"], message["k"]
+        for callback in self._subscribers.get(table, ()):
+            try:
+                callback(table, set(keys) if keys is not None else None)
+            except Exception:
+                logger.exception(f"Cache invalidation subscriber failed for {table}")
+        for listener in self._change_listeners:
+            try:
+                listener(message)
+            except Exception:
+                logger.exception("Change listener failed")
+
+    def _receive(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation: {payload[:100]}")
+            return
+        if message.get("o") == self.origin:
+            return  # already delivered locally at commit time
+        self._deliver(message)
+
+    def _clear_all(self) -> None:
+        for table, callbacks in list(self._subscribers.items()):
+            for callback in callbacks:
+                callback(table, None)
+        for on_gap in self._gap_listeners:
+            on_gap()
+
+    def start(self) -> None:
+        if self._thread is not None or self.transport is None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="pulse-cache-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        reconnecting = False
+        while not self._stopping.is_set():
+            # Messages may have been missed while disconnected, so start over from empty caches
+            ready = self._clear_all if reconnecting else (lambda: None)
+            reconnecting = True
+            try:
+                self.transport.listen(self._receive, self._stopping, ready)
+            except Exception:
+                logger.exception("Cache invalidation listener failed; reconnecting")
+                self._stopping.wait(RECONNECT_SECONDS)
+
+
+bus = InvalidationBus(_transport_for(engine, settings.cache_bus))
+bus.attach(SessionLocal)
+
+# Shared caches
+user_cache = LocalCache(max_entries=1024, ttl_seconds=settings.user_cache_seconds)
+stats_cache = LocalCache(max_entries=1, ttl_seconds=settings.stats_cache_seconds)
+
+bus.evict_on(user_cache, models.User.__tablename__)
+bus.evict_on(stats_cache, models.Lead.__tablename__, models.Client.__tablename__, models.Customer.__tablename__)
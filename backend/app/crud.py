@@ -1,7 +1,26 @@
-from datetime import date, timedelta
-from sqlalchemy.orm import Session
-from . import models
-from .auth import get_password_hash
+from datetime import date, datetime, timedelta
+import base64
+import json
+import re
+from sqlalchemy import Float, and_, case, cast, delete, func, insert, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session, aliased, selectinload
+from . import goal_progress, models, rollups
+from .auth import generate_refresh_token, get_password_hash, hash_refresh_token, token_digest
+from .scheduler import scheduler
+from .settings import settings
+from .task_templates import create_task_list_for_client, service_type_for
+
+
+def _record_revenue(db: Session, delta: float) -> None:
+    """Record a change to total revenue (client payments + customer totals) made today."""
+    rollups.increment(db, rollups.REVENUE_COLLECTED, delta)
+    goal_progress.apply_revenue(db, delta)
+
+
+def _client_revenue(client: models.Client) -> float:
+    """A client's payments count as revenue until it is completed; its customer record carries them after that."""
+    return 0 if client.is_completed else client.payment_collected or 0
 
 
 def get_user_by_email(db: Session, email: str):
@@ -12,19 +31,143 @@ def create_user(db: Session, email: str, password: str):
     user = models.User(email=email, password_hash=get_password_hash(password))
     db.add(user)
     db.commit()
-    db.refresh(user)
     return user
 
 
+def update_password_hash(db: Session, user: models.User, password: str) -> None:
+    """Re-hash a verified password with the current parameters."""
+    user.password_hash = get_password_hash(password)
+    db.commit()
+
+
+# Refresh tokens
+def create_refresh_token(db: Session, user: models.User, family_id: str | None = None) -> str:
+    """Issue a refresh token (a new family unless rotating) and return the raw token."""
+    raw = generate_refresh_token()
+    now = datetime.utcnow()
+    db.add(
+        models.RefreshToken(
+            user_id=user.id,
+            family_id=family_id or models._uuid(),
+            token_hash=hash_refresh_token(raw),
+            expires_at=now + timedelta(days=settings.refresh_token_expire_days),
+        )
+    )
+    # Drop this user's expired tokens while we are here
+    db.execute(
+        delete(models.RefreshToken).where(
+            models.RefreshToken.user_id == user.id, models.RefreshToken.expires_at < now
+        )
+    )
+    db.commit()
+    return raw
+
+
+def revoke_refresh_family(db: Session, family_id: str) -> int:
+    revoked = db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.family_id == family_id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    return revoked
+
+
+def rotate_refresh_token(db: Session, raw: str) -> tuple[models.User, str]:
+    """Exchange a refresh token for its successor.
+
+    Raises ValueError("unknown" | "expired" | "revoked" | "reused"). Presenting a
+    token that was already rotated means it leaked (or was replayed), so the
+    whole family is revoked and the legitimate holder has to log in again.
+    """
+    token = (
+        db.query(models.RefreshToken)
+        .filter(models.RefreshToken.token_hash == hash_refresh_token(raw))
+        .first()
+    )
+    if token is None:
+        raise ValueError("unknown")
+    if token.revoked_at is not None:
+        if token.replaced_by is not None:
+            revoke_refresh_family(db, token.family_id)
+            raise ValueError("reused")
+        raise ValueError("revoked")
+    if token.expires_at <= datetime.utcnow():
+        raise ValueError("expired")
+    user = db.get(models.User, token.user_id)
+    if user is None:
+        raise ValueError("unknown")
+
+    successor_id = models._uuid()
+    # Conditional update: of two concurrent rotations only one wins, the other counts as reuse
+    rotated = db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.id == token.id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow(), replaced_by=successor_id)
+    ).rowcount
+    if not rotated:
+        db.rollback()
+        revoke_refresh_family(db, token.family_id)
+        raise ValueError("reused")
+    raw_successor = generate_refresh_token()
+    db.add(
+        models.RefreshToken(
+            id=successor_id,
+            user_id=user.id,
+            family_id=token.family_id,
+            token_hash=hash_refresh_token(raw_successor),
+            expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days),
+        )
+    )
+    db.commit()
+    return user, raw_successor
+
+
+def revoke_refresh_token(db: Session, raw: str) -> bool:
+    """Log out: revoke the token's whole family. Returns False for unknown tokens."""
+    token = (
+        db.query(models.RefreshToken)
+        .filter(models.RefreshToken.token_hash == hash_refresh_token(raw))
+        .first()
+    )
+    if token is None:
+        return False
+    revoke_refresh_family(db, token.family_id)
+    return True
+
+
+def revoke_access_token(db: Session, token: str) -> None:
+    """Add an access token to the revocation list (workers pick it up through the cache bus)."""
+    now = datetime.utcnow()
+    db.merge(
+        models.RevokedToken(
+            token_digest=token_digest(token),
+            expires_at=now + timedelta(minutes=settings.access_token_expire_minutes),
+        )
+    )
+    db.commit()
+
+
+def prune_revoked_tokens(db: Session) -> int:
+    """Delete revocations of tokens that have expired anyway. Run at startup."""
+    pruned = db.execute(delete(models.RevokedToken).where(models.RevokedToken.expires_at < datetime.utcnow())).rowcount
+    db.commit()
+    return pruned
+
+
+def query_leads(db: Session):
+    return db.query(models.Lead)
+
+
 def list_leads(db: Session):
-    return db.query(models.Lead).all()
+    return query_leads(db).all()
 
 
 def create_lead(db: Session, payload):
     lead = models.Lead(**payload.model_dump())
     db.add(lead)
+    rollups.increment(db, rollups.LEADS_CREATED)
     db.commit()
-    db.refresh(lead)
     return lead
 
 
@@ -32,7 +175,6 @@ def update_lead(db: Session, lead: models.Lead, payload):
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(lead, key, value)
     db.commit()
-    db.refresh(lead)
     return lead
 
 
@@ -41,77 +183,243 @@ def delete_lead(db: Session, lead: models.Lead):
     db.commit()
 
 
+def query_clients(db: Session):
+    return db.query(models.Client)
+
+
 def list_clients(db: Session):
-    return db.query(models.Client).all()
+    return query_clients(db).all()
 
 
 def get_client_by_id(db: Session, client_id: str):
     return db.query(models.Client).filter(models.Client.id == client_id).first()
 
 
+def get_client_detail(db: Session, client_id: str, activity_limit: int = 20):
+    """Load a client with its tasks, notes and recent activities in a fixed number of statements.
+
+    Tasks and notes come from one selectinload query each regardless of how many
+    there are; activities are one query whose two OR branches are served by
+    idx_activity_client_id and ix_activities_entity_created. Notes are
+    pinned-first, newest first, like list_notes.
+    """
+    client = (
+        db.query(models.Client)
+        .options(selectinload(models.Client.tasks), selectinload(models.Client.notes))
+        .filter(models.Client.id == client_id)
+        .first()
+    )
+    if not client:
+        return None
+    activities = (
+        db.query(models.Activity)
+        .filter(
+            or_(
+                models.Activity.client_id == client_id,
+                and_(models.Activity.entity_type == "client", models.Activity.entity_id == client_id),
+            )
+        )
+        .order_by(models.Activity.created_at.desc())
+        .limit(activity_limit)
+        .all()
+    )
+    return {
+        "client": client,
+        "tasks": sorted(client.tasks, key=lambda task: task.created_at, reverse=True),
+        "notes": sorted(client.notes, key=lambda note: (note.is_pinned, note.created_at), reverse=True),
+        "activities": activities,
+    }
+
+
 def create_client(db: Session, payload):
     client = models.Client(**payload.model_dump())
     db.add(client)
+    rollups.increment(db, rollups.CLIENTS_ONBOARDED, day=client.onboarding)
+    _record_revenue(db, _client_revenue(client))
     db.commit()
-    db.refresh(client)
+    scheduler.schedule_client(client)
     return client
 
 
 def update_client(db: Session, client: models.Client, payload):
+    previous_revenue = _client_revenue(client)
+    previous_onboarding = client.onboarding
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(client, key, value)
+    _record_revenue(db, _client_revenue(client) - previous_revenue)
+    rollups.move(db, rollups.CLIENTS_ONBOARDED, previous_onboarding, client.onboarding)
     db.commit()
-    db.refresh(client)
+    scheduler.schedule_client(client)
     return client
 
 
 def delete_client(db: Session, client: models.Client):
+    client_id = client.id
+    _record_revenue(db, -_client_revenue(client))
     db.delete(client)
     db.commit()
+    scheduler.unschedule("client", client_id)
+
+
+def convert_lead(db: Session, lead: models.Lead, payload) -> models.Client:
+    """Turn a lead into a client in one transaction.
+
+    Creates the client, moves the lead's tasks, notes and activities over with
+    one UPDATE per table, inserts the onboarding tasks in a single executemany,
+    logs a client_added activity and deletes the lead. Either all of it is
+    committed or none of it.
+    """
+    data = payload.model_dump(exclude={"service_type"})
+    data["onboarding"] = data["onboarding"] or date.today()
+    data["deadline"] = data["deadline"] or data["onboarding"] + timedelta(days=30)
+    client = models.Client(business_name=lead.business_name, contact=lead.contact, **data)
+    db.add(client)
+    # The client row has to exist before anything points at it
+    db.flush()
+
+    moved = {"related_to": "client", "related_id": client.id, "client_id": client.id, "lead_id": None}
+    for model in (models.Task, models.Note):
+        db.execute(update(model).where(model.lead_id == lead.id).values(**moved))
+    # The lead's history stays visible on the client (see get_client_detail)
+    db.execute(
+        update(models.Activity).where(models.Activity.lead_id == lead.id).values(client_id=client.id, lead_id=None)
+    )
+
+    service_type = payload.service_type or service_type_for(client.business_type)
+    onboarding_tasks = create_task_list_for_client(client.id, service_type, onboarding_date=client.onboarding)
+    db.execute(insert(models.Task), [
+        {**task, "due_date": date.fromisoformat(task["due_date"]), "client_id": client.id}
+        for task in onboarding_tasks
+    ])
+    db.add(
+        models.Activity(
+            activity_type="client_added",
+            entity_type="client",
+            entity_id=client.id,
+            entity_name=client.business_name,
+            description=f"Converted lead to client: {client.business_name}",
+            activity_metadata={"lead_id": lead.id, "service_type": service_type, "onboarding_tasks": len(onboarding_tasks)},
+            client_id=client.id,
+        )
+    )
+    rollups.increment(db, rollups.CLIENTS_ONBOARDED, day=client.onboarding)
+    _record_revenue(db, _client_revenue(client))
+    db.delete(lead)
+    db.commit()
+    scheduler.schedule_client(client)
+    return client
+
+
+def complete_client(db: Session, client: models.Client, completed_date: date | None = None):
+    """Finish a client's project in one transaction; returns (customer, closed task count).
+
+    Copies the client's name, payments and technical specs into a new customer,
+    marks the client completed, closes its open tasks with a single UPDATE and
+    logs a customer_completed activity.
+    """
+    customer = models.Customer(
+        business_name=client.business_name,
+        completed_date=completed_date or date.today(),
+        total_paid=client.payment_collected or 0,
+        domain_name=client.domain_name,
+        hosting_provider=client.hosting_provider,
+        cms_type=client.cms_type,
+        maintenance_plan=client.maintenance_plan,
+        renewal_date=client.renewal_date,
+    )
+    db.add(customer)
+    # The payments move from the client (see _client_revenue) to the customer,
+    # so total revenue does not change
+    client.is_completed = True
+    db.flush()
+
+    closed = db.execute(
+        update(models.Task)
+        .where(models.Task.client_id == client.id, models.Task.status.in_(OPEN_TASK_STATUSES))
+        .values(status="completed", completed_at=datetime.utcnow())
+    ).rowcount
+    db.add(
+        models.Activity(
+            activity_type="customer_completed",
+            entity_type="customer",
+            entity_id=customer.id,
+            entity_name=customer.business_name,
+            description=f"Completed project: {customer.business_name}",
+            activity_metadata={"client_id": client.id, "amount": customer.total_paid, "closed_tasks": closed},
+            customer_id=customer.id,
+        )
+    )
+    rollups.increment(db, rollups.CUSTOMERS_COMPLETED, day=customer.completed_date)
+    db.commit()
+    scheduler.schedule_client(client)
+    scheduler.schedule_customer(customer)
+    return customer, closed
+
+
+def query_customers(db: Session):
+    return db.query(models.Customer)
 
 
 def list_customers(db: Session):
-    return db.query(models.Customer).all()
+    return query_customers(db).all()
 
 
 def create_customer(db: Session, payload):
     customer = models.Customer(**payload.model_dump())
     db.add(customer)
+    rollups.increment(db, rollups.CUSTOMERS_COMPLETED, day=customer.completed_date)
+    _record_revenue(db, customer.total_paid or 0)
     db.commit()
-    db.refresh(customer)
+    scheduler.schedule_customer(customer)
     return customer
 
 
 def update_customer(db: Session, customer: models.Customer, payload):
+    previous_paid = customer.total_paid or 0
+    previous_completed = customer.completed_date
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(customer, key, value)
+    _record_revenue(db, (customer.total_paid or 0) - previous_paid)
+    rollups.move(db, rollups.CUSTOMERS_COMPLETED, previous_completed, customer.completed_date)
     db.commit()
-    db.refresh(customer)
+    scheduler.schedule_customer(customer)
     return customer
 
 
 def delete_customer(db: Session, customer: models.Customer):
+    customer_id = customer.id
+    _record_revenue(db, -(customer.total_paid or 0))
     db.delete(customer)
     db.commit()
+    scheduler.unschedule("customer", customer_id)
+
+
+def query_goals(db: Session):
+    return db.query(models.Goal).order_by(models.Goal.date_started.desc())
 
 
 def list_goals(db: Session):
-    return db.query(models.Goal).order_by(models.Goal.date_started.desc()).all()
+    return query_goals(db).all()
 
 
 def create_goal(db: Session, payload):
     goal = models.Goal(**payload.model_dump())
     db.add(goal)
+    if goal.is_achieved:
+        rollups.increment(db, rollups.GOALS_ACHIEVED, day=goal.date_achieved or date.today())
+    goal_progress.recalculate(db, goal)
     db.commit()
-    db.refresh(goal)
     return goal
 
 
 def update_goal(db: Session, goal: models.Goal, payload):
+    previous_achieved_on = (goal.date_achieved or date.today()) if goal.is_achieved else None
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(goal, key, value)
+    achieved_on = (goal.date_achieved or date.today()) if goal.is_achieved else None
+    rollups.move(db, rollups.GOALS_ACHIEVED, previous_achieved_on, achieved_on)
+    goal_progress.recalculate(db, goal)
     db.commit()
-    db.refresh(goal)
     return goal
 
 
@@ -122,12 +430,14 @@ def delete_goal(db: Session, goal: models.Goal):
 
 def build_stats(db: Session):
     total_leads = db.query(models.Lead).count()
-    active_projects = db.query(models.Client).count()
-    revenue = sum(c.payment_collected for c in db.query(models.Client).all()) + sum(
+    # Completed clients live on as customers (see complete_client)
+    open_clients = db.query(models.Client).filter(models.Client.is_completed.is_(False))
+    active_projects = open_clients.count()
+    revenue = sum(c.payment_collected or 0 for c in open_clients.all()) + sum(
         c.total_paid for c in db.query(models.Customer).all()
     )
     upcoming = date.today() + timedelta(days=7)
-    deadlines = db.query(models.Client).filter(models.Client.deadline < upcoming).count()
+    deadlines = open_clients.filter(models.Client.deadline < upcoming).count()
     return {
         "total_leads": total_leads,
         "active_projects": active_projects,
@@ -137,15 +447,92 @@ def build_stats(db: Session):
 
 
 # Activity CRUD
-def list_activities(db: Session, limit: int = 50):
-    return db.query(models.Activity).order_by(models.Activity.created_at.desc()).limit(limit).all()
+METADATA_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
+METADATA_OPERATORS = {"eq", "ne", "gt", "gte", "lt", "lte"}
+
+
+def _metadata_value(value: str):
+    """Interpret a query-string value the way it would appear in the JSON document."""
+    if value in ("true", "false"):
+        return value == "true"
+    try:
+        return float(value) if any(ch in value for ch in ".eE") else int(value)
+    except ValueError:
+        return value
+
+
+def _metadata_condition(db: Session, key: str, op: str, value: str):
+    """Build a SQL condition on activity_metadata[key].
+
+    The key is validated and inlined as a literal so the expression matches the
+    expression indexes created by migrate_activity_metadata_json.py.
+    """
+    if not METADATA_KEY_PATTERN.match(key):
+        raise ValueError(f"Invalid metadata key '{key}'")
+    if op not in METADATA_OPERATORS:
+        raise ValueError(f"Invalid metadata operator '{op}'")
+    column = models.Activity.activity_metadata
+    dialect = db.get_bind().dialect.name
+    typed = _metadata_value(value)
+
+    if op in ("eq", "ne"):
+        # "ne" matches activities whose metadata lacks the key, as well as different values
+        if dialect == "postgresql":
+            # Containment is served by the GIN index; NOT @> is already true for a missing key
+            condition = column.op("@>")(cast(json.dumps({key: typed}), JSONB))
+            return condition if op == "eq" else ~condition
+        expression = func.json_extract(column, literal_column(f"'$.{key}'"))
+        return expression == typed if op == "eq" else or_(expression != typed, expression.is_(None))
+
+    if isinstance(typed, (bool, str)):
+        raise ValueError(f"Metadata operator '{op}' needs a numeric value")
+    # Only numeric values compare: Postgres would fail the whole query casting
+    # a string, and SQLite sorts every string above every number
+    if dialect == "postgresql":
+        # Same expression as the ix_activities_meta_<key>_number index
+        is_number = func.jsonb_typeof(column.op("->")(literal_column(f"'{key}'"))) == literal_column("'number'")
+        expression = case((is_number, cast(column.op("->>")(literal_column(f"'{key}'")), Float)))
+        return _compare(expression, op, typed)
+    # The range test stays on json_extract() so the SQLite expression index serves it
+    is_number = func.json_type(column, literal_column(f"'$.{key}'")).in_(
+        [literal_column("'integer'"), literal_column("'real'")]
+    )
+    return and_(is_number, _compare(func.json_extract(column, literal_column(f"'$.{key}'")), op, typed))
+
+
+def _compare(expression, op: str, value):
+    return {
+        "gt": expression > value,
+        "gte": expression >= value,
+        "lt": expression < value,
+        "lte": expression <= value,
+    }[op]
+
+
+def query_activities(db: Session, limit: int = 50, metadata_filters: list[tuple[str, str, str]] | None = None):
+    """Query for the most recent activities (see list_activities)."""
+    query = db.query(models.Activity)
+    for key, op, value in metadata_filters or []:
+        query = query.filter(_metadata_condition(db, key, op, value))
+    return query.order_by(models.Activity.created_at.desc()).limit(limit)
+
+
+def list_activities(db: Session, limit: int = 50, metadata_filters: list[tuple[str, str, str]] | None = None):
+    """List the most recent activities.
+
+    Args:
+        db: Database session
+        limit: Maximum number of activities to return
+        metadata_filters: Optional (key, operator, value) filters on activity_metadata,
+            pushed down into SQL. Raises ValueError for invalid keys or operators.
+    """
+    return query_activities(db, limit=limit, metadata_filters=metadata_filters).all()
 
 
 def create_activity(db: Session, payload):
     activity = models.Activity(**payload.model_dump())
     db.add(activity)
     db.commit()
-    db.refresh(activity)
     return activity
 
 
@@ -155,8 +542,130 @@ def delete_activity(db: Session, activity: models.Activity):
 
 
 # Task CRUD
-def list_tasks(db: Session):
-    return db.query(models.Task).order_by(models.Task.created_at.desc()).all()
+OPEN_TASK_STATUSES = ("pending", "in_progress")
+
+
+def encode_task_cursor(created_at: datetime, task_id: str) -> str:
+    """Opaque cursor pointing just after a task in (created_at desc, id desc) order."""
+    raw = f"{created_at.isoformat()}|{task_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_task_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, task_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), task_id
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def query_tasks(
+    db: Session,
+    status: list[str] | None = None,
+    priority: list[str] | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+    related_to: str | None = None,
+    related_id: str | None = None,
+    overdue: bool = False,
+    limit: int | None = None,
+    cursor: str | None = None,
+):
+    """Query for tasks newest first, filtered in SQL.
+
+    Args:
+        db: Database session
+        status / priority: Keep tasks whose value is in the list
+        due_before / due_after: Inclusive due date bounds
+        related_to / related_id: Restrict to one entity type or entity
+        overdue: Only open tasks whose due date has passed
+        limit: Page size; all matching tasks when omitted
+        cursor: Value from encode_task_cursor() for the last task of the previous page
+    """
+    query = db.query(models.Task)
+    if status:
+        query = query.filter(models.Task.status.in_(status))
+    if priority:
+        query = query.filter(models.Task.priority.in_(priority))
+    if due_before:
+        query = query.filter(models.Task.due_date <= due_before)
+    if due_after:
+        query = query.filter(models.Task.due_date >= due_after)
+    if related_to:
+        query = query.filter(models.Task.related_to == related_to)
+    if related_id:
+        query = query.filter(models.Task.related_id == related_id)
+    if overdue:
+        query = query.filter(
+            models.Task.due_date < date.today(),
+            models.Task.status.in_(OPEN_TASK_STATUSES),
+        )
+    if cursor:
+        created_at, task_id = decode_task_cursor(cursor)
+        query = query.filter(
+            or_(
+                models.Task.created_at < created_at,
+                and_(models.Task.created_at == created_at, models.Task.id < task_id),
+            )
+        )
+    query = query.order_by(models.Task.created_at.desc(), models.Task.id.desc())
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def list_tasks(db: Session, **filters):
+    """List tasks newest first; accepts the same filters as query_tasks."""
+    return query_tasks(db, **filters).all()
+
+
+def task_summary(db: Session, related_to: str | None = None, related_id: str | None = None):
+    """Task board counts from a single GROUP BY query.
+
+    Overdue and due-this-week only count open tasks; "this week" runs from
+    today through Sunday.
+    """
+    today = date.today()
+    week_end = today + timedelta(days=6 - today.weekday())
+    is_open = models.Task.status.in_(OPEN_TASK_STATUSES)
+    overdue = case((and_(is_open, models.Task.due_date < today), 1), else_=0)
+    due_this_week = case(
+        (and_(is_open, models.Task.due_date >= today, models.Task.due_date <= week_end), 1),
+        else_=0,
+    )
+    query = db.query(
+        models.Task.status,
+        models.Task.priority,
+        func.count(),
+        func.coalesce(func.sum(overdue), 0),
+        func.coalesce(func.sum(due_this_week), 0),
+    )
+    if related_to:
+        query = query.filter(models.Task.related_to == related_to)
+    if related_id:
+        query = query.filter(models.Task.related_id == related_id)
+
+    summary = {
+        "total": 0,
+        "by_status": {},
+        "by_priority": {},
+        "by_status_priority": {},
+        "overdue": 0,
+        "overdue_by_priority": {},
+        "due_this_week": 0,
+    }
+    for status, priority, count, overdue_count, due_count in query.group_by(
+        models.Task.status, models.Task.priority
+    ):
+        summary["total"] += count
+        summary["by_status"][status] = summary["by_status"].get(status, 0) + count
+        summary["by_priority"][priority] = summary["by_priority"].get(priority, 0) + count
+        summary["by_status_priority"].setdefault(status, {})[priority] = count
+        summary["overdue"] += overdue_count
+        if overdue_count:
+            summary["overdue_by_priority"][priority] = summary["overdue_by_priority"].get(priority, 0) + overdue_count
+        summary["due_this_week"] += due_count
+    return summary
 
 
 def get_task_by_id(db: Session, task_id: str):
@@ -175,16 +684,16 @@ def create_task(db: Session, payload):
     
     db.add(task)
     db.commit()
-    db.refresh(task)
     return task
 
 
 def update_task(db: Session, task: models.Task, payload):
-    for key, value in payload.model_dump(exclude_unset=True).items():
+    changes = payload.model_dump(exclude_unset=True)
+    for key, value in changes.items():
         setattr(task, key, value)
     
     # Update ForeignKey columns if related_to or related_id changed
-    if "related_to" in payload.model_dump() or "related_id" in payload.model_dump():
+    if "related_to" in changes or "related_id" in changes:
         task.client_id = None
         task.lead_id = None
         if task.related_to == "client" and task.related_id:
@@ -193,7 +702,6 @@ def update_task(db: Session, task: models.Task, payload):
             task.lead_id = task.related_id
     
     db.commit()
-    db.refresh(task)
     return task
 
 
@@ -203,6 +711,14 @@ def delete_task(db: Session, task: models.Task):
 
 
 # Note CRUD
+def query_notes(db: Session, related_to: str, related_id: str | None = None):
+    query = db.query(models.Note).order_by(models.Note.is_pinned.desc(), models.Note.created_at.desc())
+    query = query.filter(models.Note.related_to == related_to)
+    if related_id:
+        query = query.filter(models.Note.related_id == related_id)
+    return query
+
+
 def list_notes(db: Session, related_to: str, related_id: str | None = None):
     """List notes filtered by entity type. Requires related_to parameter for safety and performance.
     
@@ -211,11 +727,48 @@ def list_notes(db: Session, related_to: str, related_id: str | None = None):
         related_to: Entity type ('lead', 'client'). Required to prevent fetching all notes.
         related_id: Optional specific entity ID to filter by
     """
-    query = db.query(models.Note).order_by(models.Note.is_pinned.desc(), models.Note.created_at.desc())
-    query = query.filter(models.Note.related_to == related_to)
-    if related_id:
-        query = query.filter(models.Note.related_id == related_id)
-    return query.all()
+    return query_notes(db, related_to, related_id).all()
+
+
+def batch_get_notes(db: Session, related_to: str, related_ids: list[str], latest: int | None = None):
+    """Notes for many entities in one query, grouped by entity.
+
+    Args:
+        db: Database session
+        related_to: Entity type ('lead', 'client')
+        related_ids: Entity IDs; every ID appears in the result, possibly with no notes
+        latest: When set, only the latest N notes per entity (pinned first), selected
+            with a ROW_NUMBER() window so the database does the trimming
+
+    Returns:
+        (notes_by_entity, counts_by_entity) where counts are the total number of notes
+        per entity, independent of latest.
+    """
+    ids = list(dict.fromkeys(related_ids))
+    notes_by_entity = {related_id: [] for related_id in ids}
+    counts = {related_id: 0 for related_id in ids}
+    if not ids:
+        return notes_by_entity, counts
+
+    ordering = (models.Note.is_pinned.desc(), models.Note.created_at.desc())
+    ranked = (
+        select(
+            models.Note,
+            func.row_number().over(partition_by=models.Note.related_id, order_by=ordering).label("rank"),
+            func.count().over(partition_by=models.Note.related_id).label("total"),
+        )
+        .where(models.Note.related_to == related_to, models.Note.related_id.in_(ids))
+        .subquery()
+    )
+    note = aliased(models.Note, ranked)
+    query = db.query(note, ranked.c.total).order_by(ranked.c.related_id, ranked.c.rank)
+    if latest:
+        query = query.filter(ranked.c.rank <= latest)
+
+    for row, total in query:
+        notes_by_entity[row.related_id].append(row)
+        counts[row.related_id] = total
+    return notes_by_entity, counts
 
 
 def get_note_by_id(db: Session, note_id: str):
@@ -234,16 +787,16 @@ def create_note(db: Session, payload):
     
     db.add(note)
     db.commit()
-    db.refresh(note)
     return note
 
 
 def update_note(db: Session, note: models.Note, payload):
-    for key, value in payload.model_dump(exclude_unset=True).items():
+    changes = payload.model_dump(exclude_unset=True)
+    for key, value in changes.items():
         setattr(note, key, value)
     
     # Update ForeignKey columns if related_to or related_id changed
-    if "related_to" in payload.model_dump() or "related_id" in payload.model_dump():
+    if "related_to" in changes or "related_id" in changes:
         note.client_id = None
         note.lead_id = None
         if note.related_to == "client" and note.related_id:
@@ -252,7 +805,6 @@ def update_note(db: Session, note: models.Note, payload):
             note.lead_id = note.related_id
     
     db.commit()
-    db.refresh(note)
     return note
 
 
@@ -1,14 +1,96 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 from .settings import settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+def sqlite_pragmas() -> list[str]:
+    """PRAGMAs of the SQLite profile, run on every new connection."""
+    return [
+        # Readers no longer block the writer (and vice versa); the WAL is
+        # synced at checkpoints rather than on every commit
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        # Off by default in SQLite, per connection: without it the ON DELETE
+        # CASCADE clauses are ignored
+        "PRAGMA foreign_keys=ON",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_mb * 1024 * 1024}",
+        # Negative values are KiB rather than pages
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_mb * 1024}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _apply_sqlite_profile(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def use_sqlite_profile(engine) -> None:
+    """Apply the SQLite profile to every connection engine opens (no-op on other databases)."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_profile)
+
+
+def _create_engine(url: str):
+    new_engine = create_engine(url, pool_pre_ping=True)
+    if settings.sqlite_profile:
+        use_sqlite_profile(new_engine)
+    return new_engine
+
+
+engine = _create_engine(settings.database_url)
+# Every column value (ids, timestamps, onupdate) is generated in Python, so
+# after a flush the written objects already match their rows: keeping them
+# loaded across commit saves the SELECT that reloading them would cost
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+# Read replicas for safe GET routes (see get_read_db)
+read_engines = [_create_engine(url) for url in settings.database_read_url_list]
+
+# Clients that wrote recently keep reading from the primary. The marker travels
+# as a cookie / X-Last-Write header (works across workers) and is also tracked
+# in-process per Authorization header for clients that echo neither.
+LAST_WRITE_COOKIE = "pulse_last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+_recent_writers: dict[str, float] = {}
+_replica_unhealthy_until: dict[int, float] = {}
+_replica_cycle = itertools.cycle(range(len(read_engines))) if read_engines else None
+_lock = threading.Lock()
+
+# Per-request list that primary-session commits append to (see track_writes)
+_request_commits: ContextVar[list | None] = ContextVar("pulse_request_commits", default=None)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _note_commit(session):
+    commits = _request_commits.get()
+    if commits is not None:
+        commits.append(True)
+
+
+def track_writes() -> list:
+    """Start recording primary commits for the current request; non-empty afterwards if it wrote."""
+    commits = []
+    _request_commits.set(commits)
+    return commits
 
 
 def get_db():
@@ -17,3 +99,82 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _writer_key(request: Request) -> str | None:
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+
+def record_write(request: Request, response) -> None:
+    """Mark the caller as a recent writer so its next reads go to the primary."""
+    now = time.time()
+    response.headers[LAST_WRITE_HEADER] = f"{now:.3f}"
+    response.set_cookie(
+        LAST_WRITE_COOKIE,
+        f"{now:.3f}",
+        max_age=max(1, int(settings.read_your_writes_seconds)),
+        httponly=True,
+        samesite="lax",
+    )
+    key = _writer_key(request)
+    if key:
+        with _lock:
+            _recent_writers[key] = now
+            # Keep the map bounded to clients inside the window
+            if len(_recent_writers) > 10_000:
+                cutoff = now - settings.read_your_writes_seconds
+                for stale in [k for k, t in _recent_writers.items() if t < cutoff]:
+                    del _recent_writers[stale]
+
+
+def _wrote_recently(request: Request) -> bool:
+    cutoff = time.time() - settings.read_your_writes_seconds
+    for raw in (request.headers.get(LAST_WRITE_HEADER), request.cookies.get(LAST_WRITE_COOKIE)):
+        try:
+            if raw and float(raw) >= cutoff:
+                return True
+        except ValueError:
+            pass
+    key = _writer_key(request)
+    return bool(key and _recent_writers.get(key, 0) >= cutoff)
+
+
+def _open_replica_session() -> Session | None:
+    """Open a session on the next healthy replica, or None if none is usable."""
+    now = time.time()
+    for _ in range(len(read_engines)):
+        with _lock:
+            index = next(_replica_cycle)
+        if _replica_unhealthy_until.get(index, 0) > now:
+            continue
+        db = Session(bind=read_engines[index], autoflush=False, autocommit=False)
+        try:
+            db.connection()
+            return db
+        except Exception as exc:
+            db.close()
+            _replica_unhealthy_until[index] = now + settings.replica_retry_seconds
+            logger.warning(f"Read replica {index} unavailable, using primary: {exc}")
+    return None
+
+
+def get_read_db(request: Request, primary: Session = Depends(get_db)):
+    """Session for read-only routes: a healthy replica unless the caller wrote recently.
+
+    Falls back to the request's primary session when no replica is configured,
+    all replicas are down, or read-your-writes applies.
+    """
+    if not read_engines or _wrote_recently(request):
+        yield primary
+        return
+    db = _open_replica_session()
+    if db is None:
+        yield primary
+        return
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,17 +1,64 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from .db import get_db
+from .db import SessionLocal, get_db, get_read_db
 from .auth import decode_access_token
 from .crud import get_user_by_email
+from .cache import user_cache
+from .settings import settings
+from . import models
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def authenticate(token: str, db: Session) -> models.User:
     email = decode_access_token(token)
+    # Cached as plain column values; evicted on any users change (see app/cache.py)
+    cached = user_cache.get(email)
+    if cached is not None:
+        return models.User(**cached)
     user = get_user_by_email(db, email)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user_cache.set(email, {column.key: getattr(user, column.key) for column in models.User.__table__.columns})
     return user
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return authenticate(token, db)
+
+
+def get_stream_user(request: Request, access_token: str | None = Query(None)):
+    """Auth for long-lived streams: bearer header or ?access_token= (EventSource cannot set headers).
+
+    Uses its own short session so an open stream never holds a database connection.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    token = access_token or (token if scheme.lower() == "bearer" else None)
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    db = SessionLocal()
+    try:
+        return authenticate(token, db)
+    finally:
+        db.close()
+
+
+def get_metrics_reader(request: Request) -> None:
+    """Auth for GET /metrics: the METRICS_TOKEN scrape token, or any user's access token."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if settings.metrics_token and hmac.compare_digest(token.encode("utf-8"), settings.metrics_token.encode("utf-8")):
+        return
+    db = SessionLocal()
+    try:
+        authenticate(token, db)
+    finally:
+        db.close()
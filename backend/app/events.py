@@ -0,0 +1,159 @@
+"""
+Live change events for GET /events
+
+Every committed change to a user-visible table reaches this worker as a bus
+message (app/cache.py), whichever worker made it. The broker turns each
+message into compact events
+
+    {"entity": "lead", "id": "<id>", "op": "update", "fields": ["status"]}
+
+(id is null and fields empty for bulk statements that may touch any row), gives
+each one an id, keeps the last events_buffer_size of them in a ring buffer for
+resuming, and hands them to the open streams. Nothing here touches the
+database, so an idle dashboard costs no queries.
+
+Event ids are "<origin>-<seq>-<n>", assigned from the originating worker's
+message, so every worker names an event the same way and a client can resume
+on any worker. When the requested id has left the buffer, or a stream falls
+more than events_connection_buffer events behind, the stream gets a single
+"reset" event instead: the client should refetch what it shows.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from . import models
+from .cache import bus
+from .settings import settings
+
+# Table name -> entity name used in events
+ENTITIES = {
+    models.Lead.__tablename__: "lead",
+    models.Client.__tablename__: "client",
+    models.Customer.__tablename__: "customer",
+    models.Goal.__tablename__: "goal",
+    models.Task.__tablename__: "task",
+    models.Note.__tablename__: "note",
+    models.Activity.__tablename__: "activity",
+}
+
+RESET = "reset"
+
+
+class Subscription:
+    """One open stream: a bounded queue of (event id, event) filled from any thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, entities: set[str] | None):
+        self.loop = loop
+        self.entities = entities
+        self.queue: deque[tuple[str, dict]] = deque()
+        self.overflowed = False
+        self.closed = False
+        self.wake = asyncio.Event()
+
+    def wants(self, event: dict) -> bool:
+        return self.entities is None or event["entity"] in self.entities
+
+    def push(self, items: list[tuple[str, dict]]) -> None:
+        """Called with the broker lock held."""
+        if len(self.queue) + len(items) > settings.events_connection_buffer:
+            self.queue.clear()
+            self.overflowed = True
+        else:
+            self.queue.extend(items)
+        self.loop.call_soon_threadsafe(self.wake.set)
+
+    def drain(self) -> list[tuple[str, dict]] | None:
+        """Queued events, or None if some were dropped and the client must reset."""
+        with broker.lock:
+            self.wake.clear()
+            if self.overflowed:
+                self.overflowed = False
+                self.queue.clear()
+                return None
+            items = list(self.queue)
+            self.queue.clear()
+            return items
+
+    async def wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self.wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class Broker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.recent: deque[tuple[str, dict]] = deque(maxlen=settings.events_buffer_size)
+        self.subscriptions: set[Subscription] = set()
+
+    def _events(self, message: dict) -> list[tuple[str, dict]]:
+        entity = ENTITIES.get(message["t"])
+        if entity is None:
+            return []
+        prefix = f"{message['o'][:8]}-{message['s']}"
+        events = [
+            {"entity": entity, "id": key, "op": op, "fields": fields}
+            for key, op, fields in message["c"]
+        ]
+        events.extend({"entity": entity, "id": None, "op": op, "fields": []} for op in message["b"])
+        return [(f"{prefix}-{n}", event) for n, event in enumerate(events)]
+
+    def publish(self, message: dict) -> None:
+        items = self._events(message)
+        if not items:
+            return
+        with self.lock:
+            self.recent.extend(items)
+            for subscription in self.subscriptions:
+                wanted = [item for item in items if subscription.wants(item[1])]
+                if wanted:
+                    subscription.push(wanted)
+
+    def reset_all(self) -> None:
+        """Messages from other workers may have been missed: every stream must resync."""
+        with self.lock:
+            self.recent.clear()
+            for subscription in self.subscriptions:
+                subscription.queue.clear()
+                subscription.overflowed = True
+                subscription.loop.call_soon_threadsafe(subscription.wake.set)
+
+    def subscribe(self, entities: set[str] | None, last_event_id: str | None) -> Subscription:
+        """Open a stream, replaying what was missed after last_event_id if it is still buffered."""
+        subscription = Subscription(asyncio.get_running_loop(), entities)
+        with self.lock:
+            if last_event_id:
+                ids = [event_id for event_id, _ in self.recent]
+                if last_event_id in ids:
+                    start = ids.index(last_event_id) + 1
+                    subscription.push([item for item in list(self.recent)[start:] if subscription.wants(item[1])])
+                else:
+                    subscription.overflowed = True
+            self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def close_all(self) -> None:
+        with self.lock:
+            for subscription in self.subscriptions:
+                subscription.closed = True
+                subscription.loop.call_soon_threadsafe(subscription.wake.set)
+
+
+def format_sse(event_id: str | None, event_type: str, data: dict) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+broker = Broker()
+bus.on_change(broker.publish, on_gap=broker.reset_all)
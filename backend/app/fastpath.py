@@ -0,0 +1,173 @@
+"""
+Fast serialization path for list endpoints
+
+The default list path loads full ORM instances, validates each one into its
+Pydantic response model and then JSON-encodes the result. For large lists most
+of the request time goes to that hydration and re-validation.
+
+The fast path (opt-in with `?fast=true`) reuses the same crud query but selects
+only the response model's columns, so rows come back as plain tuples, and
+encodes them directly: with orjson when it is installed, otherwise with a
+cached Pydantic TypeAdapter. Computed fields (e.g. GoalOut.progress) are filled
+in from the row without validation. The JSON produced is the same as the
+default path.
+
+List routes also negotiate the response format from the Accept header
+(negotiate()); the non-default formats always use the fast path:
+- application/json: array of objects (default)
+- application/msgpack: the same array of objects as MessagePack
+- application/vnd.pulse.columnar+json: {"count": n, "columns": {field: [values...]}},
+  one array per field instead of repeating every key in every object
+"""
+
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Query
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+COLUMNAR_JSON = "application/vnd.pulse.columnar+json"
+
+_MEDIA_TYPE_ALIASES = {
+    "application/json": JSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.pulse.columnar+json": COLUMNAR_JSON,
+}
+
+_ROWS_ADAPTER = TypeAdapter(list[dict[str, Any]])
+_COLUMNAR_ADAPTER = TypeAdapter(dict[str, Any])
+
+
+@lru_cache(maxsize=None)
+def response_fields(schema: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+@lru_cache(maxsize=None)
+def computed_fields(schema: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(schema.model_computed_fields)
+
+
+def fetch_rows(query: Query, schema: type[BaseModel]) -> list[dict[str, Any]]:
+    """Run an ORM query as a column-only select and return one dict per row."""
+    model = query.column_descriptions[0]["entity"]
+    fields = response_fields(schema)
+    rows = query.with_entities(*(getattr(model, field) for field in fields)).all()
+    records = [dict(zip(fields, row)) for row in rows]
+    extra = computed_fields(schema)
+    if extra:
+        for record in records:
+            instance = schema.model_construct(**record)
+            for field in extra:
+                record[field] = getattr(instance, field)
+    return records
+
+
+def encode_json(records: list[dict[str, Any]]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(records, option=orjson.OPT_NON_STR_KEYS)
+    return _ROWS_ADAPTER.dump_json(records)
+
+
+def to_columns(records: list[dict[str, Any]], schema: type[BaseModel]) -> dict[str, Any]:
+    fields = response_fields(schema) + computed_fields(schema)
+    return {
+        "count": len(records),
+        "columns": {field: [record[field] for record in records] for field in fields},
+    }
+
+
+def encode_columnar_json(records: list[dict[str, Any]], schema: type[BaseModel]) -> bytes:
+    columns = to_columns(records, schema)
+    if orjson is not None:
+        return orjson.dumps(columns)
+    return _COLUMNAR_ADAPTER.dump_json(columns)
+
+
+def _msgpack_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def encode_msgpack(records: list[dict[str, Any]]) -> bytes:
+    return msgpack.packb(records, default=_msgpack_default, use_bin_type=True)
+
+
+def negotiate(request: Request) -> str:
+    """Pick the response media type from the Accept header, preferring higher q-values.
+
+    Anything unrecognised (including */* or no header) falls back to JSON.
+    Raises 406 if MessagePack is the only acceptable format and msgpack is not installed.
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return JSON
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, position, media_type.lower()))
+    msgpack_requested = False
+    for _, _, media_type in sorted(candidates):
+        if media_type in ("*/*", "application/*"):
+            return JSON
+        resolved = _MEDIA_TYPE_ALIASES.get(media_type)
+        if resolved == MSGPACK and msgpack is None:
+            msgpack_requested = True
+            continue
+        if resolved:
+            return resolved
+    if msgpack_requested:
+        raise HTTPException(status_code=406, detail="MessagePack responses require the msgpack package")
+    return JSON
+
+
+def encode(media_type: str, records: list[dict[str, Any]], schema: type[BaseModel]) -> bytes:
+    if media_type == MSGPACK:
+        return encode_msgpack(records)
+    if media_type == COLUMNAR_JSON:
+        return encode_columnar_json(records, schema)
+    return encode_json(records)
+
+
+def records_response(
+    media_type: str,
+    records: list[dict[str, Any]],
+    schema: type[BaseModel],
+    headers: dict[str, str] | None = None,
+) -> Response:
+    headers = {**(headers or {}), "Vary": "Accept"}
+    return Response(content=encode(media_type, records, schema), media_type=media_type, headers=headers)
+
+
+def list_response(request: Request, query: Query, schema: type[BaseModel], fast: bool = False) -> Response | None:
+    """Serve a list in the negotiated format, or return None to let the route use the default ORM path."""
+    media_type = negotiate(request)
+    if media_type == JSON and not fast:
+        return None
+    return records_response(media_type, fetch_rows(query, schema), schema)
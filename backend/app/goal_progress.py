@@ -0,0 +1,80 @@
+"""
+Server-side goal progress
+
+Each goal keeps a running current_amount: the revenue collected since its
+date_started (same definition as the revenue_collected rollup). Revenue
+changes are applied to every active goal with one set-based UPDATE, so the
+cost per write is constant and no rows are loaded into Python. Goals that
+reach their target are marked achieved in the same transaction.
+"""
+
+from datetime import date
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from . import models, rollups
+
+
+def _active_goals(day: date):
+    return (
+        models.Goal.is_achieved.is_(False),
+        models.Goal.date_started <= day,
+        models.Goal.deadline >= day,
+    )
+
+
+def _mark_achieved(db: Session, day: date) -> int:
+    achieved = db.execute(
+        update(models.Goal)
+        .where(
+            *_active_goals(day),
+            models.Goal.target_amount > 0,
+            models.Goal.current_amount >= models.Goal.target_amount,
+        )
+        .values(is_achieved=True, date_achieved=day)
+    ).rowcount
+    if achieved:
+        rollups.increment(db, rollups.GOALS_ACHIEVED, achieved, day)
+    return achieved
+
+
+def apply_revenue(db: Session, delta: float, day: date | None = None) -> None:
+    """Add a revenue change to every active goal and achieve those that reach their target."""
+    if not delta:
+        return
+    if day is None:
+        day = date.today()
+    db.execute(
+        update(models.Goal)
+        .where(*_active_goals(day))
+        .values(current_amount=models.Goal.current_amount + delta)
+    )
+    if delta > 0:
+        _mark_achieved(db, day)
+
+
+def recalculate(db: Session, goal: models.Goal) -> None:
+    """Recompute a goal's progress from the revenue rollups.
+
+    Used when a goal is created or its window or target changes; ordinary
+    revenue changes go through apply_revenue instead.
+    """
+    today = date.today()
+    end = min(today, goal.deadline) if goal.deadline else today
+    goal.current_amount = (
+        db.query(func.coalesce(func.sum(models.DailyRollup.value), 0))
+        .filter(
+            models.DailyRollup.metric == rollups.REVENUE_COLLECTED,
+            models.DailyRollup.day >= goal.date_started,
+            models.DailyRollup.day <= end,
+        )
+        .scalar()
+    )
+    if (
+        not goal.is_achieved
+        and goal.target_amount > 0
+        and goal.current_amount >= goal.target_amount
+        and goal.date_started <= today <= goal.deadline
+    ):
+        goal.is_achieved = True
+        goal.date_achieved = today
+        rollups.increment(db, rollups.GOALS_ACHIEVED, 1, today)
@@ -1,8 +1,20 @@
-from fastapi import FastAPI
+import logging
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .settings import settings
-from .db import Base, engine
-from .routers import auth, clients, customers, goals, leads, stats, activities, tasks, notes
+from .db import Base, SessionLocal, engine, record_write, track_writes
+from .archive import ensure_partitions
+from .scheduler import scheduler
+from .cache import bus
+from .events import broker
+from .auth import load_revoked_tokens
+from .deps import get_metrics_reader
+from .crud import prune_revoked_tokens
+from . import metrics
+from .routers import auth, clients, customers, goals, leads, stats, activities, tasks, notes, events
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Pulse CRM API")
 
@@ -13,12 +25,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"] ,
     allow_headers=["*"] ,
+    expose_headers=["X-Next-Cursor", "X-Last-Write"],
 )
 
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """Requests that committed on the primary pin the caller's next reads to it (see db.get_read_db)."""
+    commits = track_writes()
+    response = await call_next(request)
+    if commits and response.status_code < 400:
+        record_write(request, response)
+    return response
+
+
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    try:
+        ensure_partitions(engine)
+    except Exception:
+        # Missing partitions only route new rows to activities_default;
+        # archive_activities.py retries and reports the error
+        logger.exception("Failed to create activity partitions")
+    db = SessionLocal()
+    try:
+        prune_revoked_tokens(db)
+        load_revoked_tokens(db)
+    finally:
+        db.close()
+    bus.start()
+    if settings.scheduler_enabled:
+        scheduler.start(SessionLocal)
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    broker.close_all()
+    scheduler.stop()
+    bus.stop()
 
 
 app.include_router(auth.router)
@@ -30,8 +75,15 @@ app.include_router(stats.router)
 app.include_router(activities.router)
 app.include_router(tasks.router)
 app.include_router(notes.router)
+app.include_router(events.router)
 
 
 @app.get("/health")
 def health():
     return {"ok": True}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(get_metrics_reader)])
+def get_metrics():
+    """Process-local counters in the Prometheus text format (see app/metrics.py)."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,73 @@
+"""
+Process-local metrics, served at GET /metrics in the Prometheus text format
+
+Counters are incremented in place; gauges are read from a callback when the
+metrics are rendered. Values are per worker process, so a scraper should
+collect every worker (or sum them).
+"""
+
+import threading
+from typing import Callable
+
+_lock = threading.Lock()
+_help: dict[str, tuple[str, str]] = {}  # name -> (type, help text)
+_counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+_gauges: dict[str, Callable[[], float]] = {}
+
+
+def counter(name: str, help_text: str) -> None:
+    """Declare a counter so it is listed (at 0) before it is first incremented."""
+    with _lock:
+        _help[name] = ("counter", help_text)
+        _counters.setdefault(name, {})
+
+
+def gauge(name: str, help_text: str, read: Callable[[], float], kind: str = "gauge") -> None:
+    """Register a value read at render time; kind="counter" for running totals kept elsewhere."""
+    with _lock:
+        _help[name] = (kind, help_text)
+        _gauges[name] = read
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+
+def value(name: str, **labels: str) -> float:
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        return _counters.get(name, {}).get(key, 0)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels) + "}"
+
+
+def render() -> str:
+    lines = []
+    with _lock:
+        counters = {name: dict(series) for name, series in _counters.items()}
+        gauges = dict(_gauges)
+        described = dict(_help)
+    for name in sorted(set(counters) | set(gauges)):
+        kind, help_text = described.get(name, ("gauge" if name in gauges else "counter", ""))
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if name in gauges:
+            try:
+                lines.append(f"{name} {float(gauges[name]())}")
+            except Exception:
+                continue
+        for labels, amount in sorted(counters.get(name, {}).items()):
+            lines.append(f"{name}{_format_labels(labels)} {amount}")
+    return "\n".join(lines) + "\n"
@@ -2,7 +2,8 @@ import uuid
 from datetime import date, datetime
 from enum import Enum
 from typing import Optional
-from sqlalchemy import Boolean, Date, DateTime, Float, String, Enum as SQLEnum, ForeignKey
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, Integer, String, Enum as SQLEnum, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .db import Base
 
@@ -43,10 +44,13 @@ class Lead(Base):
     contact: Mapped[str] = mapped_column(String(255))
     comment: Mapped[str] = mapped_column(String(500), default="")
     status: Mapped[LeadStatus] = mapped_column(SQLEnum(LeadStatus), default=LeadStatus.NEW)
+    created_at: Mapped[datetime | None] = mapped_column(DateTime, default=datetime.utcnow, nullable=True)  # NULL for leads created before rollups existed
     
-    # Relationships (cascade delete to avoid orphan rows)
-    tasks: Mapped[list["Task"]] = relationship("Task", back_populates="lead", cascade="all, delete-orphan")
-    notes: Mapped[list["Note"]] = relationship("Note", back_populates="lead", cascade="all, delete-orphan")
+    # Relationships (cascade delete to avoid orphan rows). passive_deletes leaves
+    # unloaded children to the ON DELETE CASCADE foreign keys instead of
+    # SELECTing and deleting them one by one.
+    tasks: Mapped[list["Task"]] = relationship("Task", back_populates="lead", cascade="all, delete-orphan", passive_deletes=True)
+    notes: Mapped[list["Note"]] = relationship("Note", back_populates="lead", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Client(Base):
@@ -70,9 +74,9 @@ class Client(Base):
     maintenance_plan: Mapped[bool] = mapped_column(Boolean, default=False)
     renewal_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     
-    # Relationships (cascade delete to avoid orphan rows)
-    tasks: Mapped[list["Task"]] = relationship("Task", back_populates="client", cascade="all, delete-orphan")
-    notes: Mapped[list["Note"]] = relationship("Note", back_populates="client", cascade="all, delete-orphan")
+    # Relationships (cascade delete to avoid orphan rows, see Lead)
+    tasks: Mapped[list["Task"]] = relationship("Task", back_populates="client", cascade="all, delete-orphan", passive_deletes=True)
+    notes: Mapped[list["Note"]] = relationship("Note", back_populates="client", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Customer(Base):
@@ -101,10 +105,23 @@ class Goal(Base):
     date_started: Mapped[date] = mapped_column(Date)
     date_achieved: Mapped[date | None] = mapped_column(Date, nullable=True)
     is_achieved: Mapped[bool] = mapped_column(Boolean, default=False)
+    current_amount: Mapped[float] = mapped_column(Float, default=0)  # Revenue since date_started, maintained by app/goal_progress.py
 
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        # Foreign key indexes, so ON DELETE CASCADE finds the children without scanning.
+        # Same names as in migrations/001_add_referential_integrity.sql (and 002), so
+        # migrated and freshly created databases carry one index per column
+        Index("idx_activity_lead_id", "lead_id"),
+        Index("idx_activity_client_id", "client_id"),
+        Index("idx_activity_goal_id", "goal_id"),
+        Index("idx_activity_task_id", "task_id"),
+        Index("idx_activity_customer_id", "customer_id"),
+        # Activities logged against an entity without its foreign key (see crud.get_client_detail)
+        Index("ix_activities_entity_created", "entity_type", "entity_id", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     activity_type: Mapped[str] = mapped_column(String(50))  # lead_created, client_added, customer_completed, goal_achieved, task_completed
@@ -112,7 +129,7 @@ class Activity(Base):
     entity_id: Mapped[str] = mapped_column(String(36))
     entity_name: Mapped[str] = mapped_column(String(255))
     description: Mapped[str] = mapped_column(String(500))
-    activity_metadata: Mapped[str] = mapped_column(String(1000), default="{}")  # JSON string for additional data
+    activity_metadata: Mapped[dict] = mapped_column(JSON().with_variant(JSONB(), "postgresql"), default=dict)  # JSONB on Postgres, JSON1 text on SQLite
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     
     # Foreign keys for referential integrity (polymorphic - only one will be populated based on entity_type)
@@ -125,6 +142,16 @@ class Activity(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Task board filters (see crud.list_tasks); mirrored in migrations/003_add_task_indexes.sql
+        Index("ix_tasks_status_priority_due", "status", "priority", "due_date"),
+        Index("ix_tasks_priority_due", "priority", "due_date"),
+        Index("ix_tasks_related_created", "related_to", "related_id", "created_at"),
+        Index("ix_tasks_created_id", "created_at", "id"),
+        # Foreign key indexes for ON DELETE CASCADE (see Activity)
+        Index("idx_task_client_id", "client_id"),
+        Index("idx_task_lead_id", "lead_id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     title: Mapped[str] = mapped_column(String(255))
@@ -154,6 +181,13 @@ class Task(Base):
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        # Per-entity note lookups (crud.list_notes / crud.batch_get_notes); mirrored in migrations/004_add_note_indexes.sql
+        Index("ix_notes_related", "related_to", "related_id"),
+        # Foreign key indexes for ON DELETE CASCADE (see Activity)
+        Index("idx_note_client_id", "client_id"),
+        Index("idx_note_lead_id", "lead_id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     content: Mapped[str] = mapped_column(String(2000))
@@ -171,3 +205,63 @@ class Note(Base):
     # Relationships
     client: Mapped[Optional["Client"]] = relationship("Client", back_populates="notes", foreign_keys=[client_id])
     lead: Mapped[Optional["Lead"]] = relationship("Lead", back_populates="notes", foreign_keys=[lead_id])
+
+
+class ScheduledEventClaim(Base):
+    """One row per fired scheduler event; the primary key guarantees each event fires once."""
+    __tablename__ = "scheduled_event_claims"
+
+    event_key: Mapped[str] = mapped_column(String(120), primary_key=True)  # <kind>:<entity_id>:<event date>
+    fired_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class DailyRollup(Base):
+    """Pre-aggregated daily value of one analytics metric (see app/rollups.py)."""
+    __tablename__ = "daily_rollups"
+
+    metric: Mapped[str] = mapped_column(String(50), primary_key=True)  # revenue_collected, leads_created, clients_onboarded, customers_completed, goals_achieved
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    value: Mapped[float] = mapped_column(Float, default=0)
+
+
+class CacheInvalidation(Base):
+    """Invalidation message for workers without Postgres LISTEN/NOTIFY (see app/cache.py)."""
+    __tablename__ = "cache_invalidations"
+    __table_args__ = {"sqlite_autoincrement": True}  # ids must never be reused, pollers track the last one seen
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    payload: Mapped[str] = mapped_column(String(8000))  # JSON: {"o": origin worker, "t": table, "k": keys or null}
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class RateLimitBucket(Base):
+    """Token bucket shared by all workers when RATE_LIMIT_BACKEND=database (see app/ratelimit.py)."""
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(300), primary_key=True)  # e.g. login:ip:<address>
+    tokens: Mapped[float] = mapped_column(Float)
+    updated_at: Mapped[float] = mapped_column(Float)  # Unix time of the last refill
+    allowed: Mapped[bool] = mapped_column(Boolean, default=True)  # outcome of the last take()
+
+
+class RefreshToken(Base):
+    """Rotating refresh token, stored only as an HMAC of the token (see crud.rotate_refresh_token)."""
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    family_id: Mapped[str] = mapped_column(String(36), index=True)  # all rotations descending from one login
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    replaced_by: Mapped[str | None] = mapped_column(String(36), nullable=True)  # id of the token it was rotated into
+
+
+class RevokedToken(Base):
+    """Access token revoked before its exp (e.g. on logout); kept until it would have expired anyway."""
+    __tablename__ = "revoked_tokens"
+
+    token_digest: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 hex of the JWT
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,154 @@
+"""
+Token-bucket rate limiting
+
+A bucket holds up to `capacity` tokens and refills continuously at
+capacity / window_seconds per second; every attempt takes one token and is
+rejected when none is left. Login uses two buckets per attempt, one for the
+client IP and one for the username, checked before the user is looked up or
+any password is hashed.
+
+Backends are pluggable (set_backend(), or the rate_limit_backend setting):
+- MemoryBackend: per-process buckets, the default; with N workers the
+  effective limit is up to N times higher;
+- DatabaseBackend: one row per bucket in rate_limit_buckets, updated with a
+  single atomic upsert, shared by every worker.
+Any object with the same take() method (e.g. one backed by Redis) can be
+plugged in.
+
+Client IPs come from request.client; run uvicorn with --proxy-headers behind
+a trusted proxy so that is the real client address.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+from fastapi import HTTPException, Request, status
+from sqlalchemy import case, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from . import metrics, models
+from .settings import settings
+
+metrics.counter("pulse_ratelimit_decisions_total", "Rate limiter decisions by limit and outcome")
+
+
+@dataclass(frozen=True)
+class Limit:
+    name: str
+    capacity: int
+    window_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.window_seconds
+
+
+class Backend(Protocol):
+    def take(self, key: str, limit: Limit) -> tuple[bool, float]:
+        """Take one token; returns (allowed, seconds until a token is available)."""
+
+
+def _retry_after(tokens: float, limit: Limit) -> float:
+    return max(0.0, (1 - tokens) / limit.refill_per_second)
+
+
+class MemoryBackend:
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Evicting the least recently used bucket only resets it to full
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else _retry_after(tokens, limit)
+
+
+class DatabaseBackend:
+    """Buckets in rate_limit_buckets, refilled and taken in one INSERT ... ON CONFLICT DO UPDATE ... RETURNING."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        dialect = engine.dialect.name
+        if dialect not in ("postgresql", "sqlite"):
+            raise ValueError(f"DatabaseBackend does not support {dialect}")
+        self._insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        models.RateLimitBucket.__table__.create(engine, checkfirst=True)
+
+    def take(self, key: str, limit: Limit) -> tuple[bool, float]:
+        table = models.RateLimitBucket.__table__
+        now = time.time()
+        stmt = self._insert(table).values(key=key, tokens=limit.capacity - 1, updated_at=now, allowed=True)
+        refilled = table.c.tokens + (literal(now) - table.c.updated_at) * limit.refill_per_second
+        refilled = case((refilled > limit.capacity, literal(float(limit.capacity))), else_=refilled)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                "tokens": case((refilled >= 1, refilled - 1), else_=refilled),
+                "updated_at": now,
+                "allowed": refilled >= 1,
+            },
+        ).returning(table.c.allowed, table.c.tokens)
+        with self.engine.begin() as conn:
+            allowed, tokens = conn.execute(stmt).one()
+        return bool(allowed), 0.0 if allowed else _retry_after(tokens, limit)
+
+
+_backend: Backend | None = None
+
+
+def set_backend(backend: Backend) -> None:
+    global _backend
+    _backend = backend
+
+
+def get_backend() -> Backend:
+    global _backend
+    if _backend is None:
+        if settings.rate_limit_backend == "database":
+            from .db import engine
+
+            _backend = DatabaseBackend(engine)
+        else:
+            _backend = MemoryBackend()
+    return _backend
+
+
+def check(limit: Limit, subject: str) -> float | None:
+    """Take a token for subject; returns None if allowed, else seconds to wait."""
+    allowed, retry_after = get_backend().take(f"{limit.name}:{subject}", limit)
+    metrics.inc("pulse_ratelimit_decisions_total", limit=limit.name, decision="allow" if allowed else "reject")
+    return None if allowed else retry_after
+
+
+def login_limits() -> tuple[Limit, Limit]:
+    return (
+        Limit("login:ip", settings.login_attempts_per_ip, settings.login_rate_window_seconds),
+        Limit("login:username", settings.login_attempts_per_username, settings.login_rate_window_seconds),
+    )
+
+
+def throttle_login(request: Request, username: str) -> None:
+    """Raise 429 if this IP or username has no login attempts left."""
+    ip_limit, username_limit = login_limits()
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = check(ip_limit, client_ip)
+    if retry_after is None:
+        retry_after = check(username_limit, username.strip().lower())
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
@@ -0,0 +1,201 @@
+"""
+Daily analytics rollups
+
+The daily_rollups table holds one row per (metric, day). The crud layer keeps it
+up to date incrementally: every write that changes a metric calls increment()
+inside the same transaction, so a rollup is never out of sync with the rows it
+summarises. Time-series reads (GET /stats/timeseries) only touch this table.
+
+backfill() rebuilds the table from the history the other tables still record
+(see backfill_rollups.py).
+"""
+
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, delete, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from . import models
+
+REVENUE_COLLECTED = "revenue_collected"
+LEADS_CREATED = "leads_created"
+CLIENTS_ONBOARDED = "clients_onboarded"
+CUSTOMERS_COMPLETED = "customers_completed"
+GOALS_ACHIEVED = "goals_achieved"
+
+METRICS = (
+    REVENUE_COLLECTED,
+    LEADS_CREATED,
+    CLIENTS_ONBOARDED,
+    CUSTOMERS_COMPLETED,
+    GOALS_ACHIEVED,
+)
+
+BUCKETS = ("day", "week", "month")
+
+# Longest from..to span per bucket, so a time series stays a bounded number of points
+MAX_SPAN_DAYS = {"day": 366, "week": 5 * 366, "month": 20 * 366}
+
+
+def increment(db: Session, metric: str, amount: float = 1, day: date | None = None) -> None:
+    """Add amount to a metric's value for day (today by default) with a single upsert."""
+    if not amount:
+        return
+    if day is None:
+        day = date.today()
+    table = models.DailyRollup.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(table).values(metric=metric, day=day, value=amount)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.metric, table.c.day],
+            set_={"value": table.c.value + stmt.excluded.value},
+        )
+        db.execute(stmt)
+        return
+
+    result = db.execute(
+        update(table)
+        .where(table.c.metric == metric, table.c.day == day)
+        .values(value=table.c.value + amount)
+    )
+    if not result.rowcount:
+        db.execute(insert(table).values(metric=metric, day=day, value=amount))
+
+
+def move(db: Session, metric: str, old_day: date | None, new_day: date | None, amount: float = 1) -> None:
+    """Re-attribute amount from one day to another, e.g. when a business date is edited."""
+    if old_day == new_day:
+        return
+    if old_day is not None:
+        increment(db, metric, -amount, old_day)
+    if new_day is not None:
+        increment(db, metric, amount, new_day)
+
+
+# ---------------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------------
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def backfill(db: Session) -> dict[str, int]:
+    """Rebuild every rollup from the rows currently in the database.
+
+    History that is no longer stored cannot be recovered: leads created before
+    leads.created_at existed, and clients already converted into customers, are
+    not counted. Client payments are attributed to the onboarding date because
+    individual payment dates are not recorded.
+
+    Returns the number of rollup rows written per metric.
+    """
+    totals: dict[tuple[str, date], float] = {}
+
+    def add(metric: str, day, amount) -> None:
+        if day is None or not amount:
+            return
+        key = (metric, _as_date(day))
+        totals[key] = totals.get(key, 0) + amount
+
+    lead_day = func.date(models.Lead.created_at)
+    for day, count in (
+        db.query(lead_day, func.count())
+        .filter(models.Lead.created_at.isnot(None))
+        .group_by(lead_day)
+    ):
+        add(LEADS_CREATED, day, count)
+
+    # Completed clients' payments are counted through their customer record
+    open_payments = case((models.Client.is_completed.is_(False), models.Client.payment_collected), else_=0)
+    for day, count, payments in db.query(
+        models.Client.onboarding, func.count(), func.coalesce(func.sum(open_payments), 0)
+    ).group_by(models.Client.onboarding):
+        add(CLIENTS_ONBOARDED, day, count)
+        add(REVENUE_COLLECTED, day, payments)
+
+    for day, count, paid in db.query(
+        models.Customer.completed_date, func.count(), func.coalesce(func.sum(models.Customer.total_paid), 0)
+    ).group_by(models.Customer.completed_date):
+        add(CUSTOMERS_COMPLETED, day, count)
+        add(REVENUE_COLLECTED, day, paid)
+
+    for day, count in (
+        db.query(models.Goal.date_achieved, func.count())
+        .filter(models.Goal.is_achieved.is_(True), models.Goal.date_achieved.isnot(None))
+        .group_by(models.Goal.date_achieved)
+    ):
+        add(GOALS_ACHIEVED, day, count)
+
+    db.execute(delete(models.DailyRollup))
+    if totals:
+        db.execute(
+            insert(models.DailyRollup),
+            [{"metric": metric, "day": day, "value": value} for (metric, day), value in totals.items()],
+        )
+    db.commit()
+
+    written = {metric: 0 for metric in METRICS}
+    for metric, _ in totals:
+        written[metric] += 1
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, bucket: str) -> date:
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return date(start.year + (start.month == 12), start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def timeseries(db: Session, metric: str, start: date, end: date, bucket: str = "day") -> list[dict]:
+    """Bucketed values of a metric between start and end (inclusive), zero-filled.
+
+    Raises ValueError when the span is longer than MAX_SPAN_DAYS allows for the
+    bucket, or when end falls in the last bucket the date type can represent.
+    """
+    if (end - start).days > MAX_SPAN_DAYS[bucket]:
+        raise ValueError(f"'{bucket}' buckets cover at most {MAX_SPAN_DAYS[bucket]} days")
+    try:
+        _next_bucket(bucket_start(end, bucket), bucket)
+    except (OverflowError, ValueError):
+        raise ValueError("'to' is out of range") from None
+    rows = (
+        db.query(models.DailyRollup.day, models.DailyRollup.value)
+        .filter(
+            models.DailyRollup.metric == metric,
+            models.DailyRollup.day >= start,
+            models.DailyRollup.day <= end,
+        )
+        .all()
+    )
+    values: dict[date, float] = {}
+    for day, value in rows:
+        key = bucket_start(day, bucket)
+        values[key] = values.get(key, 0) + value
+
+    points = []
+    current = bucket_start(start, bucket)
+    while current <= end:
+        points.append({"bucket_start": current, "value": values.get(current, 0)})
+        current = _next_bucket(current, bucket)
+    return points
@@ -1,18 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from .. import crud, schemas, models
-from ..deps import get_db, get_current_user
+from .. import archive, crud, fastpath, schemas, models
+from ..deps import get_db, get_read_db, get_current_user
 
 router = APIRouter(prefix="/activities", tags=["activities"])
 
 
+def parse_metadata_filters(request: Request) -> list[tuple[str, str, str]]:
+    """Collect `meta.<key>[_<op>]=<value>` query parameters, e.g. `meta.amount_gt=1000`."""
+    filters = []
+    for name, value in request.query_params.multi_items():
+        if not name.startswith("meta."):
+            continue
+        key = name[len("meta."):]
+        op = "eq"
+        base, _, suffix = key.rpartition("_")
+        if base and suffix in crud.METADATA_OPERATORS:
+            key, op = base, suffix
+        filters.append((key, op, value))
+    return filters
+
+
 @router.get("", response_model=list[schemas.ActivityOut])
 def list_activities(
+    request: Request,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    fast: bool = Query(False, description="Column-only select encoded without ORM/Pydantic hydration"),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """List recent activities. Filter on metadata with `meta.<key>[_eq|_ne|_gt|_gte|_lt|_lte]=<value>`."""
+    try:
+        query = crud.query_activities(db, limit=limit, metadata_filters=parse_metadata_filters(request))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return fastpath.list_response(request, query, schemas.ActivityOut, fast=fast) or query.all()
+
+
+@router.get("/archive", response_model=list[str])
+def list_archived_months(current_user: models.User = Depends(get_current_user)):
+    """Months (YYYY-MM) that have been moved out of the hot activities table."""
+    return archive.list_archived_months()
+
+
+@router.get("/archive/{month}", response_model=list[schemas.ActivityOut])
+def list_archived_activities(
+    month: str,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
     current_user: models.User = Depends(get_current_user),
 ):
-    return crud.list_activities(db, limit=limit)
+    """Read-only view of an archived month, newest first."""
+    try:
+        month_date = archive.parse_month(month)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if not archive.is_archived(month_date):
+        raise HTTPException(status_code=404, detail="Archive not found")
+    return list(
+        archive.read_archived_activities(
+            month_date, entity_type=entity_type, entity_id=entity_id, limit=limit, offset=offset
+        )
+    )
 
 
 @router.post("", response_model=schemas.ActivityOut)
@@ -1,16 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 import logging
 from ..db import get_db
-from ..crud import create_user, get_user_by_email
-from ..auth import create_access_token, verify_password
-from ..schemas import Token, UserCreate, UserOut
+from ..crud import (
+    create_refresh_token,
+    create_user,
+    get_user_by_email,
+    update_password_hash,
+    revoke_access_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+from ..auth import create_access_token, decode_access_token, needs_rehash, verify_password
+from ..ratelimit import throttle_login
+from .. import metrics
+from ..schemas import RefreshRequest, Token, UserCreate, UserOut
+from ..settings import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+metrics.counter("pulse_login_attempts_total", "Login attempts by result")
+metrics.counter("pulse_token_refresh_total", "Refresh token exchanges by result")
+
+
+def _token_response(email: str, refresh_token: str) -> Token:
+    return Token(
+        access_token=create_access_token(email),
+        token_type="bearer",
+        expires_in=settings.access_token_expire_minutes * 60,
+        refresh_token=refresh_token,
+    )
+
 
 @router.post("/register", response_model=UserOut)
 def register(payload: UserCreate, db: Session = Depends(get_db)):
@@ -30,20 +53,65 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login with email and password, returns JWT token"""
     logger.info(f"🔑 Login attempt: username={form_data.username}")
+    # Throttle before the lookup and the PBKDF2 check
+    try:
+        throttle_login(request, form_data.username)
+    except HTTPException:
+        metrics.inc("pulse_login_attempts_total", result="throttled")
+        logger.warning(f"⚠️ Login throttled: username={form_data.username}")
+        raise
     user = get_user_by_email(db, form_data.username)
     if not user:
+        metrics.inc("pulse_login_attempts_total", result="unknown_user")
         logger.warning(f"⚠️ User not found: {form_data.username}")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     if not verify_password(form_data.password, user.password_hash):
+        metrics.inc("pulse_login_attempts_total", result="invalid_password")
         logger.warning(f"⚠️ Invalid password for user: {form_data.username}")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if needs_rehash(user.password_hash):
+        try:
+            update_password_hash(db, user, form_data.password)
+            logger.info(f"🔁 Password hash upgraded: {form_data.username}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error upgrading password hash: {e}")
     try:
-        token = create_access_token(user.email)
+        token = _token_response(user.email, create_refresh_token(db, user))
+        metrics.inc("pulse_login_attempts_total", result="success")
         logger.info(f"✅ Login successful: {form_data.username}")
-        return Token(access_token=token, token_type="bearer")
+        return token
     except Exception as e:
         logger.error(f"❌ Error generating token: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Token generation failed")
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(payload: RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token and a new refresh token (the old one stops working)"""
+    try:
+        user, refresh_token = rotate_refresh_token(db, payload.refresh_token)
+    except ValueError as e:
+        reason = str(e)
+        metrics.inc("pulse_token_refresh_total", result=reason)
+        if reason == "reused":
+            logger.warning("⚠️ Refresh token reuse detected, token family revoked")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    metrics.inc("pulse_token_refresh_total", result="rotated")
+    return _token_response(user.email, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(payload: RefreshRequest, authorization: str | None = Header(None), db: Session = Depends(get_db)):
+    """Revoke the refresh token and every token rotated from the same login, and the bearer access token if sent"""
+    revoke_refresh_token(db, payload.refresh_token)
+    scheme, _, access_token = (authorization or "").partition(" ")
+    if scheme.lower() == "bearer" and access_token:
+        try:
+            decode_access_token(access_token)
+        except HTTPException:
+            return  # already invalid, nothing to revoke
+        revoke_access_token(db, access_token)
@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..deps import get_current_user
-from .. import crud, models, schemas
+from .. import crud, fastpath, models, schemas
 
 router = APIRouter(prefix="/clients", tags=["clients"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("", response_model=list[schemas.ClientOut])
-def list_clients(db: Session = Depends(get_db)):
-    return crud.list_clients(db)
+def list_clients(
+    request: Request,
+    fast: bool = Query(False, description="Column-only select encoded without ORM/Pydantic hydration"),
+    db: Session = Depends(get_read_db),
+):
+    response = fastpath.list_response(request, crud.query_clients(db), schemas.ClientOut, fast=fast)
+    return response or crud.list_clients(db)
+
+
+@router.get("/{client_id}/detail", response_model=schemas.ClientDetailOut)
+def get_client_detail(client_id: str, activity_limit: int = 20, db: Session = Depends(get_read_db)):
+    """A client with its tasks, pinned-first notes and recent activities in one response."""
+    detail = crud.get_client_detail(db, client_id, activity_limit=activity_limit)
+    if not detail:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return detail
 
 
 @router.post("", response_model=schemas.ClientOut)
@@ -25,6 +39,18 @@ def update_client(client_id: str, payload: schemas.ClientUpdate, db: Session = D
     return crud.update_client(db, client, payload)
 
 
+@router.post("/{client_id}/complete", response_model=schemas.ClientCompletionOut)
+def complete_client(client_id: str, payload: schemas.ClientComplete, db: Session = Depends(get_db)):
+    """Turn a finished client into a customer and close its open tasks."""
+    client = db.get(models.Client, client_id)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    if client.is_completed:
+        raise HTTPException(status_code=409, detail="Client already completed")
+    customer, closed = crud.complete_client(db, client, payload.completed_date)
+    return {"client": client, "customer": customer, "closed_tasks": closed}
+
+
 @router.delete("/{client_id}")
 def delete_client(client_id: str, db: Session = Depends(get_db)):
     client = db.get(models.Client, client_id)
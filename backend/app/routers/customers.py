@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..deps import get_current_user
-from .. import crud, models, schemas
+from .. import crud, fastpath, models, schemas
 
 router = APIRouter(prefix="/customers", tags=["customers"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("", response_model=list[schemas.CustomerOut])
-def list_customers(db: Session = Depends(get_db)):
-    return crud.list_customers(db)
+def list_customers(
+    request: Request,
+    fast: bool = Query(False, description="Column-only select encoded without ORM/Pydantic hydration"),
+    db: Session = Depends(get_read_db),
+):
+    response = fastpath.list_response(request, crud.query_customers(db), schemas.CustomerOut, fast=fast)
+    return response or crud.list_customers(db)
 
 
 @router.post("", response_model=schemas.CustomerOut)
@@ -0,0 +1,116 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from .. import models
+from ..db import SessionLocal
+from ..deps import authenticate, get_stream_user
+from ..events import ENTITIES, RESET, broker, format_sse
+from ..settings import settings
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def _parse_entities(entities: str | None) -> set[str] | None:
+    if not entities:
+        return None
+    wanted = {entity.strip() for entity in entities.split(",") if entity.strip()}
+    unknown = wanted - set(ENTITIES.values())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown entities: {', '.join(sorted(unknown))}")
+    return wanted
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    entities: str | None = Query(None, description="Comma-separated entities to receive, e.g. lead,task (default: all)"),
+    last_event_id: str | None = Query(None, description="Resume after this event id (same as the Last-Event-ID header)"),
+    current_user: models.User = Depends(get_stream_user),
+):
+    """Server-Sent Events stream of committed changes.
+
+    Each `change` event carries {entity, id, op, fields}. A `reset` event means
+    events were missed and the client should refetch. A comment line is sent
+    every events_heartbeat_seconds to keep proxies from closing the stream.
+    """
+    wanted = _parse_entities(entities)
+    subscription = broker.subscribe(wanted, request.headers.get("last-event-id") or last_event_id)
+
+    async def generate():
+        try:
+            yield f"retry: {settings.events_retry_ms}\n\n"
+            while not subscription.closed:
+                items = subscription.drain()
+                if items is None:
+                    yield format_sse(None, RESET, {})
+                else:
+                    for event_id, event in items:
+                        yield format_sse(event_id, "change", event)
+                if not items:
+                    await subscription.wait(settings.events_heartbeat_seconds)
+                    if await request.is_disconnected():
+                        break
+                    if not subscription.wake.is_set():
+                        yield ": ping\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def stream_events_ws(
+    websocket: WebSocket,
+    access_token: str = Query(...),
+    entities: str | None = Query(None),
+    last_event_id: str | None = Query(None),
+):
+    """Same stream over a WebSocket: JSON messages {"type": "change", "event_id", ...event}, {"type": "reset"} or {"type": "ping"}."""
+
+    def check_token():
+        db = SessionLocal()
+        try:
+            return authenticate(access_token, db)
+        finally:
+            db.close()
+
+    try:
+        await run_in_threadpool(check_token)
+        wanted = _parse_entities(entities)
+    except HTTPException as exc:
+        await websocket.close(code=1008, reason=str(exc.detail))
+        return
+    await websocket.accept()
+    subscription = broker.subscribe(wanted, last_event_id)
+
+    async def watch_disconnect():
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            subscription.closed = True
+            subscription.wake.set()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        while not subscription.closed:
+            items = subscription.drain()
+            if items is None:
+                await websocket.send_json({"type": RESET})
+            else:
+                for event_id, event in items:
+                    await websocket.send_json({"type": "change", "event_id": event_id, **event})
+            if not items:
+                await subscription.wait(settings.events_heartbeat_seconds)
+                if not subscription.wake.is_set() and not subscription.closed:
+                    await websocket.send_json({"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        watcher.cancel()
+        broker.unsubscribe(subscription)
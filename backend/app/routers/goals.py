@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..deps import get_current_user
-from .. import crud, models, schemas
+from .. import crud, fastpath, models, schemas
 
 router = APIRouter(prefix="/goals", tags=["goals"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("", response_model=list[schemas.GoalOut])
-def list_goals(db: Session = Depends(get_db)):
-    return crud.list_goals(db)
+def list_goals(
+    request: Request,
+    fast: bool = Query(False, description="Column-only select encoded without ORM/Pydantic hydration"),
+    db: Session = Depends(get_read_db),
+):
+    response = fastpath.list_response(request, crud.query_goals(db), schemas.GoalOut, fast=fast)
+    return response or crud.list_goals(db)
 
 
 @router.post("", response_model=schemas.GoalOut)
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..deps import get_current_user
-from .. import crud, models, schemas
+from .. import crud, fastpath, models, schemas
 
 router = APIRouter(prefix="/leads", tags=["leads"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("", response_model=list[schemas.LeadOut])
-def list_leads(db: Session = Depends(get_db)):
-    return crud.list_leads(db)
+def list_leads(
+    request: Request,
+    fast: bool = Query(False, description="Column-only select encoded without ORM/Pydantic hydration"),
+    db: Session = Depends(get_read_db),
+):
+    response = fastpath.list_response(request, crud.query_leads(db), schemas.LeadOut, fast=fast)
+    return response or crud.list_leads(db)
 
 
 @router.post("", response_model=schemas.LeadOut)
@@ -36,3 +41,13 @@ def delete_lead(lead_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Lead not found")
     crud.delete_lead(db, lead)
     return {"ok": True}
+
+
+@router.post("/{lead_id}/convert", response_model=schemas.ClientDetailOut)
+def convert_lead(lead_id: str, payload: schemas.LeadConvert, db: Session = Depends(get_db)):
+    """Convert a lead into a client with its onboarding tasks; returns the new client's detail."""
+    lead = db.get(models.Lead, lead_id)
+    if not lead:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    client = crud.convert_lead(db, lead, payload)
+    return crud.get_client_detail(db, client.id)
@@ -1,19 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from .. import crud, schemas, models
-from ..deps import get_db, get_current_user
+from .. import crud, fastpath, schemas, models
+from ..deps import get_db, get_read_db, get_current_user
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
 
 @router.get("", response_model=list[schemas.NoteOut])
 def list_notes(
+    request: Request,
     related_to: str = Query(..., description="Entity type: 'lead' or 'client'"),
     related_id: str | None = Query(None, description="Optional: specific entity ID to filter by"),
-    db: Session = Depends(get_db),
+    fast: bool = Query(False, description="Column-only select encoded without ORM/Pydantic hydration"),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    query = crud.query_notes(db, related_to, related_id)
+    return fastpath.list_response(request, query, schemas.NoteOut, fast=fast) or query.all()
+
+
+@router.post("/batch-get", response_model=schemas.NoteBatchOut)
+def batch_get_notes(
+    payload: schemas.NoteBatchRequest,
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return crud.list_notes(db, related_to=related_to, related_id=related_id)
+    """Notes for many leads/clients in one call, grouped by entity ID, with per-entity counts.
+
+    Set `latest` to only return the newest N notes (pinned first) per entity.
+    """
+    notes, counts = crud.batch_get_notes(
+        db, related_to=payload.related_to, related_ids=payload.related_ids, latest=payload.latest
+    )
+    return {"notes": notes, "counts": counts}
 
 
 @router.post("", response_model=schemas.NoteOut)
@@ -22,7 +42,11 @@ def create_note(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return crud.create_note(db, payload)
+    try:
+        return crud.create_note(db, payload)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Related {payload.related_to} not found")
 
 
 @router.patch("/{note_id}", response_model=schemas.NoteOut)
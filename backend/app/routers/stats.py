@@ -1,13 +1,46 @@
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..deps import get_current_user
 from ..crud import build_stats
-from ..schemas import StatsOut
+from ..schemas import StatsOut, TimeseriesOut
+from ..cache import stats_cache
+from .. import rollups
 
 router = APIRouter(prefix="/stats", tags=["stats"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("", response_model=StatsOut)
 def get_stats(db: Session = Depends(get_db)):
-    return build_stats(db)
+    # Filled from the primary: a lagging replica would otherwise put stale
+    # totals back into the cache right after a write invalidated them
+    stats = stats_cache.get("stats")
+    if stats is None:
+        stats = build_stats(db)
+        stats_cache.set("stats", stats)
+    return stats
+
+
+@router.get("/timeseries", response_model=TimeseriesOut)
+def get_timeseries(
+    metric: str = Query(..., description=f"One of: {', '.join(rollups.METRICS)}"),
+    from_date: date | None = Query(None, alias="from", description="First day (defaults to 30 days before 'to')"),
+    to_date: date | None = Query(None, alias="to", description="Last day, inclusive (defaults to today)"),
+    bucket: str = Query("day", description="day, week or month"),
+    db: Session = Depends(get_read_db),
+):
+    """Time series of a daily metric, read from the pre-aggregated rollup table."""
+    if metric not in rollups.METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric '{metric}'")
+    if bucket not in rollups.BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Unknown bucket '{bucket}'")
+    to_date = to_date or date.today()
+    from_date = from_date or to_date - timedelta(days=min(29, (to_date - date.min).days))
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    try:
+        points = rollups.timeseries(db, metric, from_date, to_date, bucket)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"metric": metric, "bucket": bucket, "points": points}
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import date
-from .. import crud, schemas, models
-from ..deps import get_db, get_current_user
+from .. import crud, fastpath, schemas, models
+from ..deps import get_db, get_read_db, get_current_user
 from ..task_templates import create_task_list_for_client
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -10,10 +11,59 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 @router.get("", response_model=list[schemas.TaskOut])
 def list_tasks(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    status: list[str] | None = Query(None, description="Repeatable: pending, in_progress, completed, cancelled"),
+    priority: list[str] | None = Query(None, description="Repeatable: low, medium, high, urgent"),
+    due_before: date | None = Query(None, description="Due on or before this date"),
+    due_after: date | None = Query(None, description="Due on or after this date"),
+    related_to: str | None = Query(None, description="Entity type: 'client', 'lead' or 'general'"),
+    related_id: str | None = Query(None, description="Specific entity ID"),
+    overdue: bool = Query(False, description="Only open tasks past their due date"),
+    limit: int | None = Query(None, ge=1, le=1000, description="Page size; omit to return every match"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    fast: bool = Query(False, description="Column-only select encoded without ORM/Pydantic hydration"),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """List tasks newest first. When a page is full, X-Next-Cursor holds the cursor for the next one."""
+    try:
+        query = crud.query_tasks(
+            db,
+            status=status,
+            priority=priority,
+            due_before=due_before,
+            due_after=due_after,
+            related_to=related_to,
+            related_id=related_id,
+            overdue=overdue,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    media_type = fastpath.negotiate(request)
+    if fast or media_type != fastpath.JSON:
+        records = fastpath.fetch_rows(query, schemas.TaskOut)
+        headers = {}
+        if limit and len(records) == limit:
+            headers["X-Next-Cursor"] = crud.encode_task_cursor(records[-1]["created_at"], records[-1]["id"])
+        return fastpath.records_response(media_type, records, schemas.TaskOut, headers)
+    tasks = query.all()
+    if limit and len(tasks) == limit:
+        response.headers["X-Next-Cursor"] = crud.encode_task_cursor(tasks[-1].created_at, tasks[-1].id)
+    return tasks
+
+
+@router.get("/summary", response_model=schemas.TaskSummaryOut)
+def task_summary(
+    related_to: str | None = Query(None, description="Optional: scope to 'client' or 'lead' tasks"),
+    related_id: str | None = Query(None, description="Optional: scope to one client/lead"),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return crud.list_tasks(db)
+    """Counts for the task board header: status x priority, overdue and due this week."""
+    return crud.task_summary(db, related_to=related_to, related_id=related_id)
 
 
 @router.post("", response_model=schemas.TaskOut)
@@ -22,7 +72,11 @@ def create_task(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return crud.create_task(db, payload)
+    try:
+        return crud.create_task(db, payload)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Related {payload.related_to} not found")
 
 
 @router.patch("/{task_id}", response_model=schemas.TaskOut)
@@ -35,7 +89,13 @@ def update_task(
     task = crud.get_task_by_id(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return crud.update_task(db, task, payload)
+    # The rollback expires task, which would then report its stored value
+    related_to = payload.related_to or task.related_to
+    try:
+        return crud.update_task(db, task, payload)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Related {related_to} not found")
 
 
 @router.delete("/{task_id}")
@@ -0,0 +1,415 @@
+"""
+Deadline and renewal scheduler
+
+Upcoming client deadlines and client/customer renewal dates are kept in an
+in-process min-heap ordered by the time their reminder is due. The heap is
+loaded once at startup and then kept current by the crud layer, which calls
+schedule_client() / schedule_customer() / unschedule() after each commit, and
+by the invalidation bus for clients and customers changed by other workers
+(or everything, after a gap in the bus); the tables are never rescanned on a
+timer. A single background thread sleeps until
+the earliest reminder is due and then fires its handler, which creates a
+reminder Task and logs an Activity.
+
+Running several workers is safe:
+- on Postgres only the worker holding an advisory lock fires events, the
+  others keep their heaps warm and take over if the leader goes away;
+- every firing claims a row in scheduled_event_claims in the same transaction
+  as the handler's writes, so an event can never be fired twice, whatever the
+  database. A handler that fails is retried after RETRY_SECONDS; one that
+  finds nothing to do (row changed or gone) leaves no claim behind.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta
+from typing import Callable
+from sqlalchemy import and_, or_, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from . import models
+from .cache import bus
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+CLIENT_DEADLINE = "client_deadline"
+CLIENT_RENEWAL = "client_renewal"
+CUSTOMER_RENEWAL = "customer_renewal"
+
+# Arbitrary application-wide key for pg_try_advisory_lock
+LEADER_LOCK_KEY = 7_261_530
+
+# Upper bound on how long the worker sleeps, so leadership is re-checked regularly
+MAX_SLEEP_SECONDS = 60.0
+
+# Delay before a handler that raised is tried again
+RETRY_SECONDS = 300.0
+
+KINDS = {"client": (CLIENT_DEADLINE, CLIENT_RENEWAL), "customer": (CUSTOMER_RENEWAL,)}
+
+
+@dataclass(frozen=True)
+class ScheduledEvent:
+    kind: str
+    entity_id: str
+    event_date: date
+    due_at: datetime
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.entity_id}:{self.event_date.isoformat()}"
+
+
+def reminder_due_at(event_date: date) -> datetime:
+    """Reminders fire at the start of the day, scheduler_lead_days before the event."""
+    return datetime.combine(event_date - timedelta(days=settings.scheduler_lead_days), time.min)
+
+
+# ---------------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------------
+
+def _remind(db: Session, *, title: str, description: str, related_to: str, related_id: str | None,
+            client_id: str | None, event: ScheduledEvent, entity_type: str, entity_name: str,
+            activity_fk: dict) -> None:
+    task = models.Task(
+        title=title,
+        description=description,
+        related_to=related_to,
+        related_id=related_id,
+        client_id=client_id,
+        priority="high",
+        status="pending",
+        due_date=event.event_date,
+    )
+    db.add(task)
+    db.flush()
+    db.add(
+        models.Activity(
+            activity_type=f"{event.kind}_reminder",
+            entity_type=entity_type,
+            entity_id=event.entity_id,
+            entity_name=entity_name,
+            description=title,
+            activity_metadata={"due_date": event.event_date.isoformat(), "task_id": task.id},
+            **activity_fk,
+        )
+    )
+
+
+def handle_client_deadline(db: Session, event: ScheduledEvent) -> bool:
+    client = db.get(models.Client, event.entity_id)
+    if not client or client.is_completed or client.deadline != event.event_date:
+        return False
+    _remind(
+        db,
+        title=f"Deadline approaching: {client.business_name}",
+        description=f"Project deadline for {client.business_name} is {client.deadline.isoformat()}.",
+        related_to="client",
+        related_id=client.id,
+        client_id=client.id,
+        event=event,
+        entity_type="client",
+        entity_name=client.business_name,
+        activity_fk={"client_id": client.id},
+    )
+    return True
+
+
+def handle_client_renewal(db: Session, event: ScheduledEvent) -> bool:
+    client = db.get(models.Client, event.entity_id)
+    # A completed client's renewal is reminded through its customer record
+    if not client or client.is_completed or client.renewal_date != event.event_date:
+        return False
+    _remind(
+        db,
+        title=f"Renewal due: {client.business_name}",
+        description=f"Hosting/maintenance renewal for {client.business_name} is due on {client.renewal_date.isoformat()}.",
+        related_to="client",
+        related_id=client.id,
+        client_id=client.id,
+        event=event,
+        entity_type="client",
+        entity_name=client.business_name,
+        activity_fk={"client_id": client.id},
+    )
+    return True
+
+
+def handle_customer_renewal(db: Session, event: ScheduledEvent) -> bool:
+    customer = db.get(models.Customer, event.entity_id)
+    if not customer or customer.renewal_date != event.event_date:
+        return False
+    # Tasks cannot reference customers, so the reminder is a general task
+    _remind(
+        db,
+        title=f"Renewal due: {customer.business_name}",
+        description=f"Renewal for customer {customer.business_name} is due on {customer.renewal_date.isoformat()}.",
+        related_to="general",
+        related_id=None,
+        client_id=None,
+        event=event,
+        entity_type="customer",
+        entity_name=customer.business_name,
+        activity_fk={"customer_id": customer.id},
+    )
+    return True
+
+
+HANDLERS: dict[str, Callable[[Session, ScheduledEvent], bool]] = {
+    CLIENT_DEADLINE: handle_client_deadline,
+    CLIENT_RENEWAL: handle_client_renewal,
+    CUSTOMER_RENEWAL: handle_customer_renewal,
+}
+
+
+# ---------------------------------------------------------------------------
+# Leader election
+# ---------------------------------------------------------------------------
+
+class LeaderLock:
+    """Postgres advisory lock held on a dedicated connection.
+
+    Other databases have no cross-process lock, so every worker considers
+    itself leader and relies on the claim table for exactly-once firing.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._conn = None
+
+    def acquire(self) -> bool:
+        if self.engine.dialect.name != "postgresql":
+            return True
+        try:
+            if self._conn is not None:
+                self._conn.execute(text("SELECT 1"))
+                return True
+            conn = self.engine.connect()
+            if conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": LEADER_LOCK_KEY}).scalar():
+                conn.commit()
+                self._conn = conn
+                logger.info("Scheduler leadership acquired")
+                return True
+            conn.close()
+        except Exception:
+            logger.exception("Scheduler leader check failed")
+            self.release()
+        return False
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+class Scheduler:
+    def __init__(self):
+        self._heap: list[tuple[datetime, int, ScheduledEvent]] = []
+        self._current: dict[tuple[str, str], ScheduledEvent] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._session_factory: sessionmaker | None = None
+        self._leader: LeaderLock | None = None
+
+    # -- heap maintenance -------------------------------------------------
+
+    def _put(self, kind: str, entity_id: str, event_date: date | None) -> None:
+        """Replace the pending event for (kind, entity_id). Superseded heap entries are skipped lazily."""
+        key = (kind, entity_id)
+        with self._cond:
+            if event_date is None or event_date < date.today():
+                self._current.pop(key, None)
+                return
+            event = ScheduledEvent(kind, entity_id, event_date, reminder_due_at(event_date))
+            if self._current.get(key) == event:
+                return
+            self._push(event)
+
+    def _push(self, event: ScheduledEvent) -> None:
+        """Make event the pending one for its (kind, entity_id). Caller holds the lock."""
+        self._current[(event.kind, event.entity_id)] = event
+        heapq.heappush(self._heap, (event.due_at, next(self._counter), event))
+        if self._heap[0][2] is event:
+            self._cond.notify()
+
+    def _retry(self, event: ScheduledEvent) -> None:
+        """Queue a failed event again in RETRY_SECONDS, unless it was rescheduled meanwhile."""
+        with self._cond:
+            if (event.kind, event.entity_id) not in self._current:
+                self._push(replace(event, due_at=datetime.now() + timedelta(seconds=RETRY_SECONDS)))
+
+    def schedule_client(self, client: models.Client) -> None:
+        """A completed client has nothing left to remind: its customer carries the renewal."""
+        if client.is_completed:
+            self.unschedule("client", client.id)
+            return
+        self._put(CLIENT_DEADLINE, client.id, client.deadline)
+        self._put(CLIENT_RENEWAL, client.id, client.renewal_date)
+
+    def schedule_customer(self, customer: models.Customer) -> None:
+        self._put(CUSTOMER_RENEWAL, customer.id, customer.renewal_date)
+
+    def unschedule(self, entity_type: str, entity_id: str) -> None:
+        for kind in KINDS[entity_type]:
+            self._put(kind, entity_id, None)
+
+    def pending(self) -> list[ScheduledEvent]:
+        with self._cond:
+            return sorted(self._current.values(), key=lambda event: event.due_at)
+
+    def load(self, db: Session) -> int:
+        """Seed the heap with every upcoming deadline and renewal. Called once at startup."""
+        self.reload(db, models.Client.__tablename__)
+        self.reload(db, models.Customer.__tablename__)
+        return len(self._current)
+
+    def reload(self, db: Session, table: str, ids: set[str] | None = None) -> None:
+        """Re-read the given clients or customers (every upcoming one when ids is None) and reschedule them."""
+        today = date.today()
+        if table == models.Client.__tablename__:
+            entity_type, model, schedule = "client", models.Client, self.schedule_client
+            upcoming = and_(
+                models.Client.is_completed.is_(False),
+                or_(models.Client.deadline >= today, models.Client.renewal_date >= today),
+            )
+        elif table == models.Customer.__tablename__:
+            entity_type, model, schedule = "customer", models.Customer, self.schedule_customer
+            upcoming = models.Customer.renewal_date >= today
+        else:
+            return
+        if ids is None:
+            with self._cond:
+                for key in [key for key in self._current if key[0] in KINDS[entity_type]]:
+                    del self._current[key]
+            query = db.query(model).filter(upcoming)
+        else:
+            query = db.query(model).filter(model.id.in_(ids))
+        found = set()
+        for row in query:
+            found.add(row.id)
+            schedule(row)
+        for missing in (ids or set()) - found:
+            self.unschedule(entity_type, missing)
+
+    def on_change(self, message: dict) -> None:
+        """Bus listener: reschedule clients and customers written by other workers.
+
+        This worker's own writes were already scheduled by the crud layer.
+        """
+        if self._session_factory is None or message["o"] == bus.origin:
+            return
+        if message["t"] not in (models.Client.__tablename__, models.Customer.__tablename__):
+            return
+        db = self._session_factory()
+        try:
+            self.reload(db, message["t"], set(message["k"]) if message["k"] is not None else None)
+        finally:
+            db.close()
+
+    def on_gap(self) -> None:
+        """Bus listener: messages may have been missed, reload everything."""
+        if self._session_factory is None:
+            return
+        db = self._session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+    # -- worker -----------------------------------------------------------
+
+    def start(self, session_factory: sessionmaker) -> None:
+        if self._thread is not None:
+            return
+        self._session_factory = session_factory
+        self._leader = LeaderLock(session_factory.kw["bind"])
+        db = session_factory()
+        try:
+            count = self.load(db)
+        finally:
+            db.close()
+        logger.info(f"Scheduler loaded {count} upcoming event(s)")
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="pulse-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        with self._cond:
+            self._cond.notify()
+        self._thread.join(timeout=5)
+        self._thread = None
+        if self._leader:
+            self._leader.release()
+
+    def _next_due(self) -> ScheduledEvent | float:
+        """Pop the next due event, or return how many seconds to sleep. Caller holds the lock."""
+        while self._heap:
+            due_at, _, event = self._heap[0]
+            if self._current.get((event.kind, event.entity_id)) is not event:
+                heapq.heappop(self._heap)
+                continue
+            delay = (due_at - datetime.now()).total_seconds()
+            if delay > 0:
+                return min(delay, MAX_SLEEP_SECONDS)
+            heapq.heappop(self._heap)
+            del self._current[(event.kind, event.entity_id)]
+            return event
+        return MAX_SLEEP_SECONDS
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            if not self._leader.acquire():
+                self._stopping.wait(MAX_SLEEP_SECONDS)
+                continue
+            with self._cond:
+                result = self._next_due()
+                if not isinstance(result, ScheduledEvent):
+                    self._cond.wait(timeout=result)
+                    continue
+            self.fire(result)
+
+    def fire(self, event: ScheduledEvent) -> bool:
+        """Run the handler for an event exactly once across all workers."""
+        db = self._session_factory()
+        try:
+            db.add(models.ScheduledEventClaim(event_key=event.key))
+            db.flush()
+            if not HANDLERS[event.kind](db, event):
+                # Nothing to remind about (any more); keep the key free in case it becomes due again
+                db.rollback()
+                return False
+            db.commit()
+            logger.info(f"Fired {event.key}")
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+        except Exception:
+            db.rollback()
+            logger.exception(f"Scheduler handler failed for {event.key}; retrying in {RETRY_SECONDS:.0f} s")
+            self._retry(event)
+            return False
+        finally:
+            db.close()
+
+
+scheduler = Scheduler()
+bus.on_change(scheduler.on_change, on_gap=scheduler.on_gap)
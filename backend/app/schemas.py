@@ -1,11 +1,19 @@
 from datetime import date, datetime
-from pydantic import BaseModel, EmailStr, field_validator
+import json
+from typing import Any
+from pydantic import BaseModel, EmailStr, computed_field, field_validator
 from .models import ProjectStage, LeadStatus
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    expires_in: int | None = None  # access token lifetime in seconds
+    refresh_token: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class UserCreate(BaseModel):
@@ -105,6 +113,24 @@ class ClientUpdate(BaseModel):
     renewal_date: date | None = None
 
 
+class LeadConvert(BaseModel):
+    """Client fields for POST /leads/{id}/convert; name and contact come from the lead."""
+    business_type: str = "Web Design"
+    onboarding: date | None = None  # defaults to today
+    deadline: date | None = None  # defaults to 30 days after onboarding
+    delivery: str = "In Progress"
+    payment_collected: float = 0
+    # Technical specifications
+    domain_name: str | None = None
+    hosting_provider: str | None = None
+    cms_type: str | None = None
+    project_stage: ProjectStage = ProjectStage.DISCOVERY
+    maintenance_plan: bool = False
+    renewal_date: date | None = None
+    # Onboarding task template; derived from business_type when omitted
+    service_type: str | None = None
+
+
 class ClientOut(ClientBase):
     id: str
 
@@ -147,6 +173,16 @@ class CustomerOut(CustomerBase):
         from_attributes = True
 
 
+class ClientComplete(BaseModel):
+    completed_date: date | None = None  # defaults to today
+
+
+class ClientCompletionOut(BaseModel):
+    client: ClientOut
+    customer: CustomerOut
+    closed_tasks: int
+
+
 class GoalBase(BaseModel):
     title: str = "Revenue Goal"
     target_amount: float
@@ -171,6 +207,15 @@ class GoalUpdate(BaseModel):
 
 class GoalOut(GoalBase):
     id: str
+    current_amount: float = 0
+
+    @computed_field
+    @property
+    def progress(self) -> float:
+        """Fraction of the target reached, capped at 1."""
+        if self.target_amount <= 0:
+            return 0.0
+        return min(1.0, self.current_amount / self.target_amount)
 
     class Config:
         from_attributes = True
@@ -183,13 +228,37 @@ class StatsOut(BaseModel):
     deadlines: int
 
 
+class TimeseriesPoint(BaseModel):
+    bucket_start: date
+    value: float
+
+
+class TimeseriesOut(BaseModel):
+    metric: str
+    bucket: str
+    points: list[TimeseriesPoint]
+
+
 class ActivityBase(BaseModel):
     activity_type: str
     entity_type: str
     entity_id: str
     entity_name: str
     description: str
-    activity_metadata: str = "{}"
+    activity_metadata: dict[str, Any] = {}
+
+    @field_validator("activity_metadata", mode="before")
+    @classmethod
+    def parse_metadata(cls, value):
+        # Older clients (and archived rows) send the metadata as a JSON string
+        if isinstance(value, str):
+            try:
+                value = json.loads(value or "{}")
+            except ValueError as exc:
+                raise ValueError("activity_metadata must be a JSON object") from exc
+        if value is None:
+            return {}
+        return value
 
 
 class ActivityCreate(ActivityBase):
@@ -244,6 +313,16 @@ class TaskOut(TaskBase):
         from_attributes = True
 
 
+class TaskSummaryOut(BaseModel):
+    total: int
+    by_status: dict[str, int]
+    by_priority: dict[str, int]
+    by_status_priority: dict[str, dict[str, int]]
+    overdue: int
+    overdue_by_priority: dict[str, int]
+    due_this_week: int
+
+
 class NoteBase(BaseModel):
     content: str
     related_to: str
@@ -267,3 +346,35 @@ class NoteOut(NoteBase):
 
     class Config:
         from_attributes = True
+
+
+class NoteBatchRequest(BaseModel):
+    related_to: str
+    related_ids: list[str]
+    latest: int | None = None
+
+    @field_validator("related_ids")
+    @classmethod
+    def limit_ids(cls, value: list[str]) -> list[str]:
+        if len(value) > 1000:
+            raise ValueError("At most 1000 related_ids per request")
+        return value
+
+    @field_validator("latest")
+    @classmethod
+    def positive_latest(cls, value: int | None) -> int | None:
+        if value is not None and value < 1:
+            raise ValueError("latest must be at least 1")
+        return value
+
+
+class NoteBatchOut(BaseModel):
+    notes: dict[str, list[NoteOut]]
+    counts: dict[str, int]
+
+
+class ClientDetailOut(BaseModel):
+    client: ClientOut
+    tasks: list[TaskOut]
+    notes: list[NoteOut]
+    activities: list[ActivityOut]
@@ -5,10 +5,62 @@ import os
 
 class Settings(BaseSettings):
     database_url: str = ""
+    # Optional read replicas (comma-separated URLs) used by safe GET routes.
+    # Any second database works as a stand-in, e.g. sqlite:///./replica.db
+    database_read_urls: str = ""
+    # After a write, the same client reads from the primary for this long
+    read_your_writes_seconds: float = 5.0
+    # How long a replica that failed to connect is skipped
+    replica_retry_seconds: float = 30.0
+    # SQLite connection profile (app/db.py), applied on every new connection:
+    # WAL journal, synchronous=NORMAL, enforced foreign keys, temp tables in
+    # memory, plus the sizes below. Set to false to keep SQLite's defaults.
+    sqlite_profile: bool = True
+    sqlite_mmap_size_mb: int = 256
+    sqlite_cache_size_mb: int = 64
+    # How long a writer waits for the lock before "database is locked"
+    sqlite_busy_timeout_ms: int = 5000
     jwt_secret_key: str = "default-change-me-in-production"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    refresh_token_expire_days: int = 30
+    # PBKDF2-SHA256 iterations for new password hashes; pick one for this host
+    # with calibrate_password_hash.py. Existing hashes are upgraded on login.
+    password_hash_iterations: int = 260_000
+    # Verified access tokens cached (by digest, until exp) by decode_access_token
+    jwt_cache_size: int = 4096
     allowed_origins: str = "http://localhost:3000,http://localhost:3001"
+    # Activity archival: months older than the retention window are moved
+    # out of the hot table into compressed NDJSON files.
+    activity_retention_days: int = 365
+    activity_archive_dir: str = str(Path(__file__).parent.parent / "archive")
+    # Deadline/renewal reminders (app/scheduler.py)
+    scheduler_enabled: bool = True
+    scheduler_lead_days: int = 3
+    # Cross-worker cache invalidation (app/cache.py): auto picks Postgres
+    # LISTEN/NOTIFY, or the shared cache_invalidations table on other databases.
+    # One of auto, postgres, table, off.
+    cache_bus: str = "auto"
+    cache_bus_poll_seconds: float = 0.5
+    user_cache_seconds: float = 60.0
+    stats_cache_seconds: float = 30.0
+    # Live change stream (GET /events): events kept for resuming, events one
+    # stream may fall behind before it gets a reset, heartbeat interval and
+    # the reconnect delay suggested to EventSource clients.
+    events_buffer_size: int = 1000
+    events_connection_buffer: int = 256
+    events_heartbeat_seconds: float = 15.0
+    events_retry_ms: int = 3000
+    # Login throttling (app/ratelimit.py): attempts allowed per window, per
+    # client IP and per username. Backend: memory (per worker) or database
+    # (shared by all workers).
+    login_attempts_per_ip: int = 20
+    login_attempts_per_username: int = 5
+    login_rate_window_seconds: float = 60.0
+    rate_limit_backend: str = "memory"
+    # GET /metrics needs a user access token, or this static bearer token
+    # when set (for Prometheus' bearer_token scrape option)
+    metrics_token: str = ""
 
     model_config = SettingsConfigDict(
         env_file=Path(__file__).parent.parent / ".env",
@@ -20,6 +72,10 @@ class Settings(BaseSettings):
     def allowed_origins_list(self) -> list[str]:
         return [o.strip() for o in self.allowed_origins.split(",") if o.strip()]
 
+    @property
+    def database_read_url_list(self) -> list[str]:
+        return [u.strip() for u in self.database_read_urls.split(",") if u.strip()]
+
 settings = Settings()
 
 # Debug: Log which JWT secret is being used
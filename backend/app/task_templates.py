@@ -182,6 +182,11 @@ TEMPLATES = {
     },
 }
 
+def service_type_for(business_type: str) -> str:
+    """Template key for a client's business type ('Web Design' -> 'web_design'), else 'default'."""
+    key = "_".join(business_type.lower().split())
+    return key if key in TEMPLATES else "default"
+
 def get_onboarding_tasks(service_type: str = "default") -> list:
     """
     Get the task template list for a given service type.
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Activity Archival Job
+Moves whole months of activities older than the retention window out of the
+hot table into compressed NDJSON files under ACTIVITY_ARCHIVE_DIR.
+
+Usage:
+    cd backend
+    python archive_activities.py                    # use ACTIVITY_RETENTION_DAYS
+    python archive_activities.py --retention-days 180
+
+Schedule it (cron, systemd timer, ...) to run daily; it is idempotent.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the backend to the path
+backend_path = Path(__file__).parent
+sys.path.insert(0, str(backend_path))
+
+from app.db import SessionLocal, engine
+from app.archive import archive_activities, archive_dir, ensure_partitions
+from app.settings import settings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Archive old activities to compressed NDJSON files")
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=settings.activity_retention_days,
+        help="Keep this many days of activities in the hot table",
+    )
+    args = parser.parse_args()
+
+    print("🗄️  Starting Activity Archival")
+    print("=" * 70)
+    print(f"Retention window: {args.retention_days} days")
+    print(f"Archive directory: {archive_dir()}")
+
+    created = ensure_partitions(engine)
+    for name in created:
+        print(f"  ➕ Created partition {name}")
+
+    db = SessionLocal()
+    try:
+        moved = archive_activities(db, retention_days=args.retention_days)
+    except Exception as e:
+        db.rollback()
+        print(f"\n❌ Archival failed: {e}")
+        return 1
+    finally:
+        db.close()
+
+    if not moved:
+        print("\n✅ Nothing to archive")
+        return 0
+    for month, count in moved.items():
+        print(f"  📦 {month}: {count} activities archived")
+    print(f"\n✅ Archived {sum(moved.values())} activities from {len(moved)} month(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""
+Rebuild the daily_rollups table from the history stored in the other tables.
+Safe to re-run at any time; the table is replaced in a single transaction.
+
+Usage:
+    cd backend
+    python backfill_rollups.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend to the path
+backend_path = Path(__file__).parent
+sys.path.insert(0, str(backend_path))
+
+from app.db import SessionLocal
+from app import rollups
+
+
+def main() -> int:
+    print("📈 Rebuilding daily rollups")
+    print("=" * 70)
+    db = SessionLocal()
+    try:
+        written = rollups.backfill(db)
+    except Exception as e:
+        db.rollback()
+        print(f"\n❌ Backfill failed: {e}")
+        return 1
+    finally:
+        db.close()
+    for metric, count in written.items():
+        print(f"  • {metric}: {count} day(s)")
+    print("\n✅ Rollups rebuilt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark: deleting a lead / client with many children
+
+For each child count, creates a client and a lead that each own that many
+tasks, notes and activities, then times crud.delete_client and
+crud.delete_lead, counting the SQL statements they issue and checking that
+no child row survives. With the children removed by the database's
+ON DELETE CASCADE the statement count does not depend on the child count,
+and with the foreign key columns indexed neither does the time per child.
+
+Usage:
+    cd backend
+    python benchmarks/bench_cascade.py                          # 0 to 10,000 children, temp SQLite
+    python benchmarks/bench_cascade.py --children 0,1000,50000
+    python benchmarks/bench_cascade.py --database-url postgresql+psycopg://...   # must be an empty database
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--children", default="0,10,100,1000,10000", help="Comma-separated children per kind")
+    parser.add_argument("--background", type=int, default=50_000,
+                        help="Unrelated rows seeded first (datagen), so cascades run against full tables")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["CACHE_BUS"] = "off"
+
+# Add the backend to the path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import event, func, insert, select
+from app import crud, models
+from app.db import Base, SessionLocal, engine
+from benchmarks.datagen import Sizes, generate
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(*_args):
+    global statements
+    statements += 1
+
+
+def seed_parent(db, kind: str, children: int) -> str:
+    """A lead or client with `children` tasks, notes and activities; returns its id."""
+    today = date.today()
+    parent_id = f"bench-{kind}-{children}"
+    if kind == "client":
+        db.add(models.Client(
+            id=parent_id, business_name="Bench", business_type="SEO", contact="bench@example.com",
+            onboarding=today, deadline=today + timedelta(days=30), delivery="In Progress",
+        ))
+    else:
+        db.add(models.Lead(id=parent_id, business_name="Bench", contact="bench@example.com"))
+    db.flush()
+    fk = f"{kind}_id"
+    now = datetime.utcnow()
+    if children:
+        db.execute(insert(models.Task), [
+            {"id": f"{parent_id}-task-{i}", "title": f"Task {i}", "related_to": kind, "related_id": parent_id,
+             fk: parent_id, "created_at": now}
+            for i in range(children)
+        ])
+        db.execute(insert(models.Note), [
+            {"id": f"{parent_id}-note-{i}", "content": f"Note {i}", "related_to": kind, "related_id": parent_id,
+             fk: parent_id, "created_at": now, "updated_at": now}
+            for i in range(children)
+        ])
+        db.execute(insert(models.Activity), [
+            {"id": f"{parent_id}-activity-{i}", "activity_type": "note_added", "entity_type": kind,
+             "entity_id": parent_id, "entity_name": "Bench", "description": "Bench", "activity_metadata": {},
+             fk: parent_id, "created_at": now}
+            for i in range(children)
+        ])
+    db.commit()
+    return parent_id
+
+
+def remaining(db, kind: str, parent_id: str) -> int:
+    fk = f"{kind}_id"
+    return sum(
+        db.execute(select(func.count()).select_from(model).where(getattr(model, fk) == parent_id)).scalar()
+        for model in (models.Task, models.Note, models.Activity)
+    )
+
+
+def main() -> int:
+    global statements
+    Base.metadata.create_all(bind=engine)
+    if args.background:
+        db = SessionLocal()
+        try:
+            generate(db, Sizes.for_total(args.background))
+        finally:
+            db.close()
+    counts = [int(count) for count in args.children.split(",")]
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}, {args.background:,} background rows\n")
+    print(f"{'children':>10}{'client ms':>12}{'stmts':>8}{'lead ms':>10}{'stmts':>8}{'left':>7}")
+    print("-" * 55)
+    failures = 0
+    for children in counts:
+        row = []
+        left = 0
+        for kind, model, delete in (("client", models.Client, crud.delete_client), ("lead", models.Lead, crud.delete_lead)):
+            db = SessionLocal()
+            try:
+                parent_id = seed_parent(db, kind, children)
+                parent = db.get(model, parent_id)
+                statements = 0
+                start = time.perf_counter()
+                delete(db, parent)
+                row += [(time.perf_counter() - start) * 1000, statements]
+                left += remaining(db, kind, parent_id)
+            finally:
+                db.close()
+        failures += left > 0
+        print(f"{children:>10,}{row[0]:>12.1f}{row[1]:>8}{row[2]:>10.1f}{row[3]:>8}{left:>7}")
+    if failures:
+        print("\n❌ Child rows survived their parent's delete")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
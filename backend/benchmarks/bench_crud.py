@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+"""
+Benchmark: app.crud functions, one at a time, at several data sizes
+
+For every database and size, seeds a fresh schema with benchmarks.datagen
+(realistic proportions, --sizes is the total row count across all tables) and
+calls each crud function directly on its own session:
+- reads: list_*, query_tasks filters and pages, task_summary, list_notes,
+  batch_get_notes, list_activities (with and without metadata filters),
+  get_client_detail, build_stats, single-row lookups
+- writes: create_*, update_* and delete_* for every entity (rows to update or
+  delete are prepared outside the timed region)
+
+Per function it reports the median and best wall time over --repeat runs, the
+number of SQL statements, and, from one extra run under tracemalloc, the peak
+traced memory and the allocated blocks still alive when the call returns
+(i.e. what the result holds on to).
+
+Runs on in-memory SQLite, plus Postgres when --postgres-url (or
+BENCH_POSTGRES_URL) is set; all tables there are dropped and recreated, so use
+a dedicated database. Results go to --output as JSON; --baseline compares
+median times with an earlier run (exit code 1 on regressions beyond
+--max-regression).
+
+Usage:
+    cd backend
+    python benchmarks/bench_crud.py                               # 1k and 100k rows on SQLite
+    python benchmarks/bench_crud.py --sizes 1k,100k,1M            # 1M takes a few minutes to seed
+    python benchmarks/bench_crud.py --only list_ --only build_stats
+    python benchmarks/bench_crud.py --postgres-url postgresql+psycopg://localhost/pulse_bench
+    python benchmarks/bench_crud.py --baseline benchmarks/results/crud.json --output /tmp/crud.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+
+def parse_size(value: str) -> int:
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    suffix = value[-1].lower()
+    return int(float(value[:-1]) * multipliers[suffix]) if suffix in multipliers else int(value)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,100k", help="Comma-separated total row counts (k/M suffixes)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per function")
+    parser.add_argument("--only", action="append", help="Repeatable; run functions whose name contains this")
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"), help="Also run on this database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=str(Path(__file__).parent / "results" / "crud.json"))
+    parser.add_argument("--baseline", default=None, help="Compare against an earlier --output file")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed median slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore changes smaller than this (timer noise)")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["SCHEDULER_ENABLED"] = "false"
+# One process, nothing to invalidate across workers
+os.environ["CACHE_BUS"] = "off"
+
+# Add the backend to the path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from app import crud, models, schemas
+from app.db import Base, SessionLocal, use_sqlite_profile
+from benchmarks.datagen import Sizes, generate
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[Any, Any], Any]
+    # Prepares the call's argument outside the timed region, given (db, run number)
+    setup: Callable[[Any, int], Any] | None = None
+
+
+def _hot(kind: str) -> str:
+    # datagen skews children towards low ids, so index 0 is the busiest parent
+    return f"{kind}-0"
+
+
+def cases(sizes: Sizes) -> list[Case]:
+    today = date.today()
+    pick = lambda kind, count: (lambda db, n: db.get(getattr(models, kind), f"{kind.lower()}-{n % count}"))
+
+    def fresh(model, **values):
+        def setup(db, n):
+            row = model(id=f"bench-{model.__tablename__}-{n}-{time.perf_counter_ns()}", **values)
+            db.add(row)
+            db.commit()
+            return row
+        return setup
+
+    client_values = dict(
+        business_name="Bench", business_type="SEO", contact="bench@example.com", onboarding=today,
+        deadline=today + timedelta(days=30), delivery="In Progress", payment_collected=500.0,
+    )
+    lead_payload = schemas.LeadCreate(business_name="Bench Lead", contact="bench@example.com")
+    client_payload = schemas.ClientCreate(**client_values)
+    customer_payload = schemas.CustomerCreate(business_name="Bench", completed_date=today, total_paid=1000.0)
+    goal_payload = schemas.GoalCreate(target_amount=20000, date_started=today.replace(day=1), deadline=today + timedelta(days=30))
+    task_payload = schemas.TaskCreate(title="Bench task", related_to="client", related_id=_hot("client"))
+    note_payload = schemas.NoteCreate(content="Bench note", related_to="client", related_id=_hot("client"))
+    activity_payload = schemas.ActivityCreate(
+        activity_type="task_completed", entity_type="task", entity_id=_hot("task"),
+        entity_name="Bench", description="Bench activity", activity_metadata={"amount": 1500},
+    )
+    note_ids = [f"client-{i}" for i in range(min(50, sizes.clients))]
+
+    return [
+        # Reads
+        Case("list_leads", lambda db, _: crud.list_leads(db)),
+        Case("list_clients", lambda db, _: crud.list_clients(db)),
+        Case("list_customers", lambda db, _: crud.list_customers(db)),
+        Case("list_goals", lambda db, _: crud.list_goals(db)),
+        Case("list_tasks", lambda db, _: crud.list_tasks(db)),
+        Case("list_tasks[open,limit=50]", lambda db, _: crud.list_tasks(db, status=["pending", "in_progress"], limit=50)),
+        Case("list_tasks[overdue]", lambda db, _: crud.list_tasks(db, overdue=True)),
+        Case("list_tasks[client]", lambda db, _: crud.list_tasks(db, related_to="client", related_id=_hot("client"))),
+        Case("task_summary", lambda db, _: crud.task_summary(db)),
+        Case("list_notes[client]", lambda db, _: crud.list_notes(db, "client")),
+        Case("list_notes[client,id]", lambda db, _: crud.list_notes(db, "client", _hot("client"))),
+        Case("batch_get_notes[50,latest=3]", lambda db, _: crud.batch_get_notes(db, "client", note_ids, latest=3)),
+        Case("list_activities[50]", lambda db, _: crud.list_activities(db, limit=50)),
+        Case("list_activities[meta]", lambda db, _: crud.list_activities(db, metadata_filters=[("amount", "gt", "1000")])),
+        Case("get_client_detail", lambda db, _: crud.get_client_detail(db, _hot("client"))),
+        Case("get_client_by_id", lambda db, client_id: crud.get_client_by_id(db, client_id),
+             lambda db, n: f"client-{n % sizes.clients}"),
+        Case("get_task_by_id", lambda db, task_id: crud.get_task_by_id(db, task_id), lambda db, n: f"task-{n % sizes.tasks}"),
+        Case("build_stats", lambda db, _: crud.build_stats(db)),
+        # Writes
+        Case("create_lead", lambda db, _: crud.create_lead(db, lead_payload)),
+        Case("create_client", lambda db, _: crud.create_client(db, client_payload)),
+        Case("create_customer", lambda db, _: crud.create_customer(db, customer_payload)),
+        Case("create_goal", lambda db, _: crud.create_goal(db, goal_payload)),
+        Case("create_task", lambda db, _: crud.create_task(db, task_payload)),
+        Case("create_note", lambda db, _: crud.create_note(db, note_payload)),
+        Case("create_activity", lambda db, _: crud.create_activity(db, activity_payload)),
+        Case("update_lead", lambda db, lead: crud.update_lead(db, lead, schemas.LeadUpdate(comment=f"Updated {time.time()}")),
+             pick("Lead", sizes.leads)),
+        Case("update_client", lambda db, client: crud.update_client(
+            db, client, schemas.ClientUpdate(payment_collected=(client.payment_collected or 0) + 10)),
+             pick("Client", sizes.clients)),
+        Case("update_customer", lambda db, customer: crud.update_customer(
+            db, customer, schemas.CustomerUpdate(total_paid=(customer.total_paid or 0) + 10)),
+             pick("Customer", sizes.customers)),
+        Case("update_goal", lambda db, goal: crud.update_goal(db, goal, schemas.GoalUpdate(target_amount=goal.target_amount + 1)),
+             pick("Goal", sizes.goals)),
+        Case("update_task", lambda db, task: crud.update_task(
+            db, task, schemas.TaskUpdate(status="completed" if task.status != "completed" else "pending")),
+             pick("Task", sizes.tasks)),
+        Case("update_note", lambda db, note: crud.update_note(db, note, schemas.NoteUpdate(is_pinned=not note.is_pinned)),
+             pick("Note", sizes.notes)),
+        Case("delete_lead", lambda db, lead: crud.delete_lead(db, lead),
+             fresh(models.Lead, business_name="Bench", contact="bench@example.com")),
+        Case("delete_client", lambda db, client: crud.delete_client(db, client), fresh(models.Client, **client_values)),
+        Case("delete_customer", lambda db, customer: crud.delete_customer(db, customer),
+             fresh(models.Customer, business_name="Bench", completed_date=today, total_paid=100.0)),
+        Case("delete_goal", lambda db, goal: crud.delete_goal(db, goal),
+             fresh(models.Goal, target_amount=1000.0, date_started=today, deadline=today)),
+        Case("delete_task", lambda db, task: crud.delete_task(db, task), fresh(models.Task, title="Bench", related_to="general")),
+        Case("delete_note", lambda db, note: crud.delete_note(db, note),
+             fresh(models.Note, content="Bench", related_to="client", related_id=_hot("client"), client_id=_hot("client"))),
+        Case("delete_activity", lambda db, activity: crud.delete_activity(db, activity),
+             fresh(models.Activity, activity_type="bench", entity_type="task", entity_id=_hot("task"),
+                   entity_name="Bench", description="Bench")),
+    ]
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *_args) -> None:
+        self.count += 1
+
+
+def measure(case: Case, statements: StatementCounter) -> dict:
+    samples = []
+    counts = []
+    for n in range(args.repeat):
+        db = SessionLocal()
+        try:
+            arg = case.setup(db, n) if case.setup else None
+            statements.count = 0
+            start = time.perf_counter()
+            case.run(db, arg)
+            samples.append(time.perf_counter() - start)
+            counts.append(statements.count)
+        finally:
+            db.close()
+
+    # One more run under tracemalloc; tracing slows the call down, so it is not timed
+    db = SessionLocal()
+    try:
+        arg = case.setup(db, args.repeat) if case.setup else None
+        tracemalloc.start()
+        result = case.run(db, arg)
+        _, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        tracemalloc.stop()
+        del result
+    finally:
+        db.close()
+
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "statements": max(counts),
+        "peak_kib": round(peak / 1024, 1),
+        "live_blocks": blocks,
+    }
+
+
+def make_engine(url: str):
+    if url == "sqlite://":
+        # In-memory: every session must share the one connection holding the data
+        new_engine = create_engine(url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        new_engine = create_engine(url)
+    # As in production; deletes rely on the enforced ON DELETE CASCADE foreign keys
+    use_sqlite_profile(new_engine)
+    return new_engine
+
+
+def run_database(label: str, url: str, sizes_list: list[int]) -> dict:
+    engine = make_engine(url)
+    SessionLocal.configure(bind=engine)
+    statements = StatementCounter(engine)
+    results = {}
+    for total in sizes_list:
+        sizes = Sizes.for_total(total)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        print(f"\n🌱 {label}: seeding {sizes.total():,} rows ({sizes})")
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            generate(db, sizes, seed=args.seed)
+        finally:
+            db.close()
+        print(f"   seeded in {time.perf_counter() - started:.1f} s")
+
+        print(f"{'function':<32}{'median ms':>12}{'best ms':>10}{'stmts':>7}{'peak KiB':>11}{'live blocks':>13}")
+        print("-" * 85)
+        size_results = {}
+        for case in cases(sizes):
+            if args.only and not any(part in case.name for part in args.only):
+                continue
+            stats = measure(case, statements)
+            size_results[case.name] = stats
+            print(f"{case.name:<32}{stats['median_ms']:>12.2f}{stats['min_ms']:>10.2f}{stats['statements']:>7}"
+                  f"{stats['peak_kib']:>11,.1f}{stats['live_blocks']:>13,}")
+        results[str(total)] = {"sizes": sizes.__dict__, "functions": size_results}
+    engine.dispose()
+    return results
+
+
+def compare(results: dict, baseline: dict) -> int:
+    """Print functions whose median moved beyond --max-regression; returns the number of regressions."""
+    regressions = 0
+    print(f"\n📊 Against baseline from {baseline['meta'].get('timestamp')}")
+    for database, by_size in results["databases"].items():
+        for size, data in by_size.items():
+            before = baseline["databases"].get(database, {}).get(size, {}).get("functions", {})
+            for name, stats in data["functions"].items():
+                old = before.get(name)
+                if not old or not old["median_ms"]:
+                    continue
+                change = (stats["median_ms"] - old["median_ms"]) / old["median_ms"]
+                if abs(change) > args.max_regression and abs(stats["median_ms"] - old["median_ms"]) >= args.min_delta_ms:
+                    regressed = change > 0
+                    regressions += regressed
+                    print(f"{'❌' if regressed else '✅'} {database} {int(size):>9,} {name:<32}"
+                          f"{old['median_ms']:>10.2f} → {stats['median_ms']:>10.2f} ms ({change:+.0%})"
+                          f"  stmts {old['statements']} → {stats['statements']}")
+    return regressions
+
+
+def main() -> int:
+    sizes_list = [parse_size(size) for size in args.sizes.split(",")]
+    databases = {"sqlite": "sqlite://"}
+    if args.postgres_url:
+        databases["postgresql"] = args.postgres_url
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "databases": {label: run_database(label, url, sizes_list) for label, url in databases.items()},
+    }
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"\n💾 Wrote {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()))
+        if regressions:
+            print(f"\n❌ {regressions} function(s) slowed down by more than {args.max_regression:.0%}")
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Benchmark: list response formats, plain JSON vs. columnar JSON vs. MessagePack
+
+For the ClientOut and TaskOut lists, measures payload size (raw and gzipped),
+server-side encode time and client-side decode time of each format produced by
+app.fastpath.
+
+Usage:
+    cd backend
+    python benchmarks/bench_formats.py                  # 20,000 rows, temp SQLite
+    python benchmarks/bench_formats.py --rows 100000 --repeat 5
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Rows per entity")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per format")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["SCHEDULER_ENABLED"] = "false"
+
+# Add the backend to the path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.db import Base, SessionLocal, engine
+from app import crud, fastpath, schemas
+from benchmarks.datagen import seed
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    if fastpath.msgpack is None:
+        print("❌ msgpack is not installed: pip install -r requirements.txt")
+        return 1
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print(f"🌱 Seeding {args.rows} rows per entity")
+        seed(db, args.rows)
+
+        decoders = {
+            fastpath.JSON: json.loads,
+            fastpath.COLUMNAR_JSON: json.loads,
+            fastpath.MSGPACK: lambda body: fastpath.msgpack.unpackb(body, raw=False),
+        }
+        for name, query_fn, schema in [
+            ("clients", crud.query_clients, schemas.ClientOut),
+            ("tasks", crud.query_tasks, schemas.TaskOut),
+        ]:
+            records = fastpath.fetch_rows(query_fn(db), schema)
+            print(f"\n{name} ({len(records):,} rows)")
+            print(f"{'format':<38}{'bytes':>12}{'gzip':>12}{'encode ms':>11}{'decode ms':>11}")
+            print("-" * 84)
+            baseline = None
+            for media_type, decode in decoders.items():
+                body = fastpath.encode(media_type, records, schema)
+                encode_ms = median_ms(lambda: fastpath.encode(media_type, records, schema), args.repeat)
+                decode_ms = median_ms(lambda: decode(body), args.repeat)
+                size = len(body)
+                gz_size = len(gzip.compress(body))
+                baseline = baseline or size
+                print(
+                    f"{media_type:<38}{size:>12,}{gz_size:>12,}{encode_ms:>11.1f}{decode_ms:>11.1f}"
+                    f"   ({size / baseline:.0%} of JSON)"
+                )
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
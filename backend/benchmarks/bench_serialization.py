@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Benchmark: list response serialization, ORM -> Pydantic vs. the fast path
+
+For each entity, times the two ways a list route can build its JSON body:
+- orm:  crud.list_*() ORM instances, validated into list[XOut] and dumped the
+        way FastAPI does for response_model routes, then json-encoded
+- fast: app.fastpath column-only select encoded directly (?fast=true)
+
+Both bodies are checked to decode to the same data.
+
+Usage:
+    cd backend
+    python benchmarks/bench_serialization.py                 # 5,000 rows per entity, temp SQLite
+    python benchmarks/bench_serialization.py --rows 50000 --repeat 5
+    python benchmarks/bench_serialization.py --database-url postgresql+psycopg://...   # must be an empty database
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="Rows per entity")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["SCHEDULER_ENABLED"] = "false"
+
+# Add the backend to the path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from pydantic import TypeAdapter
+from app.db import Base, SessionLocal, engine
+from app import crud, fastpath, schemas
+from benchmarks.datagen import seed
+
+
+def entities(rows: int):
+    """(name, ORM list call, fast-path query factory, response schema)."""
+    return [
+        ("leads", crud.list_leads, crud.query_leads, schemas.LeadOut),
+        ("clients", crud.list_clients, crud.query_clients, schemas.ClientOut),
+        ("customers", crud.list_customers, crud.query_customers, schemas.CustomerOut),
+        ("goals", crud.list_goals, crud.query_goals, schemas.GoalOut),
+        ("tasks", crud.list_tasks, crud.query_tasks, schemas.TaskOut),
+        ("notes", lambda db: crud.list_notes(db, "client"), lambda db: crud.query_notes(db, "client"), schemas.NoteOut),
+        ("activities", lambda db: crud.list_activities(db, limit=rows),
+         lambda db: crud.query_activities(db, limit=rows), schemas.ActivityOut),
+    ]
+
+
+def orm_path(db, list_fn, schema) -> bytes:
+    adapter = TypeAdapter(list[schema])
+    validated = adapter.validate_python(list_fn(db), from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(db, query_fn, schema) -> bytes:
+    return fastpath.encode_json(fastpath.fetch_rows(query_fn(db), schema))
+
+
+def timed(fn, repeat: int) -> tuple[float, bytes]:
+    samples = []
+    body = b""
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            body = fn(db)
+            samples.append(time.perf_counter() - start)
+        finally:
+            db.close()
+    return statistics.median(samples) * 1000, body
+
+
+def main() -> int:
+    Base.metadata.create_all(bind=engine)
+    print(f"🌱 Seeding {args.rows} rows per entity into {engine.url.render_as_string(hide_password=True)}")
+    db = SessionLocal()
+    try:
+        seed(db, args.rows)
+    finally:
+        db.close()
+
+    encoder = "orjson" if fastpath.orjson is not None else "TypeAdapter"
+    print(f"\n{'entity':<12}{'orm ms':>10}{'fast ms':>10}{'speedup':>10}{'bytes':>12}   (fast path encoder: {encoder})")
+    print("-" * 70)
+    for name, list_fn, query_fn, schema in entities(args.rows):
+        orm_ms, orm_body = timed(lambda db: orm_path(db, list_fn, schema), args.repeat)
+        fast_ms, fast_body = timed(lambda db: fast_path(db, query_fn, schema), args.repeat)
+        if json.loads(orm_body) != json.loads(fast_body):
+            print(f"❌ {name}: fast path output differs from the ORM path")
+            return 1
+        print(f"{name:<12}{orm_ms:>10.1f}{fast_ms:>10.1f}{orm_ms / fast_ms:>9.1f}x{len(fast_body):>12,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
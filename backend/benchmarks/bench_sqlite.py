@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Benchmark: SQLite write throughput with concurrent readers, default vs. profile
+
+Seeds a temporary SQLite file with benchmarks.datagen, then for each
+configuration runs --writers threads that create and update tasks (one
+commit each, through app.crud) while --readers threads load the task board
+(a page of open tasks plus task_summary), for --duration seconds:
+- default: SQLite's own settings (rollback journal, synchronous=FULL), as
+           app/db.py connected before the SQLite profile
+- profile: app.db.sqlite_pragmas() on every connection (WAL,
+           synchronous=NORMAL, mmap, cache_size, busy_timeout, ...)
+
+Reports writes/s, reads/s, write latency percentiles and "database is
+locked" failures. Each configuration gets its own copy of the seeded file.
+
+Usage:
+    cd backend
+    python benchmarks/bench_sqlite.py                        # 2 writers, 4 readers, 10 s
+    python benchmarks/bench_sqlite.py --writers 4 --readers 8 --rows 200000
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="Total seeded rows (see datagen.Sizes.for_total)")
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per configuration")
+    return parser.parse_args()
+
+
+args = parse_args()
+workdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/seed.db"
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["CACHE_BUS"] = "off"
+os.environ["SQLITE_PROFILE"] = "false"
+
+# Add the backend to the path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app import crud, schemas
+from app.db import Base, SessionLocal, engine as seed_engine, use_sqlite_profile
+from benchmarks.datagen import Sizes, generate
+
+
+def run(name: str, path: Path, profile: bool, sizes: Sizes) -> dict:
+    engine = create_engine(f"sqlite:///{path}", pool_size=args.writers + args.readers)
+    if profile:
+        use_sqlite_profile(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    with engine.connect() as conn:
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+
+    deadline = time.perf_counter() + args.duration
+    write_latencies: list[float] = []
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def writer(number: int) -> None:
+        n = 0
+        while time.perf_counter() < deadline:
+            n += 1
+            db = Session()
+            start = time.perf_counter()
+            try:
+                if n % 2:
+                    crud.create_task(db, schemas.TaskCreate(
+                        title=f"Bench {number}-{n}", related_to="client", related_id=f"client-{n % sizes.clients}",
+                    ))
+                else:
+                    task = crud.get_task_by_id(db, f"task-{(number * 7919 + n) % sizes.tasks}")
+                    crud.update_task(db, task, schemas.TaskUpdate(status="in_progress" if task.status == "pending" else "pending"))
+                elapsed = time.perf_counter() - start
+                with lock:
+                    counts["writes"] += 1
+                    write_latencies.append(elapsed)
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    counts["locked"] += 1
+            finally:
+                db.close()
+
+    def reader() -> None:
+        while time.perf_counter() < deadline:
+            db = Session()
+            try:
+                crud.list_tasks(db, status=["pending", "in_progress"], limit=50)
+                crud.task_summary(db)
+                with lock:
+                    counts["reads"] += 1
+            except OperationalError:
+                with lock:
+                    counts["locked"] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    cuts = statistics.quantiles(write_latencies, n=100, method="inclusive") if len(write_latencies) > 1 else [0.0] * 99
+    return {
+        "name": name,
+        "journal_mode": journal_mode,
+        "writes_per_s": counts["writes"] / elapsed,
+        "reads_per_s": counts["reads"] / elapsed,
+        "write_p50_ms": cuts[49] * 1000,
+        "write_p99_ms": cuts[98] * 1000,
+        "locked": counts["locked"],
+    }
+
+
+def main() -> int:
+    sizes = Sizes.for_total(args.rows)
+    Base.metadata.create_all(bind=seed_engine)
+    print(f"🌱 Seeding {sizes.total():,} rows into {workdir}")
+    db = SessionLocal()
+    try:
+        generate(db, sizes)
+    finally:
+        db.close()
+    seed_engine.dispose()
+
+    print(f"⏱️  {args.writers} writers, {args.readers} readers, {args.duration:.0f} s per configuration\n")
+    print(f"{'config':<10}{'journal':>9}{'writes/s':>11}{'reads/s':>10}{'write p50':>11}{'write p99':>11}{'locked':>8}")
+    print("-" * 70)
+    results = []
+    for name, profile in (("default", False), ("profile", True)):
+        path = Path(workdir) / f"{name}.db"
+        shutil.copy(Path(workdir) / "seed.db", path)
+        result = run(name, path, profile, sizes)
+        results.append(result)
+        print(f"{name:<10}{result['journal_mode']:>9}{result['writes_per_s']:>11.1f}{result['reads_per_s']:>10.1f}"
+              f"{result['write_p50_ms']:>9.1f}ms{result['write_p99_ms']:>9.1f}ms{result['locked']:>8}")
+
+    before, after = results
+    if before["writes_per_s"]:
+        print(f"\nWrites: {after['writes_per_s'] / before['writes_per_s']:.1f}x, "
+              f"reads: {after['reads_per_s'] / max(before['reads_per_s'], 1e-9):.1f}x with the profile")
+    shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
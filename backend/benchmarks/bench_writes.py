@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Benchmark: API write endpoints, latency and SQL statements per request
+
+Seeds a temporary SQLite file with benchmarks.datagen, then sends --requests
+requests to every POST / PATCH endpoint in-process (Starlette's TestClient,
+no network) and reports, per endpoint, the median and p95 latency and the
+SQL statements the request issued (counted with a before_cursor_execute
+listener; the driver's own BEGIN/COMMIT are not among them). Unlike
+bench_crud this covers the whole request, including the response
+serialization that reads the written row, and the cache bus's
+cache_invalidations insert.
+
+Results go to --output as JSON; --baseline prints the change against an
+earlier run.
+
+Usage:
+    cd backend
+    python benchmarks/bench_writes.py                       # 200 requests per endpoint
+    python benchmarks/bench_writes.py --output /tmp/after.json --baseline /tmp/before.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--rows", type=int, default=20_000, help="Total seeded rows (see datagen.Sizes.for_total)")
+    parser.add_argument("--output", default=str(Path(__file__).parent / "results" / "writes.json"))
+    parser.add_argument("--baseline", default=None, help="Compare against this earlier --output file")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/writes.db"
+os.environ["SCHEDULER_ENABLED"] = "false"
+
+# Add the backend to the path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.db import Base, SessionLocal, engine
+from app.main import app
+from benchmarks.datagen import Sizes, generate
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(*_args):
+    global statements
+    statements += 1
+
+
+def endpoints(sizes: Sizes):
+    """(name, method, url(n), json body(n)) for every write endpoint."""
+    client = {"business_name": "Bench", "business_type": "SEO", "contact": "bench@example.com",
+              "onboarding": "2026-01-05", "deadline": "2026-03-01", "delivery": "In Progress", "payment_collected": 100}
+    customer = {"business_name": "Bench", "completed_date": "2026-01-05", "total_paid": 100}
+    goal = {"title": "Bench", "target_amount": 1_000_000, "date_started": "2026-01-01", "deadline": "2026-12-31"}
+    return [
+        ("POST /leads", "POST", lambda n: "/leads", lambda n: {"business_name": f"Bench {n}", "contact": "bench@example.com"}),
+        ("PATCH /leads/{id}", "PATCH", lambda n: f"/leads/lead-{n % sizes.leads}", lambda n: {"comment": f"Bench {n}"}),
+        ("POST /clients", "POST", lambda n: "/clients", lambda n: client),
+        ("PATCH /clients/{id}", "PATCH", lambda n: f"/clients/client-{n % sizes.clients}", lambda n: {"delivery": f"Review {n}"}),
+        ("POST /customers", "POST", lambda n: "/customers", lambda n: customer),
+        ("PATCH /customers/{id}", "PATCH", lambda n: f"/customers/customer-{n % sizes.customers}", lambda n: {"cms_type": f"CMS {n}"}),
+        ("POST /goals", "POST", lambda n: "/goals", lambda n: goal),
+        ("PATCH /goals/{id}", "PATCH", lambda n: f"/goals/goal-{n % sizes.goals}", lambda n: {"title": f"Bench {n}"}),
+        ("POST /tasks", "POST", lambda n: "/tasks",
+         lambda n: {"title": f"Bench {n}", "related_to": "client", "related_id": f"client-{n % sizes.clients}"}),
+        ("PATCH /tasks/{id}", "PATCH", lambda n: f"/tasks/task-{n % sizes.tasks}", lambda n: {"title": f"Bench {n}"}),
+        ("POST /notes", "POST", lambda n: "/notes",
+         lambda n: {"content": f"Bench {n}", "related_to": "client", "related_id": f"client-{n % sizes.clients}"}),
+        ("PATCH /notes/{id}", "PATCH", lambda n: f"/notes/note-{n % sizes.notes}", lambda n: {"content": f"Bench {n}"}),
+        ("POST /activities", "POST", lambda n: "/activities",
+         lambda n: {"activity_type": "note_added", "entity_type": "client", "entity_id": f"client-{n % sizes.clients}",
+                    "entity_name": "Bench", "description": "Bench"}),
+    ]
+
+
+def main() -> int:
+    global statements
+    sizes = Sizes.for_total(args.rows)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        generate(db, sizes)
+    finally:
+        db.close()
+
+    results = {}
+    with TestClient(app) as http:
+        http.post("/auth/register", json={"email": "bench@example.com", "password": "bench-password"})
+        token = http.post("/auth/login", data={"username": "bench@example.com", "password": "bench-password"}).json()
+        http.headers["Authorization"] = f"Bearer {token['access_token']}"
+        print(f"{sizes.total():,} seeded rows, {args.requests} requests per endpoint\n")
+        print(f"{'endpoint':<24}{'median':>10}{'p95':>10}{'stmts':>7}")
+        print("-" * 51)
+        for name, method, url, body in endpoints(sizes):
+            latencies, counts = [], []
+            for n in range(args.requests):
+                statements = 0
+                start = time.perf_counter()
+                response = http.request(method, url(n), json=body(n))
+                latencies.append(time.perf_counter() - start)
+                counts.append(statements)
+                if response.status_code >= 400:
+                    print(f"❌ {name}: {response.status_code} {response.text}")
+                    return 1
+            cuts = statistics.quantiles(latencies, n=20, method="inclusive")
+            results[name] = {
+                "median_ms": statistics.median(latencies) * 1000,
+                "p95_ms": cuts[18] * 1000,
+                "statements": statistics.median(counts),
+            }
+            result = results[name]
+            print(f"{name:<24}{result['median_ms']:>8.2f}ms{result['p95_ms']:>8.2f}ms{result['statements']:>7.0f}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"rows": sizes.total(), "requests": args.requests, "results": results}, indent=2))
+    print(f"\n💾 Results written to {output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        print(f"\n{'endpoint':<24}{'median':>18}{'stmts':>10}")
+        print("-" * 52)
+        for name, result in results.items():
+            before = baseline.get(name)
+            if not before:
+                continue
+            change = (result["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+            print(f"{name:<24}{before['median_ms']:>6.2f} → {result['median_ms']:>5.2f}ms {change:>+4.0f}%"
+                  f"{before['statements']:>4.0f} → {result['statements']:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
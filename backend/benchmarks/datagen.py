@@ -0,0 +1,268 @@
+"""
+Synthetic data for the benchmarks
+
+generate() fills the database with deterministic (seeded) rows whose shape
+resembles a real agency CRM:
+- every foreign key points at a row that exists (tasks/notes/activities
+  reference generated leads, clients, customers, goals and tasks);
+- children are spread unevenly, a few busy clients/leads own most tasks and
+  notes (a squared-uniform pick skews towards low indices);
+- dates cluster in the recent past (exponential ages), statuses, priorities
+  and project stages follow fixed weights, amounts are log-normal.
+
+Sizes.realistic(n) scales all tables from a client count with typical
+proportions, Sizes.for_total(n) picks that count from a total row budget;
+Sizes.uniform(n) gives every table n rows (used by the serialization
+benchmarks via seed()).
+
+Ids are "<entity>-<n>", so scenarios can address rows without querying.
+Import only after DATABASE_URL has been pointed at the benchmark database.
+"""
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator
+from sqlalchemy import insert
+from app import models
+
+BATCH_SIZE = 5000
+
+PROJECT_STAGES = list(models.ProjectStage)
+STAGE_WEIGHTS = [15, 15, 40, 15, 15]
+TASK_STATUSES = ["pending", "in_progress", "completed", "cancelled"]
+TASK_STATUS_WEIGHTS = [35, 15, 45, 5]
+TASK_PRIORITIES = ["low", "medium", "high", "urgent"]
+TASK_PRIORITY_WEIGHTS = [20, 45, 25, 10]
+BUSINESS_TYPES = ["Web Design", "E-commerce", "SEO", "Branding", "Maintenance", "Web App"]
+CMS_TYPES = ["WordPress", "Next.js", "Shopify", "Webflow", "Headless", None]
+HOSTING = ["Vercel", "Netlify", "AWS", "SiteGround", "DigitalOcean", None]
+
+
+@dataclass(frozen=True)
+class Sizes:
+    leads: int
+    clients: int
+    customers: int
+    goals: int
+    tasks: int
+    notes: int
+    activities: int
+
+    @classmethod
+    def uniform(cls, rows: int) -> "Sizes":
+        return cls(rows, rows, rows, rows, rows, rows, rows)
+
+    @classmethod
+    def realistic(cls, clients: int) -> "Sizes":
+        """Typical proportions: 3 leads, 8 tasks, 5 notes and 20 activities per client."""
+        return cls(
+            leads=clients * 3,
+            clients=clients,
+            customers=clients * 2 // 3,
+            goals=max(1, min(36, clients // 25)),
+            tasks=clients * 8,
+            notes=clients * 5,
+            activities=clients * 20,
+        )
+
+    @classmethod
+    def for_total(cls, rows: int) -> "Sizes":
+        """Realistic proportions scaled so all tables together hold about `rows` rows."""
+        per_client = cls.realistic(1000).total() / 1000
+        return cls.realistic(max(1, round(rows / per_client)))
+
+    def total(self) -> int:
+        return sum(asdict(self).values())
+
+
+def _batches(rows: Iterable[dict]) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(db, model, rows: Iterable[dict]) -> None:
+    for batch in _batches(rows):
+        db.execute(insert(model), batch)
+
+
+def _skewed(rng: random.Random, count: int) -> int:
+    """Index in [0, count) where low indices are picked far more often."""
+    return min(count - 1, int(count * rng.random() ** 2))
+
+
+def _age_days(rng: random.Random, mean_days: float, max_days: int) -> float:
+    return min(max_days, rng.expovariate(1 / mean_days))
+
+
+def generate(db, sizes: Sizes, seed: int = 42) -> Sizes:
+    """Insert a full synthetic dataset and commit. Expects empty tables."""
+    rng = random.Random(seed)
+    today = date.today()
+    now = datetime.utcnow()
+
+    def leads():
+        for i in range(sizes.leads):
+            yield {
+                "id": f"lead-{i}",
+                "business_name": f"Lead {i}",
+                "contact": f"lead{i}@example.com",
+                "comment": rng.choice(["", "", "Referral", "Asked for a quote", "Follow up next month"]),
+                "status": models.LeadStatus.SAVED if rng.random() < 0.2 else models.LeadStatus.NEW,
+                "created_at": now - timedelta(days=_age_days(rng, 45, 365)),
+            }
+
+    def clients():
+        for i in range(sizes.clients):
+            onboarding = today - timedelta(days=int(_age_days(rng, 120, 730)))
+            maintenance = rng.random() < 0.35
+            yield {
+                "id": f"client-{i}",
+                "business_name": f"Client {i}",
+                "business_type": rng.choice(BUSINESS_TYPES),
+                "contact": f"client{i}@example.com",
+                "onboarding": onboarding,
+                "deadline": onboarding + timedelta(days=rng.randint(30, 120)),
+                "delivery": rng.choice(["In Progress", "Review", "Delivered"]),
+                "payment_collected": round(rng.lognormvariate(7.5, 0.8), 2),
+                "is_completed": rng.random() < 0.15,
+                "domain_name": f"client{i}.example.com",
+                "hosting_provider": rng.choice(HOSTING),
+                "cms_type": rng.choice(CMS_TYPES),
+                "project_stage": rng.choices(PROJECT_STAGES, STAGE_WEIGHTS)[0],
+                "maintenance_plan": maintenance,
+                "renewal_date": today + timedelta(days=rng.randint(-30, 365)) if maintenance else None,
+            }
+
+    def customers():
+        for i in range(sizes.customers):
+            maintenance = rng.random() < 0.4
+            yield {
+                "id": f"customer-{i}",
+                "business_name": f"Customer {i}",
+                "completed_date": today - timedelta(days=int(_age_days(rng, 200, 730))),
+                "total_paid": round(rng.lognormvariate(8.2, 0.7), 2),
+                "domain_name": f"customer{i}.example.com",
+                "hosting_provider": rng.choice(HOSTING),
+                "cms_type": rng.choice(CMS_TYPES),
+                "maintenance_plan": maintenance,
+                "renewal_date": today + timedelta(days=rng.randint(-30, 365)) if maintenance else None,
+            }
+
+    def goals():
+        # One goal per month, newest first
+        start = today.replace(day=1)
+        for i in range(sizes.goals):
+            end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            target = float(rng.choice([10000, 15000, 20000, 30000]))
+            achieved = i > 0 and rng.random() < 0.6
+            yield {
+                "id": f"goal-{i}",
+                "title": f"Revenue {start:%B %Y}",
+                "target_amount": target,
+                "date_started": start,
+                "deadline": end,
+                "is_achieved": achieved,
+                "date_achieved": end - timedelta(days=rng.randint(0, 20)) if achieved else None,
+                "current_amount": target * (rng.uniform(1.0, 1.3) if achieved else rng.uniform(0.1, 0.95)),
+            }
+            start = (start - timedelta(days=1)).replace(day=1)
+
+    def parent(kind_weights: list[tuple[str, int, int]]) -> tuple[str, str | None]:
+        """Pick (related_to, related_id) among entity kinds that have rows."""
+        kinds = [(kind, count, weight) for kind, count, weight in kind_weights if count or kind == "general"]
+        kind, count, _ = rng.choices(kinds, [weight for _, _, weight in kinds])[0]
+        if kind == "general":
+            return kind, None
+        return kind, f"{kind}-{_skewed(rng, count)}"
+
+    def tasks():
+        for i in range(sizes.tasks):
+            related_to, related_id = parent([("client", sizes.clients, 60), ("lead", sizes.leads, 25), ("general", 0, 15)])
+            created = now - timedelta(days=_age_days(rng, 60, 365))
+            status = rng.choices(TASK_STATUSES, TASK_STATUS_WEIGHTS)[0]
+            yield {
+                "id": f"task-{i}",
+                "title": f"Task {i}",
+                "description": "Synthetic benchmark task",
+                "related_to": related_to,
+                "related_id": related_id,
+                "client_id": related_id if related_to == "client" else None,
+                "lead_id": related_id if related_to == "lead" else None,
+                "priority": rng.choices(TASK_PRIORITIES, TASK_PRIORITY_WEIGHTS)[0],
+                "status": status,
+                "due_date": created.date() + timedelta(days=rng.randint(1, 45)) if rng.random() < 0.85 else None,
+                "completed_at": created + timedelta(days=rng.uniform(0.5, 30)) if status == "completed" else None,
+                "created_at": created,
+                "is_template": False,
+            }
+
+    def notes():
+        for i in range(sizes.notes):
+            related_to, related_id = parent([("client", sizes.clients, 70), ("lead", sizes.leads, 30)])
+            if related_id is None:
+                return
+            created = now - timedelta(days=_age_days(rng, 60, 365))
+            yield {
+                "id": f"note-{i}",
+                "content": f"Note {i}: " + "call summary " * rng.randint(1, 20),
+                "related_to": related_to,
+                "related_id": related_id,
+                "client_id": related_id if related_to == "client" else None,
+                "lead_id": related_id if related_to == "lead" else None,
+                "is_pinned": rng.random() < 0.08,
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    activity_kinds = [
+        ("task", sizes.tasks, 40, "task_completed", "task_id"),
+        ("lead", sizes.leads, 25, "lead_created", "lead_id"),
+        ("client", sizes.clients, 20, "client_added", "client_id"),
+        ("customer", sizes.customers, 10, "customer_completed", "customer_id"),
+        ("goal", sizes.goals, 5, "goal_achieved", "goal_id"),
+    ]
+    activity_kinds = [kind for kind in activity_kinds if kind[1]]
+
+    def activities():
+        if not activity_kinds:
+            return
+        weights = [kind[2] for kind in activity_kinds]
+        for i in range(sizes.activities):
+            entity_type, count, _, activity_type, fk = rng.choices(activity_kinds, weights)[0]
+            entity_id = f"{entity_type}-{_skewed(rng, count)}"
+            yield {
+                "id": f"activity-{i}",
+                "activity_type": activity_type,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "entity_name": entity_id.replace("-", " ").title(),
+                "description": f"{activity_type.replace('_', ' ').capitalize()}: {entity_id}",
+                "activity_metadata": {
+                    "priority": rng.choices(TASK_PRIORITIES, TASK_PRIORITY_WEIGHTS)[0],
+                    "amount": round(rng.lognormvariate(7, 1), 2),
+                },
+                "created_at": now - timedelta(days=_age_days(rng, 30, 364)),
+                fk: entity_id,
+            }
+
+    _insert(db, models.Lead, leads())
+    _insert(db, models.Client, clients())
+    _insert(db, models.Customer, customers())
+    _insert(db, models.Goal, goals())
+    _insert(db, models.Task, tasks())
+    _insert(db, models.Note, notes())
+    _insert(db, models.Activity, activities())
+    db.commit()
+    return sizes
+
+
+def seed(db, rows: int) -> None:
+    """Every table gets `rows` rows."""
+    generate(db, Sizes.uniform(rows))
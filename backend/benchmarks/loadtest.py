@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+"""
+Load test: concurrent API scenarios against a seeded database
+
+Seeds an empty database with benchmarks.datagen (realistic proportions,
+scaled by --clients), then runs each scenario with --concurrency virtual
+users for --duration seconds (or --iterations runs in total):
+- dashboard_bootstrap: what the SPA loads on start (stats, leads, clients,
+  customers, goals, tasks, recent activities), requested concurrently
+- lead_import: 25 concurrent POST /leads, as the CSV import does, then the lead list
+- task_board: board summary, first two pages of open tasks, one status
+  update, then one client's tasks
+
+Targets:
+- asgi:    the app in-process through httpx's ASGI transport (no network, no
+           uvicorn; isolates application cost)
+- uvicorn: a real uvicorn server (--workers N) on a local port
+
+Reports p50/p95/p99 latency per scenario and per request, and throughput,
+writes them to --output as JSON and, with --baseline, compares p95 and
+throughput against a stored run (exit code 1 on regressions beyond
+--max-regression).
+
+Requires httpx (or httpx2).
+
+Usage:
+    cd backend
+    python benchmarks/loadtest.py                                   # asgi, 200 clients, 10 s per scenario
+    python benchmarks/loadtest.py --target uvicorn --workers 4 --concurrency 32
+    python benchmarks/loadtest.py --scenario task_board --iterations 500
+    python benchmarks/loadtest.py --save-baseline benchmarks/baselines/loadtest.json
+    python benchmarks/loadtest.py --baseline benchmarks/baselines/loadtest.json
+    python benchmarks/loadtest.py --database-url postgresql+psycopg://...   # must be an empty database
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+SCENARIOS = ("dashboard_bootstrap", "lead_import", "task_board")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Repeatable; default: all")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent virtual users per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--iterations", type=int, default=0, help="Scenario runs in total instead of --duration")
+    parser.add_argument("--clients", type=int, default=200, help="Dataset scale (see datagen.Sizes.realistic)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--output", default=str(Path(__file__).parent / "results" / "loadtest.json"))
+    parser.add_argument("--baseline", default=None, help="Compare against this earlier --output/--save-baseline file")
+    parser.add_argument("--save-baseline", default=None, help="Also write the results here")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95/throughput regression (0.2 = 20%%)")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/loadtest.db"
+os.environ["SCHEDULER_ENABLED"] = "false"
+
+# Add the backend to the path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+try:
+    import httpx
+except ImportError:  # starlette's TestClient accepts the same fork
+    import httpx2 as httpx
+
+from app.db import Base, SessionLocal, engine
+from benchmarks.datagen import Sizes, generate, _skewed
+
+BENCH_EMAIL = "loadtest@example.com"
+BENCH_PASSWORD = "loadtest-password"
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, Counter] = defaultdict(Counter)
+
+    async def request(self, client, name: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            error = str(response.status_code) if response.status_code >= 400 else None
+        except httpx.HTTPError as exc:
+            response, error = None, type(exc).__name__
+        self.samples[name].append(time.perf_counter() - start)
+        if error:
+            self.errors[name][error] += 1
+        return response
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        cuts = [ordered[0]] * 99
+    else:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+    return {
+        "p50": round(cuts[49] * 1000, 2),
+        "p95": round(cuts[94] * 1000, 2),
+        "p99": round(cuts[98] * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+async def dashboard_bootstrap(client, rec: Recorder, rng: random.Random, sizes: Sizes) -> None:
+    await asyncio.gather(
+        rec.request(client, "GET /stats", "GET", "/stats"),
+        rec.request(client, "GET /leads", "GET", "/leads"),
+        rec.request(client, "GET /clients", "GET", "/clients"),
+        rec.request(client, "GET /customers", "GET", "/customers"),
+        rec.request(client, "GET /goals", "GET", "/goals"),
+        rec.request(client, "GET /tasks", "GET", "/tasks"),
+        rec.request(client, "GET /activities", "GET", "/activities", params={"limit": 50}),
+    )
+
+
+async def lead_import(client, rec: Recorder, rng: random.Random, sizes: Sizes) -> None:
+    batch = rng.getrandbits(32)
+    await asyncio.gather(*(
+        rec.request(
+            client, "POST /leads", "POST", "/leads",
+            json={"business_name": f"Imported {batch}-{i}", "contact": f"import{batch}-{i}@example.com", "comment": ""},
+        )
+        for i in range(25)
+    ))
+    await rec.request(client, "GET /leads", "GET", "/leads")
+
+
+async def task_board(client, rec: Recorder, rng: random.Random, sizes: Sizes) -> None:
+    await rec.request(client, "GET /tasks/summary", "GET", "/tasks/summary")
+    open_tasks = {"status": ["pending", "in_progress"], "limit": 50}
+    page = await rec.request(client, "GET /tasks?status&limit", "GET", "/tasks", params=open_tasks)
+    cursor = page.headers.get("x-next-cursor") if page is not None else None
+    if cursor:
+        await rec.request(client, "GET /tasks?cursor", "GET", "/tasks", params={**open_tasks, "cursor": cursor})
+    if page is not None and page.status_code == 200 and page.json():
+        task = rng.choice(page.json())
+        status = "in_progress" if task["status"] == "pending" else "pending"
+        await rec.request(client, "PATCH /tasks/{id}", "PATCH", f"/tasks/{task['id']}", json={"status": status})
+    if sizes.clients:
+        client_id = f"client-{_skewed(rng, sizes.clients)}"
+        await rec.request(
+            client, "GET /tasks?related_id", "GET", "/tasks", params={"related_to": "client", "related_id": client_id}
+        )
+
+
+SCENARIO_FUNCTIONS = {
+    "dashboard_bootstrap": dashboard_bootstrap,
+    "lead_import": lead_import,
+    "task_board": task_board,
+}
+
+
+async def run_scenario(client, name: str, sizes: Sizes) -> dict:
+    scenario = SCENARIO_FUNCTIONS[name]
+    rec = Recorder()
+    iteration_times: list[float] = []
+    counter = itertools.count()
+    deadline = time.perf_counter() + args.duration
+
+    async def virtual_user(number: int) -> None:
+        rng = random.Random(args.seed * 1000 + number)
+        while True:
+            run = next(counter)
+            if args.iterations and run >= args.iterations:
+                return
+            if not args.iterations and time.perf_counter() >= deadline:
+                return
+            start = time.perf_counter()
+            await scenario(client, rec, rng, sizes)
+            iteration_times.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(n) for n in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    total_requests = sum(len(samples) for samples in rec.samples.values())
+    return {
+        "iterations": len(iteration_times),
+        "requests": total_requests,
+        "errors": sum(sum(errors.values()) for errors in rec.errors.values()),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total_requests / elapsed, 2),
+        "iterations_per_s": round(len(iteration_times) / elapsed, 2),
+        "latency_ms": percentiles(iteration_times),
+        "by_request": {
+            request: {
+                "count": len(samples),
+                "errors": sum(rec.errors[request].values()),
+                "error_kinds": dict(rec.errors[request]),
+                **percentiles(samples),
+            }
+            for request, samples in sorted(rec.samples.items())
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+async def login(client) -> None:
+    await client.post("/auth/register", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    response = await client.post("/auth/login", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def run_all(client, scenarios: list[str], sizes: Sizes) -> dict:
+    await login(client)
+    results = {}
+    for name in scenarios:
+        print(f"▶️  {name}: {args.concurrency} users, "
+              + (f"{args.iterations} iterations" if args.iterations else f"{args.duration:.0f} s"))
+        results[name] = await run_scenario(client, name, sizes)
+    return results
+
+
+async def run_asgi(scenarios: list[str], sizes: Sizes) -> dict:
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+            return await run_all(client, scenarios, sizes)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(scenarios: list[str], sizes: Sizes) -> dict:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=backend_path,
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency * 8)
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            for _ in range(100):
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not start")
+            return await run_all(client, scenarios, sizes)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=backend_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict) -> None:
+    print(f"\n{'scenario / request':<34}{'count':>8}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    print("-" * 78)
+    for name, result in results["scenarios"].items():
+        latency = result["latency_ms"]
+        print(f"{name:<34}{result['iterations']:>8}{result['errors']:>6}"
+              f"{latency['p50']:>10.1f}{latency['p95']:>10.1f}{latency['p99']:>10.1f}")
+        for request, stats in result["by_request"].items():
+            kinds = ", ".join(f"{kind} ×{count}" for kind, count in stats["error_kinds"].items())
+            print(f"  {request:<32}{stats['count']:>8}{stats['errors']:>6}"
+                  f"{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}"
+                  + (f"  ({kinds})" if kinds else ""))
+        print(f"  throughput: {result['throughput_rps']:.1f} req/s, {result['iterations_per_s']:.2f} runs/s")
+
+
+def compare(results: dict, baseline: dict) -> int:
+    """Print p95/throughput changes against the baseline; returns the number of regressions."""
+    regressions = 0
+    print(f"\n📊 Against baseline from {baseline['meta'].get('timestamp')} (commit {baseline['meta'].get('commit')})")
+    print(f"{'scenario':<24}{'p95 ms':>20}{'change':>10}{'req/s':>20}{'change':>10}")
+    print("-" * 84)
+    for name, result in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            print(f"{name:<24}  (not in baseline)")
+            continue
+        p95_old, p95_new = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        rps_old, rps_new = before["throughput_rps"], result["throughput_rps"]
+        p95_change = (p95_new - p95_old) / p95_old if p95_old else 0.0
+        rps_change = (rps_new - rps_old) / rps_old if rps_old else 0.0
+        regressed = p95_change > args.max_regression or rps_change < -args.max_regression
+        regressions += regressed
+        print(f"{name:<24}{p95_old:>9.1f} → {p95_new:>7.1f}{p95_change:>+10.0%}"
+              f"{rps_old:>9.1f} → {rps_new:>7.1f}{rps_change:>+10.0%}{'  ❌ regression' if regressed else ''}")
+    return regressions
+
+
+def main() -> int:
+    scenarios = args.scenario or list(SCENARIOS)
+    sizes = Sizes.realistic(args.clients)
+
+    Base.metadata.create_all(bind=engine)
+    print(f"🌱 Seeding {sizes.total():,} rows ({sizes}) into {engine.url.render_as_string(hide_password=True)}")
+    db = SessionLocal()
+    try:
+        generate(db, sizes, seed=args.seed)
+    finally:
+        db.close()
+
+    runner = run_asgi if args.target == "asgi" else run_uvicorn
+    scenario_results = asyncio.run(runner(scenarios, sizes))
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "target": args.target,
+            "workers": args.workers if args.target == "uvicorn" else None,
+            "concurrency": args.concurrency,
+            "duration_s": None if args.iterations else args.duration,
+            "iterations": args.iterations or None,
+            "database": engine.dialect.name,
+            "sizes": sizes.__dict__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": scenario_results,
+    }
+    print_results(results)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Wrote {path}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()))
+        if regressions:
+            print(f"\n❌ {regressions} scenario(s) regressed by more than {args.max_regression:.0%}")
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Password Hash Calibration
+Measures PBKDF2-SHA256 on this host and suggests the iteration count whose
+hash takes about --target-ms. Set the result as PASSWORD_HASH_ITERATIONS;
+users' stored hashes are upgraded to it the next time they log in.
+
+Usage:
+    cd backend
+    python calibrate_password_hash.py                  # 250 ms target
+    python calibrate_password_hash.py --target-ms 100
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the backend to the path
+backend_path = Path(__file__).parent
+sys.path.insert(0, str(backend_path))
+
+from app.auth import LEGACY_ITERATIONS, pbkdf2
+from app.settings import settings
+
+# Never suggest a cost below the one every existing hash was made with
+MIN_ITERATIONS = LEGACY_ITERATIONS
+PROBE_ITERATIONS = 100_000
+
+
+def seconds_per_iteration(samples: int) -> float:
+    """Best-of-N timing of a probe hash, per iteration (best-of filters out scheduler noise)."""
+    salt = os.urandom(16)
+    best = float("inf")
+    for _ in range(samples):
+        started = time.perf_counter()
+        pbkdf2("calibration-password", salt, PROBE_ITERATIONS)
+        best = min(best, time.perf_counter() - started)
+    return best / PROBE_ITERATIONS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pick PBKDF2 iterations for a target hashing latency")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target time for one password hash")
+    parser.add_argument("--samples", type=int, default=5, help="Probe hashes to time")
+    args = parser.parse_args()
+
+    print("🔐 Calibrating password hashing (PBKDF2-SHA256)")
+    print("=" * 70)
+    per_iteration = seconds_per_iteration(args.samples)
+    suggested = int(args.target_ms / 1000 / per_iteration)
+    # Round to a readable number
+    suggested = max(MIN_ITERATIONS, round(suggested, -4))
+    current_ms = settings.password_hash_iterations * per_iteration * 1000
+
+    print(f"Current:   {settings.password_hash_iterations:>10,} iterations ≈ {current_ms:.0f} ms")
+    print(f"Suggested: {suggested:>10,} iterations ≈ {suggested * per_iteration * 1000:.0f} ms (target {args.target_ms:.0f} ms)")
+    if args.target_ms / 1000 / per_iteration < MIN_ITERATIONS:
+        print(f"  ⚠️  Raised to the minimum of {MIN_ITERATIONS:,}; the target is below the previous fixed cost on this host")
+    print("\nAdd to backend/.env:")
+    print(f"PASSWORD_HASH_ITERATIONS={suggested}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Migration script to store Activity.activity_metadata as native JSON and index it.
+
+- PostgreSQL: converts the VARCHAR column to JSONB, adds a GIN index for
+  containment (meta.<key>=<value>) filters and expression indexes for the
+  numeric/text keys we filter on most.
+- SQLite: the column already holds JSON text readable by the JSON1 functions,
+  so only expression indexes are added.
+
+Usage:
+    cd backend
+    python migrate_activity_metadata_json.py
+"""
+
+from sqlalchemy import create_engine, text
+from app.settings import settings
+
+# Keys that get a dedicated expression index, and whether they are numeric
+INDEXED_KEYS = {
+    "amount": True,
+    "priority": False,
+    "status": False,
+}
+
+# Create engine
+engine = create_engine(settings.database_url)
+
+
+def postgres_statements() -> list[str]:
+    statements = [
+        """
+        ALTER TABLE activities ALTER COLUMN activity_metadata DROP DEFAULT;
+        """,
+        """
+        ALTER TABLE activities ALTER COLUMN activity_metadata TYPE JSONB
+        USING COALESCE(NULLIF(activity_metadata::text, ''), '{}')::jsonb;
+        """,
+        """
+        ALTER TABLE activities ALTER COLUMN activity_metadata SET DEFAULT '{}'::jsonb;
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS ix_activities_metadata_gin
+        ON activities USING GIN (activity_metadata jsonb_path_ops);
+        """,
+    ]
+    for key, numeric in INDEXED_KEYS.items():
+        if numeric:
+            # Must match the expression built by crud._metadata_condition. The
+            # CASE skips non-numeric values, which would otherwise make every
+            # insert of one fail; the unguarded index of earlier runs is dropped
+            statements.append(f"DROP INDEX IF EXISTS ix_activities_meta_{key};")
+            statements.append(
+                f"""
+        CREATE INDEX IF NOT EXISTS ix_activities_meta_{key}_number ON activities ((
+            CASE WHEN jsonb_typeof(activity_metadata -> '{key}') = 'number'
+            THEN CAST((activity_metadata ->> '{key}') AS FLOAT) END
+        ));
+        """
+            )
+        else:
+            statements.append(
+                f"""
+        CREATE INDEX IF NOT EXISTS ix_activities_meta_{key} ON activities (((activity_metadata ->> '{key}')));
+        """
+            )
+    return statements
+
+
+def sqlite_statements() -> list[str]:
+    return [
+        f"""
+        CREATE INDEX IF NOT EXISTS ix_activities_meta_{key}
+        ON activities (json_extract(activity_metadata, '$.{key}'));
+        """
+        for key in INDEXED_KEYS
+    ]
+
+
+def run_migration():
+    """Execute the migration statements"""
+    dialect = engine.dialect.name
+    print(f"Database Type: {dialect}")
+    migration_statements = postgres_statements() if dialect == "postgresql" else sqlite_statements()
+
+    with engine.connect() as connection:
+        for statement in migration_statements:
+            try:
+                connection.execute(text(statement.strip()))
+                connection.commit()
+                print(f"✓ Executed: {' '.join(statement.split())[:60]}...")
+            except Exception as e:
+                connection.rollback()
+                print(f"✗ Error executing statement: {e}")
+                print(f"  Statement: {' '.join(statement.split())[:60]}...")
+
+        print("\n✓ Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    print("Starting migration: Native JSON storage for activity metadata...")
+    run_migration()
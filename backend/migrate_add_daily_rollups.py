@@ -0,0 +1,54 @@
+"""
+Migration script to add daily analytics rollups.
+Adds leads.created_at (so new leads can be backfilled later) and creates the
+daily_rollups table, then backfills it from existing data.
+
+Usage:
+    cd backend
+    python migrate_add_daily_rollups.py
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.settings import settings
+from app.db import Base
+from app import models, rollups
+
+# Create engine
+engine = create_engine(settings.database_url)
+
+# Migration SQL statements
+migration_statements = [
+    """
+    ALTER TABLE leads ADD COLUMN created_at TIMESTAMP DEFAULT NULL;
+    """,
+]
+
+def run_migration():
+    """Execute the migration statements"""
+    with engine.connect() as connection:
+        for statement in migration_statements:
+            try:
+                connection.execute(text(statement.strip()))
+                print(f"✓ Executed: {statement.strip()[:60]}...")
+            except Exception as e:
+                print(f"✗ Error executing statement: {e}")
+                print(f"  Statement: {statement.strip()[:60]}...")
+        
+        connection.commit()
+
+    Base.metadata.create_all(bind=engine, tables=[models.DailyRollup.__table__])
+    print("✓ Ensured daily_rollups table")
+
+    db = sessionmaker(bind=engine)()
+    try:
+        written = rollups.backfill(db)
+    finally:
+        db.close()
+    for metric, count in written.items():
+        print(f"✓ Backfilled {metric}: {count} day(s)")
+    print("\n✓ Migration completed successfully!")
+
+if __name__ == "__main__":
+    print("Starting migration: Adding daily analytics rollups...")
+    run_migration()
@@ -0,0 +1,52 @@
+"""
+Migration script to add server-side goal progress to the Goal table.
+Adds goals.current_amount and seeds it from the daily revenue rollups
+(run migrate_add_daily_rollups.py first).
+
+Usage:
+    cd backend
+    python migrate_add_goal_progress.py
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.settings import settings
+from app import goal_progress, models
+
+# Create engine
+engine = create_engine(settings.database_url)
+
+# Migration SQL statements
+migration_statements = [
+    """
+    ALTER TABLE goals ADD COLUMN current_amount FLOAT DEFAULT 0;
+    """,
+]
+
+def run_migration():
+    """Execute the migration statements"""
+    with engine.connect() as connection:
+        for statement in migration_statements:
+            try:
+                connection.execute(text(statement.strip()))
+                print(f"✓ Executed: {statement.strip()[:60]}...")
+            except Exception as e:
+                print(f"✗ Error executing statement: {e}")
+                print(f"  Statement: {statement.strip()[:60]}...")
+        
+        connection.commit()
+
+    db = sessionmaker(bind=engine)()
+    try:
+        goals = db.query(models.Goal).all()
+        for goal in goals:
+            goal_progress.recalculate(db, goal)
+        db.commit()
+        print(f"✓ Seeded progress for {len(goals)} goal(s)")
+    finally:
+        db.close()
+    print("\n✓ Migration completed successfully!")
+
+if __name__ == "__main__":
+    print("Starting migration: Adding server-side goal progress...")
+    run_migration()
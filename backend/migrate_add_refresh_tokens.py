@@ -0,0 +1,27 @@
+"""
+Migration script to add the refresh_tokens table used by /auth/refresh.
+
+Usage:
+    cd backend
+    python migrate_add_refresh_tokens.py
+"""
+
+from sqlalchemy import create_engine
+from app.settings import settings
+from app.db import Base
+from app import models
+
+# Create engine
+engine = create_engine(settings.database_url)
+
+
+def run_migration():
+    """Create the table and its indexes (user_id, family_id, unique token_hash)"""
+    Base.metadata.create_all(bind=engine, tables=[models.RefreshToken.__table__])
+    print("✓ Ensured refresh_tokens table")
+    print("\n✓ Migration completed successfully!")
+
+
+if __name__ == "__main__":
+    print("Starting migration: Adding refresh tokens...")
+    run_migration()
@@ -0,0 +1,86 @@
+-- Migration: Partition the activities table by month (PostgreSQL only)
+-- Date: 2026-10-19
+-- Description: Converts activities into a native range-partitioned table keyed on created_at,
+--              with one partition per month. The archival job (backend/archive_activities.py)
+--              exports old months to compressed NDJSON and detaches/drops their partitions,
+--              so the hot table only holds the retention window.
+--              SQLite installs keep a single table; the archival job deletes archived rows there.
+
+BEGIN;
+
+-- ============================================================================
+-- Swap the existing table out of the way
+-- ============================================================================
+ALTER TABLE activities RENAME TO activities_unpartitioned;
+
+-- Partitioned tables require the partition key in the primary key
+CREATE TABLE activities (
+    id VARCHAR(36) NOT NULL,
+    activity_type VARCHAR(50) NOT NULL,
+    entity_type VARCHAR(50) NOT NULL,
+    entity_id VARCHAR(36) NOT NULL,
+    entity_name VARCHAR(255) NOT NULL,
+    description VARCHAR(500) NOT NULL,
+    activity_metadata VARCHAR(1000) NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP NOT NULL,
+    lead_id VARCHAR(36) REFERENCES leads(id) ON DELETE CASCADE,
+    client_id VARCHAR(36) REFERENCES clients(id) ON DELETE CASCADE,
+    goal_id VARCHAR(36) REFERENCES goals(id) ON DELETE CASCADE,
+    task_id VARCHAR(36) REFERENCES tasks(id) ON DELETE CASCADE,
+    customer_id VARCHAR(36) REFERENCES customers(id) ON DELETE CASCADE,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Indexes declared on the parent are created on every partition
+CREATE INDEX ix_activities_created_at ON activities (created_at);
+CREATE INDEX idx_activity_lead_id ON activities (lead_id);
+CREATE INDEX idx_activity_client_id ON activities (client_id);
+CREATE INDEX idx_activity_goal_id ON activities (goal_id);
+CREATE INDEX idx_activity_task_id ON activities (task_id);
+CREATE INDEX idx_activity_customer_id ON activities (customer_id);
+
+-- ============================================================================
+-- One partition per month, from the oldest row up to two months ahead
+-- ============================================================================
+DO $$
+DECLARE
+    month_start DATE;
+    last_month DATE := date_trunc('month', now())::date + INTERVAL '2 months';
+BEGIN
+    SELECT COALESCE(date_trunc('month', MIN(created_at))::date, date_trunc('month', now())::date)
+      INTO month_start
+      FROM activities_unpartitioned;
+
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF activities FOR VALUES FROM (%L) TO (%L)',
+            'activities_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::date
+        );
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+END $$;
+
+-- Safety net for rows outside the pre-created range; the API also creates
+-- upcoming partitions on startup (app.archive.ensure_partitions), moving any
+-- rows this partition caught for their month into the new partition
+CREATE TABLE activities_default PARTITION OF activities DEFAULT;
+
+-- ============================================================================
+-- Copy the data across and drop the old table
+-- ============================================================================
+INSERT INTO activities
+SELECT id, activity_type, entity_type, entity_id, entity_name, description,
+       activity_metadata, COALESCE(created_at, now()), lead_id, client_id, goal_id, task_id, customer_id
+  FROM activities_unpartitioned;
+
+DROP TABLE activities_unpartitioned;
+
+COMMIT;
+
+-- ============================================================================
+-- Migration Verification
+-- ============================================================================
+-- SELECT inhrelid::regclass AS partition FROM pg_inherits WHERE inhparent = 'activities'::regclass ORDER BY 1;
+-- SELECT COUNT(*) FROM activities;
@@ -0,0 +1,17 @@
+-- Migration: Composite indexes for server-side task filtering
+-- Date: 2026-10-19
+-- Description: Backs the GET /tasks filters (status, priority, due date, related entity, overdue)
+--              and its (created_at, id) cursor pagination with index range scans.
+--              Works on PostgreSQL and SQLite. New databases get these from the ORM models.
+
+-- "My overdue urgent tasks": status IN (...) AND priority = ... AND due_date < today
+CREATE INDEX IF NOT EXISTS ix_tasks_status_priority_due ON tasks (status, priority, due_date);
+
+-- Priority and/or due date filters without a status filter
+CREATE INDEX IF NOT EXISTS ix_tasks_priority_due ON tasks (priority, due_date);
+
+-- Tasks of one client/lead, newest first
+CREATE INDEX IF NOT EXISTS ix_tasks_related_created ON tasks (related_to, related_id, created_at);
+
+-- Default ordering and cursor pagination
+CREATE INDEX IF NOT EXISTS ix_tasks_created_id ON tasks (created_at, id);
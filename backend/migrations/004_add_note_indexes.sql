@@ -0,0 +1,7 @@
+-- Migration: Index notes by owning entity
+-- Date: 2026-10-19
+-- Description: Backs GET /notes and POST /notes/batch-get, which look notes up by
+--              (related_to, related_id) for one or many entities at once.
+--              Works on PostgreSQL and SQLite. New databases get this from the ORM models.
+
+CREATE INDEX IF NOT EXISTS ix_notes_related ON notes (related_to, related_id);
@@ -0,0 +1,32 @@
+-- Migration: Index foreign key columns on databases that lack them
+-- Date: 2026-10-19
+-- Description: Deleting a lead, client, customer, goal or task lets the database's
+--              ON DELETE CASCADE remove the children (the ORM no longer loads them),
+--              which looks them up by foreign key. 001_add_referential_integrity.sql
+--              (and 002 for activities) already created these indexes; databases built
+--              by Base.metadata.create_all before the models declared them have none.
+--              Same names as 001/002, so this is a no-op where those ran.
+--              Works on PostgreSQL (including the partitioned activities table) and SQLite.
+
+-- Duplicates created by an earlier revision of this migration
+DROP INDEX IF EXISTS ix_tasks_client_id;
+DROP INDEX IF EXISTS ix_tasks_lead_id;
+DROP INDEX IF EXISTS ix_notes_client_id;
+DROP INDEX IF EXISTS ix_notes_lead_id;
+DROP INDEX IF EXISTS ix_activities_lead_id;
+DROP INDEX IF EXISTS ix_activities_client_id;
+DROP INDEX IF EXISTS ix_activities_goal_id;
+DROP INDEX IF EXISTS ix_activities_task_id;
+DROP INDEX IF EXISTS ix_activities_customer_id;
+
+CREATE INDEX IF NOT EXISTS idx_task_client_id ON tasks (client_id);
+CREATE INDEX IF NOT EXISTS idx_task_lead_id ON tasks (lead_id);
+
+CREATE INDEX IF NOT EXISTS idx_note_client_id ON notes (client_id);
+CREATE INDEX IF NOT EXISTS idx_note_lead_id ON notes (lead_id);
+
+CREATE INDEX IF NOT EXISTS idx_activity_lead_id ON activities (lead_id);
+CREATE INDEX IF NOT EXISTS idx_activity_client_id ON activities (client_id);
+CREATE INDEX IF NOT EXISTS idx_activity_goal_id ON activities (goal_id);
+CREATE INDEX IF NOT EXISTS idx_activity_task_id ON activities (task_id);
+CREATE INDEX IF NOT EXISTS idx_activity_customer_id ON activities (customer_id);
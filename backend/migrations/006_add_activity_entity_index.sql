@@ -0,0 +1,11 @@
+-- Migration: Index activities by the entity they were logged against
+-- Date: 2026-10-19
+-- Description: GET /clients/{id}/detail reads a client's recent activities as
+--              client_id = :id OR (entity_type = 'client' AND entity_id = :id), because
+--              activities posted through the API may name their entity without the
+--              foreign key. Without an index on the second branch the planner walks the
+--              whole table in created_at order; with it, both branches are index searches.
+--              Works on PostgreSQL (including the partitioned activities table) and SQLite.
+--              New databases get this from the ORM models.
+
+CREATE INDEX IF NOT EXISTS ix_activities_entity_created ON activities (entity_type, entity_id, created_at);
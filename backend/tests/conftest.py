@@ -0,0 +1,48 @@
+"""
+Shared fixtures: the app on a temporary SQLite file and archive directory,
+emptied before every test
+
+Run from backend/ with: python -m pytest -q tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+_workdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ["ACTIVITY_ARCHIVE_DIR"] = f"{_workdir}/archive"
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["CACHE_BUS"] = "off"
+
+# Add the backend to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+from app import cache, ratelimit
+from app.db import Base, engine
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    shutil.rmtree(os.environ["ACTIVITY_ARCHIVE_DIR"], ignore_errors=True)
+    for local_cache in (cache.stats_cache, cache.user_cache):
+        local_cache.clear()
+    ratelimit.set_backend(ratelimit.MemoryBackend())
+    yield
+
+
+@pytest.fixture
+def client():
+    """An authenticated TestClient."""
+    with TestClient(app) as http:
+        http.post("/auth/register", json={"email": "test@example.com", "password": "test-password"})
+        token = http.post("/auth/login", data={"username": "test@example.com", "password": "test-password"}).json()
+        http.headers["Authorization"] = f"Bearer {token['access_token']}"
+        yield http
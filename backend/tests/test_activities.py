@@ -0,0 +1,72 @@
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, sessionmaker
+import migrate_activity_metadata_json
+from app import crud, models
+from app.db import Base, engine
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def db(request):
+    """A session on the test SQLite database, or on TEST_POSTGRES_URL when it is set."""
+    if request.param == "sqlite":
+        bind = engine
+    else:
+        url = os.environ.get("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+        bind = create_engine(url)
+        Base.metadata.drop_all(bind=bind)
+        Base.metadata.create_all(bind=bind)
+    session = sessionmaker(bind=bind)()
+    yield session
+    session.close()
+    if bind is not engine:
+        Base.metadata.drop_all(bind=bind)
+        bind.dispose()
+
+
+def test_metadata_ne_keeps_activities_without_the_key(db):
+    for name, metadata in (("paid", {"source": "stripe"}), ("manual", {"source": "cash"}), ("bare", {})):
+        db.add(models.Activity(
+            activity_type="payment", entity_type="client", entity_id="client-1", entity_name=name,
+            description=name, activity_metadata=metadata,
+        ))
+    db.commit()
+
+    def names(op):
+        rows = crud.query_activities(db, metadata_filters=[("source", op, "stripe")]).all()
+        return sorted(row.entity_name for row in rows)
+
+    assert names("eq") == ["paid"]
+    assert names("ne") == ["bare", "manual"]
+
+
+def test_metadata_range_skips_non_numeric_values(db):
+    for name, amount in (("small", 5), ("large", 500), ("text", "n/a"), ("missing", None)):
+        db.add(models.Activity(
+            activity_type="payment", entity_type="client", entity_id="client-1", entity_name=name,
+            description=name, activity_metadata={} if amount is None else {"amount": amount},
+        ))
+    db.commit()
+
+    def names(op, value):
+        rows = crud.query_activities(db, metadata_filters=[("amount", op, value)]).all()
+        return sorted(row.entity_name for row in rows)
+
+    assert names("gt", "10") == ["large"]
+    assert names("lte", "500") == ["large", "small"]
+
+
+def test_postgres_range_filter_matches_the_expression_index():
+    def normalized(sql: str) -> str:
+        # Parentheses, spacing and table qualification do not change the expression
+        return "".join(sql.replace("activities.", "").replace("(", "").replace(")", "").split())
+
+    session = Session(bind=create_engine("postgresql+psycopg://"))  # never connects
+    condition = crud._metadata_condition(session, "amount", "gt", "10")
+    expression = str(condition.compile(dialect=postgresql.dialect())).split(" > ")[0]
+    [index] = [s for s in migrate_activity_metadata_json.postgres_statements() if "ix_activities_meta_amount_number" in s]
+    assert normalized(expression) in normalized(index)
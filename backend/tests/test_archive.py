@@ -0,0 +1,70 @@
+from datetime import date, datetime, timedelta
+from app import archive, models
+from app.db import SessionLocal
+
+MONTH = date(2025, 3, 1)
+
+
+def add_activities(db, count, start, entity_id="lead-1", **values):
+    for n in range(count):
+        db.add(models.Activity(
+            activity_type="note_added", entity_type="lead", entity_id=entity_id, entity_name="Lead",
+            description=f"Activity {start + n}", created_at=datetime(2025, 3, 1) + timedelta(hours=start + n),
+            **values,
+        ))
+    db.commit()
+
+
+def test_archive_month_merges_with_an_existing_file():
+    db = SessionLocal()
+    try:
+        add_activities(db, 3, 0)
+        assert archive.archive_month(db, MONTH) == 3
+        add_activities(db, 2, 3, entity_id="lead-2")
+        assert archive.archive_month(db, MONTH) == 2
+        assert db.query(models.Activity).count() == 0
+    finally:
+        db.close()
+
+    records = list(archive._read_archive_file(archive.archive_path(MONTH)))
+    assert [record["description"] for record in records] == [f"Activity {n}" for n in range(5)]
+
+
+def test_archive_month_in_batches_after_a_partial_run(monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_BATCH_SIZE", 2)
+    db = SessionLocal()
+    try:
+        add_activities(db, 5, 0)
+        rows = db.query(models.Activity).order_by(models.Activity.created_at).all()
+        kept = [{column.key: getattr(row, column.key) for column in models.Activity.__table__.columns} for row in rows]
+        assert archive.archive_month(db, MONTH) == 5
+
+        # A run whose delete never committed: the file already holds these rows
+        db.execute(models.Activity.__table__.insert(), kept[:3])
+        db.commit()
+        assert archive.archive_month(db, MONTH) == 3
+        assert db.query(models.Activity).count() == 0
+    finally:
+        db.close()
+
+    records = list(archive._read_archive_file(archive.archive_path(MONTH)))
+    assert [record["id"] for record in records] == [row["id"] for row in kept]
+
+
+def test_read_archived_activities_pages_newest_first(client):
+    db = SessionLocal()
+    try:
+        add_activities(db, 5, 0)
+        add_activities(db, 2, 5, entity_id="lead-2")
+        archive.archive_month(db, MONTH)
+    finally:
+        db.close()
+
+    page = archive.read_archived_activities(MONTH, limit=2, offset=1)
+    assert [record["description"] for record in page] == ["Activity 5", "Activity 4"]
+    page = archive.read_archived_activities(MONTH, entity_id="lead-1", limit=10, offset=3)
+    assert [record["description"] for record in page] == ["Activity 1", "Activity 0"]
+
+    response = client.get("/activities/archive/2025-03", params={"entity_id": "lead-2"})
+    assert [record["description"] for record in response.json()] == ["Activity 6", "Activity 5"]
+    assert client.get("/activities/archive/2025-04").status_code == 404
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from app import auth, models
+from app.auth import hash_refresh_token, token_digest
+from app.db import SessionLocal
+from app.routers import auth as auth_router
+from app.settings import settings
+
+EMAIL, PASSWORD = "test@example.com", "test-password"
+
+
+def login(http) -> dict:
+    response = http.post("/auth/login", data={"username": EMAIL, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def refresh(http, refresh_token: str):
+    return http.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_the_token(client):
+    first = login(client)
+    response = refresh(client, first["refresh_token"])
+    assert response.status_code == 200
+    second = response.json()
+    assert second["refresh_token"] != first["refresh_token"]
+    assert client.get("/leads", headers=bearer(second["access_token"])).status_code == 200
+
+    third = refresh(client, second["refresh_token"])
+    assert third.status_code == 200
+    assert third.json()["refresh_token"] not in (first["refresh_token"], second["refresh_token"])
+
+
+def test_reused_refresh_token_revokes_the_family(client):
+    first = login(client)
+    second = refresh(client, first["refresh_token"]).json()
+
+    assert refresh(client, first["refresh_token"]).status_code == 401
+    # The legitimate holder's current token went with the rest of the family
+    assert refresh(client, second["refresh_token"]).status_code == 401
+
+    db = SessionLocal()
+    try:
+        family = db.query(models.RefreshToken).filter(
+            models.RefreshToken.token_hash == hash_refresh_token(second["refresh_token"])
+        ).one().family_id
+        assert db.query(models.RefreshToken).filter(
+            models.RefreshToken.family_id == family, models.RefreshToken.revoked_at.is_(None)
+        ).count() == 0
+    finally:
+        db.close()
+
+    # Another login is a separate family and still works
+    assert refresh(client, login(client)["refresh_token"]).status_code == 200
+
+
+def test_expired_revoked_and_unknown_refresh_tokens_are_rejected(client):
+    expired = login(client)["refresh_token"]
+    db = SessionLocal()
+    try:
+        db.query(models.RefreshToken).filter(models.RefreshToken.token_hash == hash_refresh_token(expired)).update(
+            {"expires_at": datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+    finally:
+        db.close()
+    assert refresh(client, expired).status_code == 401
+
+    logged_out = login(client)["refresh_token"]
+    assert client.post("/auth/logout", json={"refresh_token": logged_out}).status_code == 204
+    assert refresh(client, logged_out).status_code == 401
+
+    assert refresh(client, "not-a-refresh-token").status_code == 401
+
+
+def test_logout_revokes_the_access_token(client):
+    session, other = login(client), login(client)
+    digest = token_digest(session["access_token"])
+    assert client.get("/leads", headers=bearer(session["access_token"])).status_code == 200
+    assert auth._verified_tokens.get(digest) == EMAIL
+
+    logout = {"refresh_token": session["refresh_token"]}
+    assert client.post("/auth/logout", json=logout, headers=bearer(session["access_token"])).status_code == 204
+    assert auth._verified_tokens.get(digest) is None
+    response = client.get("/leads", headers=bearer(session["access_token"]))
+    assert (response.status_code, response.json()["detail"]) == (401, "Token revoked")
+    # Revocation is per token (jti), not per user
+    assert client.get("/leads", headers=bearer(other["access_token"])).status_code == 200
+
+    db = SessionLocal()
+    try:
+        assert db.get(models.RevokedToken, digest) is not None
+    finally:
+        db.close()
+
+
+def test_revocation_from_another_worker_evicts_the_cached_token(client):
+    session = login(client)
+    digest = token_digest(session["access_token"])
+    assert client.get("/leads", headers=bearer(session["access_token"])).status_code == 200
+    assert auth._verified_tokens.get(digest) == EMAIL
+
+    # Another worker's logout: the row arrives in the database and the bus
+    # reloads the revocation list
+    db = SessionLocal()
+    try:
+        db.execute(models.RevokedToken.__table__.insert().values(
+            token_digest=digest, expires_at=datetime.utcnow() + timedelta(minutes=5), revoked_at=datetime.utcnow(),
+        ))
+        db.commit()
+    finally:
+        db.close()
+    auth._on_revoked_tokens_changed(models.RevokedToken.__tablename__, None)
+
+    assert auth._verified_tokens.get(digest) is None
+    assert client.get("/leads", headers=bearer(session["access_token"])).status_code == 401
+
+
+def test_login_is_throttled_before_password_hashing(client, monkeypatch):
+    client.post("/auth/register", json={"email": "victim@example.com", "password": "right-password"})
+    verified = []
+    real_verify = auth_router.verify_password
+
+    def counting_verify(password, password_hash):
+        verified.append(password)
+        return real_verify(password, password_hash)
+
+    monkeypatch.setattr(auth_router, "verify_password", counting_verify)
+    attempt = {"username": "victim@example.com", "password": "wrong-password"}
+    for _ in range(settings.login_attempts_per_username):
+        assert client.post("/auth/login", data=attempt).status_code == 401
+    assert len(verified) == settings.login_attempts_per_username
+
+    throttled = client.post("/auth/login", data={**attempt, "password": "right-password"})
+    assert throttled.status_code == 429
+    assert int(throttled.headers["Retry-After"]) >= 1
+    assert len(verified) == settings.login_attempts_per_username
+    # The limit is per username: other accounts can still log in
+    login(client)
+
+
+def test_metrics_need_a_token(client, monkeypatch):
+    client.post("/auth/login", data={"username": EMAIL, "password": "wrong-password"})
+    anonymous = client.get("/metrics", headers={"Authorization": ""})
+    assert anonymous.status_code == 401
+    assert client.get("/metrics", headers=bearer("not-a-token")).status_code == 401
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'pulse_login_attempts_total{result="invalid_password"}' in response.text
+
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    assert client.get("/metrics", headers=bearer("scrape-secret")).status_code == 200
+    assert client.get("/metrics", headers=bearer("scrape-secret-2")).status_code == 401
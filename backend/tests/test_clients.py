@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+from sqlalchemy import event
+from app.db import engine
+
+CLIENT = {
+    "business_name": "Acme",
+    "business_type": "SEO",
+    "contact": "acme@example.com",
+    "onboarding": (date.today() - timedelta(days=60)).isoformat(),
+    "deadline": (date.today() - timedelta(days=5)).isoformat(),
+    "delivery": "In Progress",
+    "payment_collected": 1200,
+    "domain_name": "acme.example.com",
+}
+
+
+def test_complete_client_moves_it_out_of_active_stats(client):
+    created = client.post("/clients", json=CLIENT).json()
+    client.post("/tasks", json={"title": "Launch", "related_to": "client", "related_id": created["id"]})
+    before = client.get("/stats").json()
+    assert (before["active_projects"], before["deadlines"], before["revenue"]) == (1, 1, 1200)
+
+    response = client.post(f"/clients/{created['id']}/complete", json={})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["client"]["is_completed"] is True
+    assert body["customer"]["total_paid"] == 1200
+    assert body["customer"]["domain_name"] == "acme.example.com"
+    assert body["closed_tasks"] == 1
+
+    after = client.get("/stats").json()
+    assert (after["active_projects"], after["deadlines"], after["revenue"]) == (0, 0, 1200)
+
+
+def test_complete_client_twice_conflicts(client):
+    created = client.post("/clients", json=CLIENT).json()
+    assert client.post(f"/clients/{created['id']}/complete", json={}).status_code == 200
+    assert client.post(f"/clients/{created['id']}/complete", json={}).status_code == 409
+    assert client.post("/clients/missing/complete", json={}).status_code == 404
+
+
+def test_client_detail_reads_activities_through_indexes(client):
+    created = client.post("/clients", json=CLIENT).json()
+    other = client.post("/clients", json={**CLIENT, "business_name": "Other"}).json()
+    for entity_id in (created["id"], other["id"]):
+        client.post("/activities", json={
+            "activity_type": "note_added", "entity_type": "client", "entity_id": entity_id,
+            "entity_name": "Acme", "description": f"Logged for {entity_id}",
+        })
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM activities" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        detail = client.get(f"/clients/{created['id']}/detail").json()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert [activity["description"] for activity in detail["activities"]] == [f"Logged for {created['id']}"]
+
+    [(statement, parameters)] = statements
+    with engine.connect() as conn:
+        plan = " ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+    assert "SCAN activities" not in plan
+    assert "ix_activities_entity_created" in plan
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+import msgpack
+import pytest
+from app import fastpath
+
+LIST_ROUTES = [
+    "/leads",
+    "/clients",
+    "/customers",
+    "/goals",
+    "/tasks",
+    "/notes?related_to=lead",
+    "/activities",
+]
+
+
+@pytest.fixture
+def seeded(client):
+    """One or two rows behind every list route, with nulls, dates, enums and computed fields."""
+    today = date.today().isoformat()
+    lead = client.post("/leads", json={"business_name": "Acme", "contact": "acme@example.com", "comment": "Hot"}).json()
+    client.post("/leads", json={"business_name": "Globex", "contact": "globex@example.com", "status": "Contacted"})
+    client.post("/clients", json={
+        "business_name": "Initech", "business_type": "SEO", "contact": "initech@example.com",
+        "onboarding": today, "deadline": (date.today() + timedelta(days=30)).isoformat(),
+        "delivery": "In Progress", "payment_collected": 1250.5,
+    })
+    client.post("/customers", json={"business_name": "Hooli", "completed_date": today, "total_paid": 800})
+    client.post("/goals", json={
+        "title": "Q4", "target_amount": 10_000, "date_started": (date.today() - timedelta(days=30)).isoformat(),
+        "deadline": (date.today() + timedelta(days=60)).isoformat(),
+    })
+    client.post("/tasks", json={"title": "Call", "related_to": "lead", "related_id": lead["id"], "due_date": today})
+    client.post("/notes", json={"content": "Met", "related_to": "lead", "related_id": lead["id"], "is_pinned": True})
+    client.post("/activities", json={
+        "activity_type": "note_added", "entity_type": "lead", "entity_id": lead["id"], "entity_name": "Acme",
+        "description": "Note added", "activity_metadata": {"amount": 12.5, "tags": ["a"]},
+    })
+    return client
+
+
+def fast_url(route: str) -> str:
+    return f"{route}{'&' if '?' in route else '?'}fast=true"
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "pydantic"])
+def test_fast_path_returns_the_default_json(seeded, monkeypatch, encoder):
+    if encoder == "pydantic":
+        monkeypatch.setattr(fastpath, "orjson", None)
+    for route in LIST_ROUTES:
+        default = seeded.get(route).json()
+        assert default, route
+        assert seeded.get(fast_url(route)).json() == default, route
+
+
+def rows_from_columns(body: dict) -> list[dict]:
+    columns = body["columns"]
+    return [{field: values[n] for field, values in columns.items()} for n in range(body["count"])]
+
+
+def test_msgpack_and_columnar_carry_the_default_rows(seeded):
+    for route in LIST_ROUTES:
+        default = seeded.get(route).json()
+
+        response = seeded.get(route, headers={"Accept": fastpath.MSGPACK})
+        assert response.headers["content-type"] == fastpath.MSGPACK
+        assert "Accept" in response.headers["vary"].split(", ")
+        assert msgpack.unpackb(response.content) == default, route
+
+        response = seeded.get(route, headers={"Accept": fastpath.COLUMNAR_JSON})
+        assert response.headers["content-type"] == fastpath.COLUMNAR_JSON
+        assert rows_from_columns(response.json()) == default, route
+
+
+def test_accept_header_negotiation(seeded, monkeypatch):
+    def content_type(accept: str) -> str:
+        return seeded.get("/leads", headers={"Accept": accept}).headers["content-type"]
+
+    assert content_type(f"{fastpath.MSGPACK};q=0.5, {fastpath.COLUMNAR_JSON}") == fastpath.COLUMNAR_JSON
+    assert content_type(f"application/x-msgpack, {fastpath.JSON};q=0.1") == fastpath.MSGPACK
+    assert content_type("text/html, */*;q=0.8") == fastpath.JSON
+
+    monkeypatch.setattr(fastpath, "msgpack", None)
+    assert content_type(f"{fastpath.MSGPACK}, {fastpath.JSON};q=0.5") == fastpath.JSON
+    assert seeded.get("/leads", headers={"Accept": fastpath.MSGPACK}).status_code == 406
+
+
+def test_task_pages_keep_their_cursor_in_msgpack(seeded):
+    for n in range(3):
+        seeded.post("/tasks", json={"title": f"Task {n}", "related_to": "general"})
+    default = seeded.get("/tasks", params={"limit": 2})
+    packed = seeded.get("/tasks", params={"limit": 2}, headers={"Accept": fastpath.MSGPACK})
+    assert msgpack.unpackb(packed.content) == default.json()
+    assert packed.headers["x-next-cursor"] == default.headers["x-next-cursor"]
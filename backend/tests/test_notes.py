@@ -0,0 +1,25 @@
+def test_batch_get_matches_per_entity_lists(client):
+    leads = [
+        client.post("/leads", json={"business_name": f"Lead {n}", "contact": f"lead{n}@example.com"}).json()["id"]
+        for n in range(3)
+    ]
+    for n in range(4):
+        note = {"content": f"A{n}", "related_to": "lead", "related_id": leads[0], "is_pinned": n == 1}
+        client.post("/notes", json=note)
+    client.post("/notes", json={"content": "B0", "related_to": "lead", "related_id": leads[1]})
+
+    def listed(lead_id: str) -> list[dict]:
+        return client.get("/notes", params={"related_to": "lead", "related_id": lead_id}).json()
+
+    ids = [*leads, "missing", leads[0]]
+    batch = client.post("/notes/batch-get", json={"related_to": "lead", "related_ids": ids}).json()
+    assert batch["notes"] == {lead_id: listed(lead_id) for lead_id in [*leads, "missing"]}
+    assert batch["counts"] == {leads[0]: 4, leads[1]: 1, leads[2]: 0, "missing": 0}
+    assert [note["content"] for note in batch["notes"][leads[0]]][:1] == ["A1"]  # pinned first
+
+    latest = client.post("/notes/batch-get", json={"related_to": "lead", "related_ids": ids, "latest": 2}).json()
+    assert latest["notes"] == {lead_id: listed(lead_id)[:2] for lead_id in [*leads, "missing"]}
+    assert latest["counts"] == batch["counts"]
+
+    too_many = client.post("/notes/batch-get", json={"related_to": "lead", "related_ids": ["x"] * 1001})
+    assert too_many.status_code == 422
@@ -0,0 +1,105 @@
+from datetime import date, datetime, timedelta
+import pytest
+from app import models, scheduler as scheduler_module
+from app.db import SessionLocal
+from app.scheduler import CLIENT_DEADLINE, CLIENT_RENEWAL, CUSTOMER_RENEWAL, RETRY_SECONDS, ScheduledEvent, Scheduler, reminder_due_at
+
+
+@pytest.fixture
+def scheduler():
+    """A scheduler that is not running its thread, on the test database."""
+    instance = Scheduler()
+    instance._session_factory = SessionLocal
+    return instance
+
+
+def add_client(**values) -> str:
+    db = SessionLocal()
+    try:
+        client = models.Client(
+            business_name="Acme", business_type="SEO", contact="acme@example.com", onboarding=date.today(),
+            deadline=date.today() + timedelta(days=30), delivery="In Progress", **values,
+        )
+        db.add(client)
+        db.commit()
+        return client.id
+    finally:
+        db.close()
+
+
+def message(table: str, keys: list[str] | None) -> dict:
+    return {"o": "another-worker", "s": 1, "t": table, "k": keys, "c": [], "b": [] if keys is not None else ["update"]}
+
+
+def test_changes_from_other_workers_are_scheduled(scheduler):
+    client_id = add_client()
+    assert scheduler.pending() == []
+
+    scheduler.on_change(message("clients", [client_id]))
+    assert [(event.kind, event.entity_id) for event in scheduler.pending()] == [(CLIENT_DEADLINE, client_id)]
+
+    db = SessionLocal()
+    db.delete(db.get(models.Client, client_id))
+    db.commit()
+    db.close()
+    scheduler.on_change(message("clients", [client_id]))
+    assert scheduler.pending() == []
+
+
+def test_bulk_change_reloads_the_table(scheduler):
+    renewal = date.today() + timedelta(days=90)
+    first, second = add_client(), add_client(renewal_date=renewal)
+    add_client(is_completed=True, renewal_date=renewal)
+    scheduler.on_change(message("clients", None))
+    assert sorted((event.kind, event.entity_id) for event in scheduler.pending()) == sorted(
+        [(CLIENT_DEADLINE, first), (CLIENT_DEADLINE, second), (CLIENT_RENEWAL, second)]
+    )
+
+
+def test_completed_client_renews_only_through_its_customer(client, monkeypatch):
+    monkeypatch.setattr(scheduler_module.scheduler, "_current", {})
+    renewal = date.today() + timedelta(days=90)
+    created = client.post("/clients", json={
+        "business_name": "Acme", "business_type": "SEO", "contact": "acme@example.com",
+        "onboarding": date.today().isoformat(), "deadline": (date.today() + timedelta(days=30)).isoformat(),
+        "delivery": "In Progress", "renewal_date": renewal.isoformat(),
+    }).json()
+    assert {event.kind for event in scheduler_module.scheduler.pending()} == {CLIENT_DEADLINE, CLIENT_RENEWAL}
+
+    customer = client.post(f"/clients/{created['id']}/complete", json={}).json()["customer"]
+    assert [(event.kind, event.entity_id, event.event_date) for event in scheduler_module.scheduler.pending()] == [
+        (CUSTOMER_RENEWAL, customer["id"], renewal)
+    ]
+    db = SessionLocal()
+    try:
+        event = ScheduledEvent(CLIENT_RENEWAL, created["id"], renewal, reminder_due_at(renewal))
+        assert scheduler_module.handle_client_renewal(db, event) is False
+    finally:
+        db.close()
+
+
+def test_handler_without_work_leaves_no_claim(scheduler):
+    client_id = add_client()
+    event_date = date.today() + timedelta(days=10)  # not the client's deadline any more
+    assert scheduler.fire(ScheduledEvent(CLIENT_DEADLINE, client_id, event_date, reminder_due_at(event_date))) is False
+    db = SessionLocal()
+    assert db.query(models.ScheduledEventClaim).count() == 0
+    db.close()
+
+
+def test_failed_handler_is_retried(scheduler, monkeypatch):
+    client_id = add_client()
+    deadline = date.today() + timedelta(days=30)
+
+    def broken(db, event):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(scheduler_module.HANDLERS, CLIENT_DEADLINE, broken)
+    event = ScheduledEvent(CLIENT_DEADLINE, client_id, deadline, reminder_due_at(deadline))
+    assert scheduler.fire(event) is False
+    [retry] = scheduler.pending()
+    assert retry.key == event.key
+    assert retry.due_at > datetime.now() + timedelta(seconds=RETRY_SECONDS - 60)
+
+    monkeypatch.undo()
+    assert scheduler.fire(retry) is True
@@ -0,0 +1,43 @@
+import itertools
+import tempfile
+from datetime import date
+from sqlalchemy import create_engine
+from app import db as app_db
+from app.db import Base
+from app.settings import settings
+
+
+def timeseries(client, **params):
+    return client.get("/stats/timeseries", params={"metric": "leads_created", **params})
+
+
+def test_timeseries_zero_fills_the_range(client):
+    client.post("/leads", json={"business_name": "Acme", "contact": "acme@example.com"})
+    today = date.today()
+    response = timeseries(client, **{"from": date(today.year, 1, 1).isoformat(), "to": today.isoformat(), "bucket": "month"})
+    assert response.status_code == 200
+    points = response.json()["points"]
+    assert len(points) == today.month
+    assert points[-1]["value"] == 1
+
+
+def test_timeseries_rejects_unbounded_ranges(client):
+    for bucket, start in (("day", "2024-01-01"), ("week", "2019-01-01"), ("month", "0001-01-01")):
+        response = timeseries(client, **{"from": start, "to": "2025-12-31", "bucket": bucket})
+        assert response.status_code == 400, bucket
+
+    for bucket in ("day", "week", "month"):
+        assert timeseries(client, **{"from": "9999-12-01", "to": "9999-12-31", "bucket": bucket}).status_code == 400
+    assert timeseries(client, **{"to": "0001-01-02"}).status_code == 200
+
+
+def test_stats_cache_is_filled_from_the_primary(client, monkeypatch):
+    lagging = create_engine(f"sqlite:///{tempfile.mkdtemp()}/replica.db")
+    Base.metadata.create_all(bind=lagging)
+    monkeypatch.setattr(app_db, "read_engines", [lagging])
+    monkeypatch.setattr(app_db, "_replica_cycle", itertools.cycle([0]))
+    monkeypatch.setattr(settings, "read_your_writes_seconds", -1)
+
+    client.post("/leads", json={"business_name": "Acme", "contact": "acme@example.com"})
+    assert client.get("/leads").json() == []
+    assert client.get("/stats").json()["total_leads"] == 1
@@ -0,0 +1,108 @@
+from collections import Counter
+from datetime import date, timedelta
+
+TODAY = date.today()
+
+
+def seed_tasks(client) -> str:
+    """Twelve tasks across statuses, priorities, due dates and owners; returns the lead's id."""
+    lead = client.post("/leads", json={"business_name": "Acme", "contact": "acme@example.com"}).json()
+    statuses = ["pending", "in_progress", "completed", "cancelled"]
+    priorities = ["low", "medium", "high", "urgent"]
+    for n in range(12):
+        client.post("/tasks", json={
+            "title": f"Task {n}",
+            "related_to": "lead" if n % 3 == 0 else "general",
+            "related_id": lead["id"] if n % 3 == 0 else None,
+            "status": statuses[n % 4],
+            "priority": priorities[n // 3],
+            "due_date": (TODAY + timedelta(days=n - 6)).isoformat(),
+        })
+    return lead["id"]
+
+
+def titles(tasks) -> list[str]:
+    return [task["title"] for task in tasks]
+
+
+def test_task_filters_match_the_unfiltered_list(client):
+    lead_id = seed_tasks(client)
+    everything = client.get("/tasks").json()
+    assert titles(everything) == [f"Task {n}" for n in reversed(range(12))]
+
+    def expected(keep) -> list[str]:
+        return titles(task for task in everything if keep(task))
+
+    def due(task) -> date:
+        return date.fromisoformat(task["due_date"])
+
+    cases = [
+        ({"status": ["pending", "in_progress"]}, lambda task: task["status"] in ("pending", "in_progress")),
+        ({"priority": "urgent"}, lambda task: task["priority"] == "urgent"),
+        ({"due_before": TODAY.isoformat()}, lambda task: due(task) <= TODAY),
+        (
+            {"due_after": TODAY.isoformat(), "status": "pending"},
+            lambda task: due(task) >= TODAY and task["status"] == "pending",
+        ),
+        ({"related_to": "lead", "related_id": lead_id}, lambda task: task["related_id"] == lead_id),
+        ({"overdue": "true"}, lambda task: due(task) < TODAY and task["status"] in ("pending", "in_progress")),
+    ]
+    for params, keep in cases:
+        filtered = client.get("/tasks", params=params).json()
+        assert titles(filtered) == expected(keep), params
+        assert filtered, params
+
+
+def test_task_pages_follow_the_cursor(client):
+    seed_tasks(client)
+    everything = titles(client.get("/tasks").json())
+
+    pages, cursor = [], None
+    while True:
+        response = client.get("/tasks", params={"limit": 5, **({"cursor": cursor} if cursor else {})})
+        pages.append(titles(response.json()))
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert [len(page) for page in pages] == [5, 5, 2]
+    assert sum(pages, []) == everything
+    assert client.get("/tasks", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_task_summary_counts_the_task_list(client):
+    lead_id = seed_tasks(client)
+    week_end = TODAY + timedelta(days=6 - TODAY.weekday())
+
+    def expected(tasks) -> dict:
+        open_tasks = [task for task in tasks if task["status"] in ("pending", "in_progress")]
+        overdue = [task for task in open_tasks if date.fromisoformat(task["due_date"]) < TODAY]
+        by_status_priority = {}
+        for task in tasks:
+            cell = by_status_priority.setdefault(task["status"], {})
+            cell[task["priority"]] = cell.get(task["priority"], 0) + 1
+        return {
+            "total": len(tasks),
+            "by_status": dict(Counter(task["status"] for task in tasks)),
+            "by_priority": dict(Counter(task["priority"] for task in tasks)),
+            "by_status_priority": by_status_priority,
+            "overdue": len(overdue),
+            "overdue_by_priority": dict(Counter(task["priority"] for task in overdue)),
+            "due_this_week": sum(TODAY <= date.fromisoformat(task["due_date"]) <= week_end for task in open_tasks),
+        }
+
+    assert client.get("/tasks/summary").json() == expected(client.get("/tasks").json())
+    scope = {"related_to": "lead", "related_id": lead_id}
+    assert client.get("/tasks/summary", params=scope).json() == expected(client.get("/tasks", params=scope).json())
+
+
+def test_repointing_a_task_at_a_missing_entity_reports_the_requested_type(client):
+    lead = client.post("/leads", json={"business_name": "Acme", "contact": "acme@example.com"}).json()
+    task = client.post("/tasks", json={"title": "Call", "related_to": "lead", "related_id": lead["id"]}).json()
+
+    response = client.patch(f"/tasks/{task['id']}", json={"related_to": "client", "related_id": "missing"})
+    assert (response.status_code, response.json()["detail"]) == (400, "Related client not found")
+    response = client.patch(f"/tasks/{task['id']}", json={"related_id": "missing"})
+    assert (response.status_code, response.json()["detail"]) == (400, "Related lead not found")
+
+    unchanged = client.get("/tasks", params={"related_to": "lead", "related_id": lead["id"]}).json()
+    assert [(item["id"], item["related_to"]) for item in unchanged] == [(task["id"], "lead")]
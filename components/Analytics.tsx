@@ -12,7 +12,9 @@ interface AnalyticsProps {
 
 const Analytics: React.FC<AnalyticsProps> = ({ clients, customers, leads, savedLeads, goals }) => {
   const analytics = useMemo(() => {
-    const totalRevenue = clients.reduce((acc, c) => acc + c.paymentCollected, 0) + 
+    // A completed client's payments are counted through the customer it became
+    const openClients = clients.filter(c => !c.isCompleted);
+    const totalRevenue = openClients.reduce((acc, c) => acc + c.paymentCollected, 0) +
                         customers.reduce((acc, c) => acc + c.totalPaid, 0);
     
     const conversionRate = (leads.length + savedLeads.length) > 0 
@@ -229,7 +231,7 @@ const Analytics: React.FC<AnalyticsProps> = ({ clients, customers, leads, savedL
         </div>
         <div className="bg-slate-800/50 rounded-xl border border-slate-700/50 p-4 text-center hover:border-slate-600/50 hover:bg-slate-800/70 transition-all duration-300 hover:shadow-lg cursor-default">
           <p className="text-slate-400 text-sm mb-1">Active Clients</p>
-          <p className="text-2xl font-bold text-white">{clients.length}</p>
+          <p className="text-2xl font-bold text-white">{clients.filter(c => !c.isCompleted).length}</p>
         </div>
         <div className="bg-slate-800/50 rounded-xl border border-slate-700/50 p-4 text-center hover:border-slate-600/50 hover:bg-slate-800/70 transition-all duration-300 hover:shadow-lg cursor-default">
           <p className="text-slate-400 text-sm mb-1">Completed Projects</p>
@@ -113,6 +113,7 @@ const ClientsPage: React.FC<ClientsPageProps> = ({ clients, onUpdatePayment, onM
                     <td className="px-6 py-4">
                       <div className="flex items-center justify-center gap-2">
                         <button 
+                          disabled={client.isCompleted}
                           onClick={async () => {
                             const pendingAmount = parseFloat(paymentInput[client.id]);
                             if (!isNaN(pendingAmount) && pendingAmount > 0) {
@@ -121,7 +122,7 @@ const ClientsPage: React.FC<ClientsPageProps> = ({ clients, onUpdatePayment, onM
                             }
                             await onMarkCompleted(client.id);
                           }}
-                          className="flex items-center space-x-2 bg-slate-950 hover:bg-emerald-600 border border-slate-800 hover:border-emerald-500 text-slate-400 hover:text-white px-3 md:px-4 py-2 rounded-xl transition-all font-bold text-xs md:text-sm group active:scale-[0.98] hover:shadow-lg hover:shadow-emerald-500/30"
+                          className="flex items-center space-x-2 bg-slate-950 hover:bg-emerald-600 border border-slate-800 hover:border-emerald-500 text-slate-400 hover:text-white px-3 md:px-4 py-2 rounded-xl transition-all font-bold text-xs md:text-sm group active:scale-[0.98] hover:shadow-lg hover:shadow-emerald-500/30 disabled:opacity-40 disabled:pointer-events-none"
                         >
                           <CheckCircle size={16} className="text-slate-500 group-hover:text-white" />
                           <span className="whitespace-nowrap">Done</span>
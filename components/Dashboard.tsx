@@ -45,7 +45,9 @@ const Dashboard: React.FC<DashboardProps> = ({
 }) => {
   // Calculate analytics
   const analytics = useMemo(() => {
-    const totalRevenue = clients.reduce((acc, c) => acc + c.paymentCollected, 0) +
+    // A completed client's payments are counted through the customer it became
+    const openClients = clients.filter(c => !c.isCompleted);
+    const totalRevenue = openClients.reduce((acc, c) => acc + c.paymentCollected, 0) +
       customers.reduce((acc, c) => acc + c.totalPaid, 0);
 
     const conversionRate = (leads.length + savedLeads.length) > 0
@@ -246,7 +248,7 @@ const Dashboard: React.FC<DashboardProps> = ({
               </div>
               <div>
                 <h3 className="text-lg font-semibold text-white tracking-tight">Active Projects</h3>
-                <p className="text-slate-400 text-sm">{clients.length} ongoing</p>
+                <p className="text-slate-400 text-sm">{clients.filter(c => !c.isCompleted).length} ongoing</p>
               </div>
             </div>
 
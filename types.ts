@@ -47,6 +47,8 @@ export interface Goal {
   dateStarted: string;
   dateAchieved?: string;
   isAchieved: boolean;
+  currentAmount?: number;
+  progress?: number;
 }
 
 export interface Stats {